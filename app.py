@@ -501,7 +501,17 @@ def render_professional_dashboard():
     if TRADING_SYSTEM_AVAILABLE:
         # Get real portfolio data
         portfolio = trading_engine.get_portfolio_summary()
-        market_data = data_manager.get_all_market_data()
+        
+        # Each session reads conflated quotes at its own 1 Hz refresh rate; a consumer
+        # that expired while the session was idle is pruned, so replace it
+        consumer = st.session_state.get('market_consumer')
+        if consumer is None or consumer.expired or not data_manager.dispatcher.is_registered(consumer):
+            st.session_state.market_consumer = data_manager.add_conflated_consumer(
+                'ui_session', interval=1.0, expire_after=60.0
+            )
+            st.session_state.market_view = {}
+        st.session_state.market_view.update(st.session_state.market_consumer.poll())
+        market_data = st.session_state.market_view
         
         # System status indicators
         col1, col2, col3, col4 = st.columns(4)
@@ -560,6 +570,7 @@ def render_professional_dashboard():
             
             # Market Data Display
             if market_data:
+                symbol_stats = data_manager.get_all_stats()
                 market_df = pd.DataFrame([
                     {
                         'Symbol': data.symbol,
@@ -567,7 +578,9 @@ def render_professional_dashboard():
                         'Bid/Ask': f"${data.bid:.2f} / ${data.ask:.2f}",
                         'Change': f"{data.change:+.2f} ({data.change_percent:+.2f}%)",
                         'Volume': f"{data.volume:,}",
+                        'VWAP': f"${symbol_stats[data.symbol].vwap:.2f}" if data.symbol in symbol_stats else "-",
                         'Last Update': data.timestamp.strftime("%H:%M:%S")
+                                       + (" ⚠️ stale" if data_manager.is_stale(data.symbol) else "")
                     }
                     for data in list(market_data.values())[:6]  # Show top 6 instruments
                 ])
@@ -608,10 +621,13 @@ def render_professional_dashboard():
                 symbol = st.selectbox("Symbol", CONFIG.allowed_symbols)
                 side = st.selectbox("Side", ["BUY", "SELL"])
                 quantity = st.number_input("Quantity", min_value=1, max_value=100, value=1)
-                order_type = st.selectbox("Order Type", ["MARKET", "LIMIT"])
+                order_type = st.selectbox("Order Type", ["MARKET", "LIMIT", "STOP", "STOP_LIMIT"])
                 
                 limit_price = None
-                if order_type == "LIMIT":
+                stop_price = None
+                if order_type in ("STOP", "STOP_LIMIT"):
+                    stop_price = st.number_input("Stop Price", min_value=0.01, step=0.01)
+                if order_type in ("LIMIT", "STOP_LIMIT"):
                     limit_price = st.number_input("Limit Price", min_value=0.01, step=0.01)
                 
                 submitted = st.form_submit_button("📈 Submit Order", type="primary", use_container_width=True)
@@ -619,7 +635,7 @@ def render_professional_dashboard():
                 if submitted:
                     try:
                         order_side = OrderSide.BUY if side == "BUY" else OrderSide.SELL
-                        order_type_enum = OrderType.MARKET if order_type == "MARKET" else OrderType.LIMIT
+                        order_type_enum = OrderType[order_type]
                         
                         success, result = trading_engine.submit_order(
                             symbol=symbol,
@@ -627,7 +643,8 @@ def render_professional_dashboard():
                             quantity=float(quantity),
                             order_type=order_type_enum,
                             price=limit_price,
-                            agent_id="manual_trader"
+                            agent_id="manual_trader",
+                            stop_price=stop_price
                         )
                         
                         if success:
@@ -639,7 +656,23 @@ def render_professional_dashboard():
                     
                     except Exception as e:
                         st.error(f"❌ Error: {str(e)}")
-            
+
+            # Working limit orders
+            working_orders = trading_engine.get_working_orders()
+            if working_orders:
+                st.markdown("#### ⏳ Working Orders")
+                for order in working_orders[:10]:
+                    order_col, cancel_col = st.columns([3, 1])
+                    with order_col:
+                        trigger = f" stop {order.stop_price:.2f}" if order.stop_price else ""
+                        limit = f" @ {order.price:.2f}" if order.price else " MKT"
+                        st.caption(f"{order.symbol} {order.side.value.upper()} "
+                                   f"{order.quantity - order.filled_quantity:g}{limit}{trigger}")
+                    with cancel_col:
+                        if st.button("✖", key=f"cancel_{order.order_id}"):
+                            trading_engine.cancel_order(order.order_id)
+                            st.rerun()
+
             st.markdown("### 🎛️ AI Agent Controls")
             
             # AI Agent Status
@@ -671,53 +704,58 @@ def render_professional_dashboard():
     if TRADING_SYSTEM_AVAILABLE:
         st.markdown("### 🚨 Emergency Controls")
         
-        col1, col2 = st.columns(2)
+        if trading_engine.read_only:
+            # This process mirrors the feed owner's book; controls here could not reach it
+            st.info("🔒 Trading lock and kill switch are only available in the feed owner process "
+                    "(DATA_PLANE_ROLE=owner). This dashboard is read-only.")
+        else:
+            col1, col2 = st.columns(2)
         
-        with col1:
-            st.markdown("""
-            <div style="background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%); padding: 20px; border-radius: 12px; color: white; text-align: center; margin-bottom: 16px;">
-                <h4 style="margin: 0 0 12px 0;">🔒 Trading Lock</h4>
-                <p style="margin: 0; font-size: 14px;">Prevent new positions while keeping existing ones</p>
-            </div>
-            """, unsafe_allow_html=True)
+            with col1:
+                st.markdown("""
+                <div style="background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%); padding: 20px; border-radius: 12px; color: white; text-align: center; margin-bottom: 16px;">
+                    <h4 style="margin: 0 0 12px 0;">🔒 Trading Lock</h4>
+                    <p style="margin: 0; font-size: 14px;">Prevent new positions while keeping existing ones</p>
+                </div>
+                """, unsafe_allow_html=True)
             
-            if st.button("🔒 Activate Trading Lock", key="trading_lock", use_container_width=True):
-                trading_engine.enable_trading_lock()
-                st.warning("⚠️ Trading lock activated! New positions blocked.")
-                time.sleep(1)
-                st.rerun()
+                if st.button("🔒 Activate Trading Lock", key="trading_lock", use_container_width=True):
+                    trading_engine.enable_trading_lock()
+                    st.warning("⚠️ Trading lock activated! New positions blocked.")
+                    time.sleep(1)
+                    st.rerun()
             
-            if st.button("🔓 Release Trading Lock", key="release_lock", use_container_width=True):
-                trading_engine.disable_trading_lock()
-                st.success("✅ Trading lock released. Normal operations resumed.")
-                time.sleep(1)
-                st.rerun()
+                if st.button("🔓 Release Trading Lock", key="release_lock", use_container_width=True):
+                    trading_engine.disable_trading_lock()
+                    st.success("✅ Trading lock released. Normal operations resumed.")
+                    time.sleep(1)
+                    st.rerun()
         
-        with col2:
-            st.markdown("""
-            <div style="background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%); padding: 20px; border-radius: 12px; color: white; text-align: center; margin-bottom: 16px;">
-                <h4 style="margin: 0 0 12px 0;">💀 Kill Switch</h4>
-                <p style="margin: 0; font-size: 14px;">Close ALL positions immediately</p>
-            </div>
-            """, unsafe_allow_html=True)
+            with col2:
+                st.markdown("""
+                <div style="background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%); padding: 20px; border-radius: 12px; color: white; text-align: center; margin-bottom: 16px;">
+                    <h4 style="margin: 0 0 12px 0;">💀 Kill Switch</h4>
+                    <p style="margin: 0; font-size: 14px;">Close ALL positions immediately</p>
+                </div>
+                """, unsafe_allow_html=True)
             
-            # Confirmation checkbox for kill switch
-            confirm_kill = st.checkbox("⚠️ I understand this will close ALL positions", key="confirm_kill")
+                # Confirmation checkbox for kill switch
+                confirm_kill = st.checkbox("⚠️ I understand this will close ALL positions", key="confirm_kill")
             
-            if st.button("💀 EMERGENCY STOP", key="kill_switch", 
-                        disabled=not confirm_kill, use_container_width=True, type="primary"):
-                with st.spinner("Executing emergency stop..."):
-                    results = trading_engine.emergency_close_all()
-                    successful_closes = sum(results.values())
-                    total_positions = len(results)
+                if st.button("💀 EMERGENCY STOP", key="kill_switch", 
+                            disabled=not confirm_kill, use_container_width=True, type="primary"):
+                    with st.spinner("Executing emergency stop..."):
+                        results = trading_engine.emergency_close_all()
+                        successful_closes = sum(results.values())
+                        total_positions = len(results)
                     
-                    if successful_closes == total_positions:
-                        st.success(f"✅ Emergency stop completed! {successful_closes} positions closed.")
-                    else:
-                        st.error(f"⚠️ Partial success: {successful_closes}/{total_positions} positions closed.")
+                        if successful_closes == total_positions:
+                            st.success(f"✅ Emergency stop completed! {successful_closes} positions closed.")
+                        else:
+                            st.error(f"⚠️ Partial success: {successful_closes}/{total_positions} positions closed.")
                     
-                    time.sleep(2)
-                    st.rerun()
+                        time.sleep(2)
+                        st.rerun()
         
         # Recent Execution Log
         st.markdown("### 📜 Recent Executions")
@@ -739,6 +777,10 @@ def render_professional_dashboard():
             st.dataframe(executions_df, use_container_width=True)
         else:
             st.info("No recent executions")
+
+        render_latency_panel()
+        render_risk_panel()
+        render_sequencer_panel()
     
     with col2:
         buying_power = demo_data['account_value'] * 0.5  # Demo calculation
@@ -762,6 +804,68 @@ def render_professional_dashboard():
         render_market_panel()
         render_demo_controls()
 
+def render_latency_panel():
+    """Feed latency percentiles per pipeline stage"""
+
+    st.markdown("### ⏱️ Feed Latency")
+
+    symbols = ["All"] + (data_manager.latency.symbols() if data_manager.latency else [])
+    selected = st.selectbox("Symbol", symbols, key="latency_symbol")
+    summary = data_manager.get_latency_summary(symbol=None if selected == "All" else selected)
+
+    if summary:
+        latency_df = pd.DataFrame([
+            {
+                'Stage': stage.replace('_', ' ').title(),
+                'Samples': f"{stats['count']:,}",
+                'p50 (µs)': f"{stats['p50_us']:,.1f}",
+                'p99 (µs)': f"{stats['p99_us']:,.1f}",
+                'p99.9 (µs)': f"{stats['p999_us']:,.1f}",
+                'Max (µs)': f"{stats['max_us']:,.1f}"
+            }
+            for stage, stats in summary.items()
+        ])
+        st.dataframe(latency_df, use_container_width=True, hide_index=True)
+    else:
+        st.info("Latency tracking is disabled (LATENCY_TRACKING=False)")
+
+def render_risk_panel():
+    """Checks, rejections and latency per pre-trade risk rule"""
+
+    st.markdown("### 🛡️ Risk Rules")
+    risk_df = pd.DataFrame([
+        {
+            'Rule': name.replace('_', ' ').title(),
+            'Checks': f"{stats['checks']:,}",
+            'Rejects': f"{stats['rejects']:,}",
+            'p50 (µs)': f"{stats['p50_us']:,.1f}",
+            'p99 (µs)': f"{stats['p99_us']:,.1f}",
+            'Max (µs)': f"{stats['max_us']:,.1f}"
+        }
+        for name, stats in trading_engine.get_risk_stats().items()
+    ])
+    st.dataframe(risk_df, use_container_width=True, hide_index=True)
+
+def render_sequencer_panel():
+    """Order sequencer queue depth and latency"""
+
+    st.markdown("### 🧵 Order Sequencer")
+    sequencer = trading_engine.get_sequencer_stats()
+    depth = sequencer['queue_depth']
+    sequencer_df = pd.DataFrame([
+        {
+            'Stage': stage.title(),
+            'Commands': f"{stats['count']:,}",
+            'p50 (µs)': f"{stats['p50_us']:,.1f}",
+            'p99 (µs)': f"{stats['p99_us']:,.1f}",
+            'Max (µs)': f"{stats['max_us']:,.1f}"
+        }
+        for stage, stats in (('queue wait', sequencer['wait']), ('end to end', sequencer['latency']))
+    ])
+    st.dataframe(sequencer_df, use_container_width=True, hide_index=True)
+    st.caption(f"Queue depth p50 {depth['p50']:.0f} · p99 {depth['p99']:.0f} · max {depth['max']} · "
+               f"{sequencer['commands']['failures']} failed · {sequencer['commands']['throttled']} throttled commands")
+
 def render_positions_table():
     """Live updating positions table"""
     
@@ -840,7 +944,33 @@ def render_market_panel():
             
             with col2:
                 if st.button("📈", key=f"chart_{symbol}"):
-                    st.info(f"Chart for {symbol} - Demo feature")
+                    st.session_state.chart_symbol = symbol
+
+    # Candlestick chart from pre-built bars for the selected symbol
+    chart_symbol = st.session_state.get('chart_symbol')
+    if chart_symbol:
+        bars = data_manager.get_bars(chart_symbol, '1m', 120, include_forming=True) if TRADING_SYSTEM_AVAILABLE else []
+        if len(bars) < 5 and TRADING_SYSTEM_AVAILABLE:
+            bars = data_manager.get_bars(chart_symbol, '1s', 120, include_forming=True)
+
+        if len(bars):
+            fig = go.Figure(go.Candlestick(
+                x=pd.to_datetime(bars['start']),
+                open=bars['open'],
+                high=bars['high'],
+                low=bars['low'],
+                close=bars['close']
+            ))
+            fig.update_layout(
+                height=250,
+                margin=dict(l=0, r=0, t=20, b=0),
+                xaxis_rangeslider_visible=False,
+                plot_bgcolor='rgba(0,0,0,0)',
+            )
+            st.markdown(f"**{chart_symbol}** - {get_symbol_description(chart_symbol)}")
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info(f"⏳ Building bars for {chart_symbol}...")
 
 def render_demo_controls():
     """Demo emergency controls (sanitized)"""
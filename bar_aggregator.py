@@ -0,0 +1,205 @@
+"""
+Bar Aggregation
+Builds OHLCV bars incrementally from the tick stream
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from callback_dispatch import CallbackDispatcher, OverflowPolicy, Subscriber
+from tick_history import RingBuffer
+
+# Bar intervals by name, in seconds
+BAR_INTERVALS: Dict[str, int] = {
+    '1s': 1,
+    '1m': 60,
+    '5m': 300,
+    '1h': 3600,
+}
+
+BAR_DTYPE = np.dtype([
+    ('start', 'i8'),  # epoch nanoseconds at the start of the bar
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'i8'),
+    ('ticks', 'i8'),
+])
+
+
+class Bar:
+    """A completed bar, published to bar-close subscribers"""
+
+    __slots__ = ('symbol', 'interval', 'start', 'open', 'high', 'low', 'close', 'volume', 'ticks')
+
+    def __init__(self, symbol: str, interval: str, start: int, open: float, high: float,
+                 low: float, close: float, volume: int, ticks: int):
+        self.symbol = symbol
+        self.interval = interval
+        self.start = start
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.ticks = ticks
+
+    def as_record(self) -> Tuple:
+        return (self.start, self.open, self.high, self.low, self.close, self.volume, self.ticks)
+
+    def __repr__(self) -> str:
+        return (f"Bar({self.symbol} {self.interval} start={self.start} o={self.open} "
+                f"h={self.high} l={self.low} c={self.close} v={self.volume})")
+
+
+class _FormingBar:
+    """Mutable state of the bar currently being built"""
+
+    __slots__ = ('start', 'open', 'high', 'low', 'close', 'volume', 'ticks')
+
+    def __init__(self, start: int, price: float, volume: int):
+        self.start = start
+        self.open = self.high = self.low = self.close = price
+        self.volume = volume
+        self.ticks = 1
+
+
+class BarAggregator:
+    """Per-symbol OHLCV bars for several intervals, updated in O(1) per tick.
+
+    Closed bars are kept in bounded ring buffers. A bar closes when the first
+    tick of the next period arrives, or when its period has been over for
+    ``close_delay`` seconds of source time, so quiet symbols still close
+    their bars. Bars are keyed by source timestamps, so a background thread
+    (started with the first tick) estimates each symbol's source time as the
+    ``now_ns`` clock minus the lag measured at its latest tick; a delayed
+    feed then closes bars on its own timeline. Closed bars are published to
+    subscribers on their own worker threads. A late tick for an older
+    period than the forming bar, or one already closed, is counted in
+    ``late_ticks`` and not folded into any bar.
+    """
+
+    def __init__(self, capacity: int = 1000, intervals: Optional[Dict[str, int]] = None,
+                 now_ns: Optional[Callable[[], int]] = None, close_delay: float = 1.0,
+                 close_interval: float = 0.5):
+        self.capacity = capacity
+        self.intervals = dict(intervals or BAR_INTERVALS)
+        self._interval_ns = [(name, seconds * 1_000_000_000) for name, seconds in self.intervals.items()]
+        self._forming: Dict[Tuple[str, str], _FormingBar] = {}
+        self._closed: Dict[Tuple[str, str], RingBuffer] = {}
+        self._last_closed: Dict[Tuple[str, str], int] = {}
+        self._lag_ns: Dict[str, int] = {}  # now_ns() minus source timestamp at the latest tick
+        self.late_ticks = 0
+        self.dispatcher = CallbackDispatcher(OverflowPolicy.DROP_OLDEST)
+
+        self.now_ns = now_ns
+        self.close_delay_ns = int(close_delay * 1_000_000_000)
+        self.close_interval = close_interval
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    def update(self, symbol: str, timestamp_ns: int, price: float, volume: int):
+        """Fold one tick into every interval's forming bar"""
+        with self._lock:
+            if self.now_ns is not None:
+                if self._thread is None:
+                    self._start()
+                self._lag_ns[symbol] = self.now_ns() - timestamp_ns
+            for name, interval_ns in self._interval_ns:
+                self._update(symbol, name, interval_ns, timestamp_ns, price, volume)
+
+    def _update(self, symbol: str, name: str, interval_ns: int, timestamp_ns: int,
+                price: float, volume: int):
+        key = (symbol, name)
+        start = timestamp_ns - timestamp_ns % interval_ns
+        bar = self._forming.get(key)
+        if bar is None:
+            if start > self._last_closed.get(key, -1):
+                self._forming[key] = _FormingBar(start, price, volume)
+            else:
+                self.late_ticks += 1
+        elif start > bar.start:
+            self._close(symbol, name, bar)
+            self._forming[key] = _FormingBar(start, price, volume)
+        elif start < bar.start:
+            self.late_ticks += 1
+        else:
+            if price > bar.high:
+                bar.high = price
+            elif price < bar.low:
+                bar.low = price
+            bar.close = price
+            bar.volume += volume
+            bar.ticks += 1
+
+    def close_due(self, now_ns: int, lag_ns: Optional[Dict[str, int]] = None):
+        """Close forming bars whose period ended before now_ns (source time).
+
+        With ``lag_ns``, each symbol's source time is ``now_ns`` minus its lag.
+        """
+        with self._lock:
+            for (symbol, name), bar in list(self._forming.items()):
+                source_ns = now_ns - lag_ns.get(symbol, 0) if lag_ns else now_ns
+                if bar.start + self.intervals[name] * 1_000_000_000 <= source_ns:
+                    del self._forming[(symbol, name)]
+                    self._close(symbol, name, bar)
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name="bar-closer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(2.0)
+        self.dispatcher.stop()
+
+    def _run(self):
+        while not self._stopping.wait(self.close_interval):
+            try:
+                self.close_due(self.now_ns() - self.close_delay_ns, self._lag_ns)
+            except Exception as e:
+                self.logger.error(f"Bar close error: {e}")
+
+    def _close(self, symbol: str, name: str, forming: _FormingBar):
+        key = (symbol, name)
+        self._last_closed[key] = forming.start
+        bars = self._closed.get(key)
+        if bars is None:
+            bars = self._closed[key] = RingBuffer(BAR_DTYPE, self.capacity)
+        bar = Bar(symbol, name, forming.start, forming.open, forming.high, forming.low,
+                  forming.close, forming.volume, forming.ticks)
+        bars.append(bar.as_record())
+        self.dispatcher.publish(bar)
+
+    def get_bars(self, symbol: str, interval: str, n: Optional[int] = None,
+                 include_forming: bool = False) -> np.ndarray:
+        """Newest ``n`` closed bars as a zero-copy view, oldest first.
+
+        With ``include_forming`` the in-progress bar is appended, which
+        returns a copy instead of a view.
+        """
+        if interval not in self.intervals:
+            raise ValueError(f"Unknown bar interval: {interval}")
+        with self._lock:
+            bars = self._closed.get((symbol, interval))
+            closed = bars.latest(n) if bars is not None else np.zeros(0, dtype=BAR_DTYPE)
+            forming = self._forming.get((symbol, interval))
+        if not include_forming or forming is None:
+            return closed
+        current = np.array([(forming.start, forming.open, forming.high, forming.low,
+                             forming.close, forming.volume, forming.ticks)], dtype=BAR_DTYPE)
+        if n is not None:
+            closed = closed[max(0, len(closed) - n + 1):] if n > 1 else closed[:0]
+        return np.concatenate([closed, current])
+
+    def subscribe(self, symbols: Optional[List[str]], callback: Callable[[Bar], None],
+                  name: Optional[str] = None) -> Subscriber:
+        """Call ``callback`` with each closed Bar for the given symbols (all if None)"""
+        return self.dispatcher.add_subscriber(callback, name=name, symbols=symbols)
@@ -0,0 +1,385 @@
+"""
+Market Data Callback Dispatch
+Delivers ticks to subscribers on their own worker threads with bounded queues
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# Anything with a ``symbol`` attribute, normally live_data.Tick
+MarketData = Any
+
+
+class OverflowPolicy(Enum):
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued tick
+    CONFLATE = "conflate"        # Keep only the latest tick per symbol
+    BLOCK = "block"              # Make the publisher wait for space
+
+
+class Subscriber:
+    """A data callback with its own bounded queue and worker thread"""
+
+    # Weight of the newest sample in the execution time moving average
+    EWMA_ALPHA = 0.1
+
+    def __init__(self, callback: Callable[[MarketData], None], name: str,
+                 policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+                 max_queue: int = 1000, latency_budget: float = 0.05,
+                 symbols: Optional[Iterable[str]] = None, latency=None):
+        self.callback = callback
+        self.latency = latency  # LatencyMonitor for publish-to-callback times
+        self.name = name
+        self.symbols: Optional[FrozenSet[str]] = frozenset(symbols) if symbols is not None else None
+        self.policy = policy
+        self.max_queue = max_queue
+        self.latency_budget_ns = int(latency_budget * 1_000_000_000)
+
+        self.delivered = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.errors = 0
+        self.budget_breaches = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.ewma_ns = 0.0
+        self.slow = False
+
+        self._queue: Deque = deque()
+        self._latest: Dict[str, MarketData] = {}
+        self._cond = threading.Condition()
+        self._running = True
+        self.logger = logging.getLogger(__name__)
+        self._thread: Optional[threading.Thread] = None
+        self._start_worker()
+
+    def _start_worker(self):
+        self._thread = threading.Thread(target=self._run, name=f"subscriber-{self.name}", daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def offer(self, market_data: MarketData):
+        """Queue a tick for delivery according to the overflow policy"""
+        with self._cond:
+            if self.policy == OverflowPolicy.CONFLATE:
+                if market_data.symbol in self._latest:
+                    self.conflated += 1
+                else:
+                    self._queue.append(market_data.symbol)
+                self._latest[market_data.symbol] = market_data
+            else:
+                if len(self._queue) >= self.max_queue:
+                    if self.policy == OverflowPolicy.BLOCK:
+                        while len(self._queue) >= self.max_queue and self._running:
+                            self._cond.wait(0.1)
+                    else:
+                        self._queue.popleft()
+                        self.dropped += 1
+                self._queue.append(market_data)
+            self._cond.notify_all()
+
+    def stop(self, timeout: float = 1.0):
+        """Stop the worker thread"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _take_next(self) -> MarketData:
+        """Remove and return the next queued tick (caller holds the condition)"""
+        if self.policy == OverflowPolicy.CONFLATE:
+            market_data = self._latest.pop(self._queue.popleft())
+        else:
+            market_data = self._queue.popleft()
+        if self.policy == OverflowPolicy.BLOCK:
+            self._cond.notify_all()
+        return market_data
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and self._running:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                market_data = self._take_next()
+
+            start = time.perf_counter_ns()
+            try:
+                self.callback(market_data)
+            except Exception as e:
+                self.errors += 1
+                self.logger.error(f"Callback error in {self.name}: {e}")
+            self._record(time.perf_counter_ns() - start)
+            if self.latency is not None:
+                self._record_completion([market_data])
+
+    def _record_completion(self, delivered: Iterable[MarketData]):
+        """Record publish-to-callback-completion latency for delivered ticks"""
+        done_ns = time.monotonic_ns()
+        for market_data in delivered:
+            publish_ns = getattr(market_data, 'publish_ns', 0)
+            if publish_ns:
+                self.latency.record('publish_to_callback', market_data.symbol, done_ns - publish_ns)
+
+    def _record(self, elapsed_ns: int):
+        """Update execution timing and the slow-consumer flag"""
+        self.delivered += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        if self.delivered == 1:
+            self.ewma_ns = float(elapsed_ns)
+        else:
+            self.ewma_ns += self.EWMA_ALPHA * (elapsed_ns - self.ewma_ns)
+
+        if elapsed_ns > self.latency_budget_ns:
+            self.budget_breaches += 1
+
+        if not self.slow and self.ewma_ns > self.latency_budget_ns:
+            self.slow = True
+            self.logger.warning(
+                f"Slow subscriber {self.name}: average callback time "
+                f"{self.ewma_ns / 1e6:.2f}ms exceeds budget {self.latency_budget_ns / 1e6:.2f}ms"
+            )
+        elif self.slow and self.ewma_ns < self.latency_budget_ns / 2:
+            self.slow = False
+            self.logger.info(f"Subscriber {self.name} back within latency budget")
+
+    def get_stats(self) -> Dict:
+        """Delivery and timing statistics for this subscriber"""
+        return {
+            'policy': self.policy.value,
+            'symbols': sorted(self.symbols) if self.symbols is not None else '*',
+            'queue_depth': self.queue_depth,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'conflated': self.conflated,
+            'errors': self.errors,
+            'budget_breaches': self.budget_breaches,
+            'avg_ms': self.total_ns / self.delivered / 1e6 if self.delivered else 0.0,
+            'ewma_ms': self.ewma_ns / 1e6,
+            'max_ms': self.max_ns / 1e6,
+            'slow': self.slow,
+        }
+
+
+class ConflatedConsumer(Subscriber):
+    """Latest tick per symbol, handed over at most once per ``interval`` seconds.
+
+    With a callback, a worker delivers the pending ``{symbol: tick}`` map
+    every ``interval`` seconds (``0`` means as soon as the previous delivery
+    finished). Without one, the consumer calls ``poll()`` at its own pace,
+    e.g. once per Streamlit rerun. Either way the publisher only replaces a
+    dict entry per tick, so slow readers never queue up ticks.
+
+    A pull consumer that has not polled for ``expire_after`` seconds is
+    considered abandoned and is dropped by the dispatcher.
+    """
+
+    def __init__(self, callback: Optional[Callable[[Dict[str, MarketData]], None]], name: str,
+                 interval: float = 1.0, latency_budget: float = 0.05,
+                 symbols: Optional[Iterable[str]] = None, expire_after: Optional[float] = None,
+                 latency=None):
+        self.interval = interval
+        self.expire_after = expire_after
+        self._pending: Dict[str, MarketData] = {}
+        self._last_delivery = 0.0
+        self._last_poll = time.monotonic()
+        super().__init__(callback, name, OverflowPolicy.CONFLATE, 0, latency_budget, symbols, latency)
+
+    def _start_worker(self):
+        if self.callback is not None:
+            super()._start_worker()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    @property
+    def expired(self) -> bool:
+        return (self.callback is None and self.expire_after is not None
+                and time.monotonic() - self._last_poll > self.expire_after)
+
+    def offer(self, market_data: MarketData):
+        """Replace the pending tick for the symbol"""
+        with self._cond:
+            if market_data.symbol in self._pending:
+                self.conflated += 1
+            self._pending[market_data.symbol] = market_data
+            if self.interval == 0:
+                self._cond.notify()
+
+    def seed(self, latest: Dict[str, MarketData]):
+        """Pre-load current values so the first delivery is a full picture"""
+        with self._cond:
+            for symbol, market_data in latest.items():
+                if self.symbols is None or symbol in self.symbols:
+                    self._pending.setdefault(symbol, market_data)
+
+    def _swap(self) -> Dict[str, MarketData]:
+        with self._cond:
+            pending, self._pending = self._pending, {}
+        self._last_delivery = time.monotonic()
+        return pending
+
+    def poll(self, force: bool = False) -> Dict[str, MarketData]:
+        """Take the latest tick per symbol if the interval has elapsed (else {})"""
+        now = time.monotonic()
+        self._last_poll = now
+        if not force and now - self._last_delivery < self.interval:
+            return {}
+        pending = self._swap()
+        self.delivered += len(pending)
+        return pending
+
+    def _run(self):
+        while self._running:
+            with self._cond:
+                if self.interval == 0:
+                    while not self._pending and self._running:
+                        self._cond.wait()
+                else:
+                    delay = self._last_delivery + self.interval - time.monotonic()
+                    if delay > 0:
+                        self._cond.wait(delay)
+                        continue
+            if not self._running:
+                return
+
+            pending = self._swap()
+            if not pending:
+                continue
+            start = time.perf_counter_ns()
+            try:
+                self.callback(pending)
+            except Exception as e:
+                self.errors += 1
+                self.logger.error(f"Callback error in {self.name}: {e}")
+            self._record(time.perf_counter_ns() - start)
+            if self.latency is not None:
+                self._record_completion(pending.values())
+
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        stats['policy'] = f"conflated every {self.interval}s"
+        return stats
+
+
+class CallbackDispatcher:
+    """Fans ticks out to subscribers without running callbacks on the ingest thread.
+
+    Subscribers are indexed by symbol so a tick is only offered to the
+    subscribers interested in it; wildcard subscribers receive every tick.
+    The index is rebuilt on (un)subscribe and swapped in whole, so
+    ``publish`` reads it without locking.
+    """
+
+    def __init__(self, policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+                 max_queue: int = 1000, latency_budget: float = 0.05, latency=None):
+        self.policy = policy
+        self.latency = latency
+        self.max_queue = max_queue
+        self.latency_budget = latency_budget
+        self._subscribers: Tuple[Subscriber, ...] = ()
+        self._wildcard: Tuple[Subscriber, ...] = ()
+        self._by_symbol: Dict[str, Tuple[Subscriber, ...]] = {}
+        self._name_uses: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def subscribers(self) -> Tuple[Subscriber, ...]:
+        return self._subscribers
+
+    def add_subscriber(self, callback: Callable[[MarketData], None], name: Optional[str] = None,
+                       policy: Optional[OverflowPolicy] = None, max_queue: Optional[int] = None,
+                       latency_budget: Optional[float] = None,
+                       symbols: Optional[Iterable[str]] = None) -> Subscriber:
+        """Register a callback for the given symbols (all if None) and start its worker"""
+        subscriber = Subscriber(
+            callback,
+            self._unique_name(name or getattr(callback, '__qualname__', repr(callback))),
+            policy or self.policy,
+            max_queue or self.max_queue,
+            latency_budget if latency_budget is not None else self.latency_budget,
+            symbols,
+            self.latency
+        )
+        return self._register(subscriber)
+
+    def add_conflated_consumer(self, name: str, interval: float,
+                               callback: Optional[Callable[[Dict[str, MarketData]], None]] = None,
+                               symbols: Optional[Iterable[str]] = None,
+                               expire_after: Optional[float] = None) -> ConflatedConsumer:
+        """Register a consumer that receives the latest tick per symbol at its own rate"""
+        consumer = ConflatedConsumer(
+            callback, self._unique_name(name), interval, self.latency_budget, symbols, expire_after,
+            self.latency
+        )
+        return self._register(consumer)
+
+    def remove_subscriber(self, subscriber: Subscriber):
+        """Unregister a subscriber and stop its worker"""
+        with self._lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not subscriber)
+            self._rebuild_index()
+        subscriber.stop()
+
+    def is_registered(self, subscriber: Subscriber) -> bool:
+        """Whether the subscriber still receives ticks (expired consumers are pruned)"""
+        return any(s is subscriber for s in self._subscribers)
+
+    def _unique_name(self, name: str) -> str:
+        """Name never handed out before: stats and latency are keyed by it"""
+        with self._lock:
+            taken = {s.name for s in self._subscribers}
+            while True:
+                uses = self._name_uses.get(name, 0)
+                self._name_uses[name] = uses + 1
+                candidate = f"{name}#{uses}" if uses else name
+                if candidate not in taken:
+                    return candidate
+
+    def _register(self, subscriber: Subscriber) -> Subscriber:
+        with self._lock:
+            self._subscribers = tuple(
+                s for s in self._subscribers if not getattr(s, 'expired', False)
+            ) + (subscriber,)
+            self._rebuild_index()
+        return subscriber
+
+    def _rebuild_index(self):
+        """Rebuild the symbol index from the subscriber list (caller holds the lock)"""
+        by_symbol: Dict[str, List[Subscriber]] = {}
+        for subscriber in self._subscribers:
+            for symbol in subscriber.symbols or ():
+                by_symbol.setdefault(symbol, []).append(subscriber)
+        self._wildcard = tuple(s for s in self._subscribers if s.symbols is None)
+        self._by_symbol = {symbol: tuple(subs) for symbol, subs in by_symbol.items()}
+
+    def publish(self, market_data: MarketData):
+        """Hand a tick to the queue of every subscriber interested in its symbol"""
+        for subscriber in self._wildcard:
+            subscriber.offer(market_data)
+        for subscriber in self._by_symbol.get(market_data.symbol, ()):
+            subscriber.offer(market_data)
+
+    def slow_subscribers(self) -> List[str]:
+        """Names of subscribers currently over their latency budget"""
+        return [s.name for s in self._subscribers if s.slow]
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Statistics for every subscriber keyed by name"""
+        return {s.name: s.get_stats() for s in self._subscribers}
+
+    def stop(self):
+        """Stop all subscriber workers"""
+        for subscriber in self._subscribers:
+            subscriber.stop()
@@ -0,0 +1,35 @@
+"""
+Feed Owner
+Runs the market data feed and trading engine, sharing quotes and positions with dashboards
+"""
+
+import logging
+import os
+import signal
+import threading
+
+# Must be set before the config is loaded
+os.environ['DATA_PLANE_ROLE'] = 'owner'
+
+from trading_config import CONFIG  # noqa: E402
+from live_data import data_manager  # noqa: E402
+from trading_engine import trading_engine  # noqa: E402
+
+
+def main():
+    logger = logging.getLogger("feed_owner")
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    logger.info(f"Publishing {len(CONFIG.allowed_symbols)} symbols to shared memory '{CONFIG.data_plane_name}'")
+    while not stop.wait(60):
+        summary = trading_engine.get_portfolio_summary()
+        logger.info(f"Snapshot version {data_manager.version}, {summary['total_positions']} positions")
+
+    data_manager.disconnect()
+    data_manager.shared.close()
+
+
+if __name__ == "__main__":
+    main()
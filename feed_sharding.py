@@ -0,0 +1,228 @@
+"""
+Sharded Feed Ingestion
+Splits symbols across several feed connections running on threads or processes
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+import zlib
+from typing import Dict, List, Optional
+
+from live_data import LiveDataManager, Tick
+from market_feed import WebSocketFeed
+
+
+class ShardAssigner:
+    """Maps symbols to shards with rendezvous (highest random weight) hashing.
+
+    Each symbol goes to the shard with the highest ``crc32(symbol:shard)``
+    score, so adding symbols never moves existing ones and changing the
+    shard count only moves the symbols whose winning shard changed.
+    Explicit ``overrides`` pin symbols to a shard.
+    """
+
+    def __init__(self, shards: int, overrides: Optional[Dict[str, int]] = None):
+        if shards < 1:
+            raise ValueError("At least one shard is required")
+        self.shards = shards
+        self.overrides = dict(overrides or {})
+
+    def shard_for(self, symbol: str) -> int:
+        if symbol in self.overrides:
+            return self.overrides[symbol] % self.shards
+        return max(range(self.shards), key=lambda shard: zlib.crc32(f"{symbol}:{shard}".encode()))
+
+    def assign(self, symbols: List[str]) -> Dict[int, List[str]]:
+        """Symbols per shard (every shard present, possibly empty)"""
+        assignment: Dict[int, List[str]] = {shard: [] for shard in range(self.shards)}
+        for symbol in symbols:
+            assignment[self.shard_for(symbol)].append(symbol)
+        return assignment
+
+    @staticmethod
+    def parse_overrides(spec: str) -> Dict[str, int]:
+        """Parse 'ES:0,NQ:1' into {'ES': 0, 'NQ': 1}"""
+        overrides = {}
+        for item in filter(None, (part.strip() for part in spec.split(','))):
+            symbol, shard = item.split(':')
+            overrides[symbol.strip()] = int(shard)
+        return overrides
+
+
+class _ShardSink:
+    """Stands in for the data manager inside one shard's WebSocketFeed"""
+
+    def __init__(self, owner: 'ShardedFeed', shard: int):
+        self._owner = owner
+        self._shard = shard
+
+    @property
+    def is_connected(self) -> bool:
+        return self._owner.shard_status.get(self._shard, False)
+
+    @is_connected.setter
+    def is_connected(self, connected: bool):
+        self._owner._set_status(self._shard, connected)
+
+    def update_market_data_batch(self, batch: List[Tick], receive_ns: Optional[int] = None):
+        self._owner.data_manager.update_market_data_batch(batch, receive_ns)
+
+
+class _QueueSink:
+    """Shard sink in a worker process: forwards decoded ticks to the parent"""
+
+    def __init__(self, shard: int, out_queue):
+        self._shard = shard
+        self._queue = out_queue
+        self._connected = False
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    @is_connected.setter
+    def is_connected(self, connected: bool):
+        self._connected = connected
+        self._queue.put(('status', self._shard, connected))
+
+    def update_market_data_batch(self, batch: List[Tick], receive_ns: Optional[int] = None):
+        self._queue.put(('ticks', self._shard, [
+            (t.symbol, t.price, t.bid, t.ask, t.volume, t.timestamp_ns,
+             t.change, t.change_percent, t.receive_ns or receive_ns or 0)
+            for t in batch
+        ]))
+
+
+def _run_shard_process(shard: int, url: str, symbols: List[str], api_key: str,
+                       out_queue, stop_event):
+    """Worker process entry point: stream and decode one shard's symbols"""
+    feed = WebSocketFeed(url, symbols, _QueueSink(shard, out_queue), api_key=api_key)
+    feed.start()
+    stop_event.wait()
+    feed.stop()
+
+
+class ShardedFeed:
+    """Runs one websocket connection per shard and publishes into one data manager.
+
+    In ``thread`` mode each shard is a WebSocketFeed on its own thread and
+    the data manager serializes their publishes. In ``process`` mode each
+    shard streams and decodes in a worker process and ships compact tuples
+    back over a queue, so decode work scales across cores; publishing
+    (snapshot, history, bars, stats, callbacks) still runs on one collector
+    thread in this process. Connection status is the OR of all shards.
+    """
+
+    MODES = ('thread', 'process')
+
+    def __init__(self, url: str, symbols: List[str], data_manager: LiveDataManager,
+                 shards: int = 2, mode: str = 'thread', overrides: Optional[Dict[str, int]] = None,
+                 api_key: str = ""):
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {self.MODES}")
+        self.url = url
+        self.symbols = list(symbols)
+        self.data_manager = data_manager
+        self.mode = mode
+        self.api_key = api_key
+        self.assigner = ShardAssigner(shards, overrides)
+        self.assignment: Dict[int, List[str]] = {}
+        self.shard_status: Dict[int, bool] = {}
+
+        self._workers: Dict[int, object] = {}
+        self._stop_events: Dict[int, object] = {}
+        self._queue = None
+        self._collector: Optional[threading.Thread] = None
+        self._running = False
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def start(self):
+        """Start every non-empty shard"""
+        self._running = True
+        if self.mode == 'process':
+            self._queue = multiprocessing.Queue(maxsize=10000)
+            self._collector = threading.Thread(target=self._collect, name="shard-collector", daemon=True)
+            self._collector.start()
+        self._apply(self.assigner.assign(self.symbols))
+
+    def stop(self):
+        """Stop every shard"""
+        self._running = False
+        with self._lock:
+            for shard in list(self._workers):
+                self._stop_shard(shard)
+        if self._collector:
+            self._collector.join(2.0)
+        self.data_manager.is_connected = False
+
+    def add_symbols(self, symbols: List[str]):
+        """Add symbols, restarting only the shards whose symbol set changed"""
+        self.symbols.extend(s for s in symbols if s not in self.symbols)
+        self._apply(self.assigner.assign(self.symbols))
+
+    def rebalance(self, shards: int):
+        """Change the shard count and move only the symbols whose shard changed"""
+        self.assigner = ShardAssigner(shards, self.assigner.overrides)
+        self._apply(self.assigner.assign(self.symbols))
+
+    def _apply(self, assignment: Dict[int, List[str]]):
+        with self._lock:
+            for shard in list(self._workers):
+                if assignment.get(shard) != self.assignment.get(shard):
+                    self._stop_shard(shard)
+            for shard, symbols in assignment.items():
+                if symbols and shard not in self._workers:
+                    self._start_shard(shard, symbols)
+            self.assignment = assignment
+        self.logger.info(f"Feed shard assignment: {assignment}")
+
+    def _start_shard(self, shard: int, symbols: List[str]):
+        if self.mode == 'thread':
+            feed = WebSocketFeed(self.url, symbols, _ShardSink(self, shard), api_key=self.api_key)
+            feed.start()
+            self._workers[shard] = feed
+        else:
+            stop_event = multiprocessing.Event()
+            process = multiprocessing.Process(
+                target=_run_shard_process,
+                args=(shard, self.url, symbols, self.api_key, self._queue, stop_event),
+                name=f"feed-shard-{shard}",
+                daemon=True
+            )
+            process.start()
+            self._workers[shard] = process
+            self._stop_events[shard] = stop_event
+
+    def _stop_shard(self, shard: int):
+        worker = self._workers.pop(shard)
+        if self.mode == 'thread':
+            worker.stop()
+        else:
+            self._stop_events.pop(shard).set()
+            worker.join(5.0)
+            if worker.is_alive():
+                worker.terminate()
+        self._set_status(shard, False)
+
+    def _set_status(self, shard: int, connected: bool):
+        self.shard_status[shard] = connected
+        self.data_manager.is_connected = any(self.shard_status.values())
+
+    def _collect(self):
+        """Publish tick batches arriving from shard processes"""
+        while self._running:
+            try:
+                kind, shard, payload = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if kind == 'status':
+                # Ignore late status from a shard that has since been stopped
+                if shard in self._workers:
+                    self._set_status(shard, payload)
+                continue
+            batch = [Tick(*fields) for fields in payload]
+            receive_ns = min(t.receive_ns for t in batch) if batch else None
+            self.data_manager.update_market_data_batch(batch, receive_ns)
@@ -0,0 +1,134 @@
+"""
+Latency Statistics
+Low-overhead log-bucketed latency histograms for the market data path
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Pipeline stages measured for every tick
+LATENCY_STAGES = ('source_to_receive', 'receive_to_publish', 'publish_to_callback')
+
+# Values below 2**SUB_BUCKET_BITS are exact; above, each power of two is split
+# into 2**SUB_BUCKET_BITS buckets (about 6% relative resolution)
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_SHIFT = 40  # covers latencies up to ~2**45 ns (about 9 hours)
+BUCKET_COUNT = SUB_BUCKETS * (MAX_SHIFT + 2)
+
+
+def _bucket_bounds() -> Tuple[np.ndarray, np.ndarray]:
+    """Lower and upper bound of every bucket in nanoseconds"""
+    lower = np.zeros(BUCKET_COUNT, dtype=np.float64)
+    upper = np.zeros(BUCKET_COUNT, dtype=np.float64)
+    lower[:SUB_BUCKETS] = np.arange(SUB_BUCKETS)
+    upper[:SUB_BUCKETS] = np.arange(SUB_BUCKETS) + 1
+    for shift in range(MAX_SHIFT + 1):
+        base = SUB_BUCKETS * (shift + 1)
+        mantissas = np.arange(SUB_BUCKETS, 2 * SUB_BUCKETS)
+        lower[base:base + SUB_BUCKETS] = mantissas * 2.0 ** shift
+        upper[base:base + SUB_BUCKETS] = (mantissas + 1) * 2.0 ** shift
+    return lower, upper
+
+
+_LOWER, _UPPER = _bucket_bounds()
+_MIDPOINTS = (_LOWER + _UPPER) / 2
+
+
+class LatencyHistogram:
+    """HDR-style histogram of nanosecond latencies with O(1) recording.
+
+    Recording is a bit-length computation and a list increment, cheap enough
+    to run for every tick. Concurrent recorders may occasionally lose an
+    increment; that is acceptable for monitoring.
+    """
+
+    def __init__(self):
+        self.counts: List[int] = [0] * BUCKET_COUNT
+        self.total = 0
+        self.max_ns = 0
+
+    def record(self, value_ns: int):
+        if value_ns < 0:
+            value_ns = 0
+        if value_ns < SUB_BUCKETS:
+            index = value_ns
+        else:
+            shift = value_ns.bit_length() - SUB_BUCKET_BITS - 1
+            if shift > MAX_SHIFT:
+                shift, value_ns = MAX_SHIFT, (2 * SUB_BUCKETS - 1) << MAX_SHIFT
+            index = SUB_BUCKETS * (shift + 1) + (value_ns >> shift) - SUB_BUCKETS
+        self.counts[index] += 1
+        self.total += 1
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Add another histogram's counts into this one"""
+        self.counts = (np.asarray(self.counts) + np.asarray(other.counts)).tolist()
+        self.total += other.total
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentiles(self, quantiles: Tuple[float, ...] = (0.5, 0.99, 0.999)) -> List[float]:
+        """Approximate latencies in nanoseconds at the given quantiles"""
+        counts = np.asarray(self.counts)
+        total = counts.sum()
+        if total == 0:
+            return [0.0 for _ in quantiles]
+        cumulative = np.cumsum(counts)
+        ranks = np.ceil(np.asarray(quantiles) * total)
+        indices = np.searchsorted(cumulative, ranks, side='left')
+        return np.minimum(_MIDPOINTS[indices], self.max_ns).tolist()
+
+    def summary(self) -> Dict[str, float]:
+        """Count and p50/p99/p99.9/max latency in microseconds"""
+        p50, p99, p999 = self.percentiles()
+        return {
+            'count': self.total,
+            'p50_us': p50 / 1000,
+            'p99_us': p99 / 1000,
+            'p999_us': p999 / 1000,
+            'max_us': self.max_ns / 1000,
+        }
+
+
+class LatencyMonitor:
+    """Per-stage, per-symbol latency histograms"""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, stage: str, symbol: str) -> LatencyHistogram:
+        key = (stage, symbol)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def record(self, stage: str, symbol: str, value_ns: int):
+        """Record one latency sample"""
+        self.histogram(stage, symbol).record(value_ns)
+
+    def symbols(self) -> List[str]:
+        return sorted({symbol for _, symbol in self._histograms})
+
+    def summary(self, stage: Optional[str] = None, symbol: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Percentile summaries keyed by stage, merged over symbols unless one is given"""
+        stages = [stage] if stage else list(LATENCY_STAGES)
+        result = {}
+        for name in stages:
+            merged = LatencyHistogram()
+            for (hist_stage, hist_symbol), histogram in list(self._histograms.items()):
+                if hist_stage == name and (symbol is None or hist_symbol == symbol):
+                    merged.merge(histogram)
+            result[name] = merged.summary()
+        return result
+
+    def reset(self):
+        """Discard all recorded samples"""
+        with self._lock:
+            self._histograms = {}
@@ -4,16 +4,29 @@ Connects to real market data feeds and broker APIs
 """
 
 import asyncio
-import websocket
 import json
 import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union, Callable
 import logging
 from dataclasses import dataclass
+import sys
 import time
+import numpy as np
+from market_clock import WallClock
+from bar_aggregator import Bar, BarAggregator
+from latency_stats import LatencyMonitor
+from callback_dispatch import CallbackDispatcher, ConflatedConsumer, OverflowPolicy, Subscriber
+from order_book import BookUpdate, Level, OrderBook
+from position_book import PositionBook
+from staleness_monitor import StalenessEvent, StalenessMonitor
+from symbol_stats import SymbolStatsSnapshot, SymbolStatsTracker
+from tick_history import TickHistory, TimeLike, to_epoch_ns
+from tick_journal import TickJournal
+from trading_config import CONFIG
 
-@dataclass
+@dataclass(frozen=True)
 class MarketData:
     """Real-time market data structure"""
     symbol: str
@@ -36,28 +49,225 @@ class Position:
     entry_time: datetime
     position_id: str
 
+# Fixed-point prices are integers in units of 1 / PRICE_SCALE
+PRICE_SCALE = 100_000_000
+
+def to_fixed(price: float, scale: int = PRICE_SCALE) -> int:
+    """Convert a float price to fixed-point"""
+    return int(round(price * scale))
+
+def from_fixed(value: int, scale: int = PRICE_SCALE) -> float:
+    """Convert a fixed-point price back to float"""
+    return value / scale
+
+class Tick:
+    """Compact market data update used on the ingest path.
+    
+    Slotted (no per-instance __dict__), timestamped with integer epoch
+    nanoseconds and carrying an interned symbol. Exposes the same attributes
+    as MarketData, including a ``timestamp`` datetime, so readers can use
+    either type. Treat instances as immutable once published.
+    """
+    
+    __slots__ = ('symbol', 'price', 'bid', 'ask', 'volume', 'timestamp_ns',
+                 'change', 'change_percent', 'receive_ns', 'publish_ns')
+    
+    # Fields compared by __eq__ (the monotonic latency stamps are excluded)
+    _FIELDS = __slots__[:8]
+    
+    def __init__(self, symbol: str, price: float, bid: float, ask: float, volume: int,
+                 timestamp_ns: int, change: float = 0.0, change_percent: float = 0.0,
+                 receive_ns: int = 0):
+        self.symbol = sys.intern(symbol)
+        self.price = price
+        self.bid = bid
+        self.ask = ask
+        self.volume = volume
+        self.timestamp_ns = timestamp_ns  # source time, epoch ns
+        self.change = change
+        self.change_percent = change_percent
+        self.receive_ns = receive_ns  # time.monotonic_ns() when received
+        self.publish_ns = 0  # time.monotonic_ns() when published
+    
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp_ns / 1_000_000_000)
+    
+    def fixed_prices(self, scale: int = PRICE_SCALE) -> Tuple[int, int, int]:
+        """Price, bid and ask in fixed-point"""
+        return to_fixed(self.price, scale), to_fixed(self.bid, scale), to_fixed(self.ask, scale)
+    
+    def to_market_data(self) -> MarketData:
+        """Convert to a MarketData for UI code"""
+        return MarketData(self.symbol, self.price, self.bid, self.ask, self.volume,
+                          self.timestamp, self.change, self.change_percent)
+    
+    @classmethod
+    def from_market_data(cls, market_data: MarketData) -> 'Tick':
+        """Convert a MarketData into a Tick"""
+        return cls(market_data.symbol, market_data.price, market_data.bid, market_data.ask,
+                   market_data.volume, to_epoch_ns(market_data.timestamp),
+                   market_data.change, market_data.change_percent)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Tick):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._FIELDS)
+    
+    def __repr__(self) -> str:
+        return (f"Tick(symbol={self.symbol!r}, price={self.price}, bid={self.bid}, "
+                f"ask={self.ask}, volume={self.volume}, timestamp_ns={self.timestamp_ns})")
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """Immutable, versioned view of the latest market data per symbol"""
+    version: int
+    data: Mapping[str, Tick]
+
 class LiveDataManager:
     """Manages live market data connections and trading data"""
     
-    def __init__(self):
-        self.market_data: Dict[str, MarketData] = {}
-        self.positions: Dict[str, Position] = {}
-        self.data_callbacks: List[Callable] = []
+    def __init__(self, history_size: Optional[int] = None):
+        self._snapshot = MarketSnapshot(0, MappingProxyType({}))
+        self.tick_history = TickHistory(history_size or CONFIG.tick_history_size)
+        # Bars of quiet symbols close on the data manager's clock, so replays close them in market time
+        self.bars = BarAggregator(CONFIG.bar_history_size, now_ns=lambda: self.clock.now_ns())
+        self.books: Dict[str, OrderBook] = {}
+        self.symbol_stats = SymbolStatsTracker(CONFIG.stats_ewma_lambda, CONFIG.session_reset_hour_utc)
+        self.journal: Optional[TickJournal] = None
+        if CONFIG.journal_dir and CONFIG.data_plane_role != "reader":
+            self.journal = TickJournal(
+                CONFIG.journal_dir,
+                segment_records=CONFIG.journal_segment_records,
+                fsync=CONFIG.journal_fsync,
+                fsync_interval=CONFIG.journal_fsync_interval,
+                max_pending=CONFIG.journal_max_pending
+            )
+        self.position_book = PositionBook()
+        self.latency: Optional[LatencyMonitor] = LatencyMonitor() if CONFIG.latency_tracking else None
+        self.dispatcher = CallbackDispatcher(
+            OverflowPolicy(CONFIG.callback_overflow_policy),
+            CONFIG.callback_queue_size,
+            CONFIG.callback_latency_budget,
+            latency=self.latency
+        )
         self.is_connected = False
-        self.ws = None
+        self.feed = None
+        self.clock = WallClock()
+        self.staleness: Optional[StalenessMonitor] = None
+        if CONFIG.stale_quote_seconds > 0:
+            # Ages are measured on the data manager's clock so replays go stale in market time
+            self.staleness = StalenessMonitor(CONFIG.stale_quote_seconds, lambda: self.clock.now_ns())
         self._lock = threading.Lock()
+        # One publisher at a time: sharded feeds call in from several threads
+        self._publish_lock = threading.Lock()
+        
+        # The feed owner mirrors quotes and positions into shared memory
+        self.shared = None
+        if CONFIG.data_plane_role == "owner":
+            from shared_market_data import SharedMarketDataWriter
+            
+            self.shared = SharedMarketDataWriter(
+                CONFIG.data_plane_name,
+                max_symbols=CONFIG.data_plane_max_symbols,
+                max_positions=CONFIG.data_plane_max_positions
+            )
         
         # Setup logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
     
-    def add_data_callback(self, callback: Callable):
-        """Add callback for data updates"""
-        self.data_callbacks.append(callback)
+    @property
+    def data_callbacks(self) -> List[Callable]:
+        """Registered data update callbacks"""
+        return [subscriber.callback for subscriber in self.dispatcher.subscribers]
+    
+    def add_data_callback(self, callback: Callable, name: Optional[str] = None,
+                          policy: Optional[OverflowPolicy] = None) -> Subscriber:
+        """Add callback for data updates, run on its own worker thread"""
+        return self.dispatcher.add_subscriber(callback, name=name, policy=policy)
+    
+    def subscribe(self, symbols: List[str], callback: Callable, name: Optional[str] = None,
+                  policy: Optional[OverflowPolicy] = None) -> Subscriber:
+        """Subscribe a callback to ticks for the given symbols.
+
+        Entries may be symbols, group names from CONFIG.symbol_groups
+        (e.g. 'index_futures', 'treasury_futures', 'fx_futures') or '*' for every symbol.
+        """
+        return self.dispatcher.add_subscriber(
+            callback, name=name, policy=policy, symbols=CONFIG.expand_symbols(symbols)
+        )
+    
+    def add_conflated_consumer(self, name: str, interval: float, callback: Optional[Callable] = None,
+                               symbols: Optional[List[str]] = None,
+                               expire_after: Optional[float] = None) -> ConflatedConsumer:
+        """Add a consumer that sees only the latest tick per symbol, at most every interval seconds.
+        
+        With a callback, it is called with a {symbol: tick} dict on a worker
+        thread; without one, call poll() on the returned consumer. The first
+        delivery includes the current value of every subscribed symbol.
+        """
+        consumer = self.dispatcher.add_conflated_consumer(
+            name, interval, callback,
+            symbols=CONFIG.expand_symbols(symbols) if symbols else None,
+            expire_after=expire_after
+        )
+        consumer.seed(self._snapshot.data)
+        return consumer
+    
+    def remove_data_callback(self, subscriber: Subscriber):
+        """Remove a callback added with add_data_callback or subscribe"""
+        self.dispatcher.remove_subscriber(subscriber)
+    
+    def get_latency_summary(self, stage: Optional[str] = None,
+                            symbol: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """p50/p99/p99.9 feed latency per pipeline stage, optionally for one symbol"""
+        if self.latency is None:
+            return {}
+        return self.latency.summary(stage, symbol)
+    
+    def get_callback_stats(self) -> Dict[str, Dict]:
+        """Queue depth, drop counts and callback timings per subscriber"""
+        return self.dispatcher.get_stats()
     
     def connect_to_feed(self, url: str, symbols: List[str]):
         """Connect to live data feed"""
         try:
+            if CONFIG.data_plane_role == "reader":
+                from shared_market_data import SharedMarketDataReader
+                
+                self.feed = SharedMarketDataReader(self, CONFIG.data_plane_name,
+                                                   CONFIG.data_plane_poll_interval)
+                self.feed.start()
+                self.logger.info(f"Reading market data from shared memory: {CONFIG.data_plane_name}")
+                return
+            
+            if CONFIG.data_feed_mode == "live":
+                if CONFIG.feed_shards > 1:
+                    from feed_sharding import ShardAssigner, ShardedFeed
+                    
+                    self.feed = ShardedFeed(url, symbols, self, shards=CONFIG.feed_shards,
+                                            mode=CONFIG.feed_shard_mode,
+                                            overrides=ShardAssigner.parse_overrides(CONFIG.feed_shard_map),
+                                            api_key=CONFIG.broker_api_key)
+                else:
+                    from market_feed import WebSocketFeed
+                    
+                    self.feed = WebSocketFeed(url, symbols, self, api_key=CONFIG.broker_api_key)
+                self.feed.start()
+                self.logger.info(f"Connecting to data feed: {url}")
+                return
+            
+            if CONFIG.data_feed_mode == "replay":
+                from tick_replay import TickReplayer
+                
+                day = datetime.strptime(CONFIG.replay_date, "%Y%m%d").date() if CONFIG.replay_date else None
+                self.feed = TickReplayer.from_journal(self, CONFIG.replay_dir, day,
+                                                      speed=CONFIG.replay_speed)
+                self.feed.start()
+                self.logger.info(f"Replaying ticks from {CONFIG.replay_dir}")
+                return
+            
             # For demo purposes, simulate connection
             self.is_connected = True
             self.logger.info(f"Connected to data feed: {url}")
@@ -72,114 +282,306 @@ class LiveDataManager:
     
     def _simulate_market_data(self, symbols: List[str]):
         """Simulate real-time market data for testing"""
-        import random
-        import math
+        from market_simulator import VectorizedMarketSimulator
         
-        # Initialize base prices
-        base_prices = {
-            'ES': 4485.25,
-            'NQ': 15847.50,
-            'CL': 82.45,
-            'GC': 2045.20,
-            'YM': 34567.80,
-            'RTY': 2089.45
-        }
+        simulator = VectorizedMarketSimulator(
+            symbols,
+            tick_rate=CONFIG.simulator_tick_rate,
+            seed=CONFIG.simulator_seed
+        )
+        simulator.run(self)
+    
+    @property
+    def market_data(self) -> Mapping[str, Tick]:
+        """Latest market data per symbol (read-only)"""
+        return self._snapshot.data
+    
+    @property
+    def version(self) -> int:
+        """Version of the current market data snapshot"""
+        return self._snapshot.version
+    
+    def get_snapshot(self) -> MarketSnapshot:
+        """Get the current immutable market data snapshot without locking"""
+        return self._snapshot
+    
+    def update_market_data(self, market_data: Union[Tick, MarketData]):
+        """Publish a market data update from a feed"""
+        self.update_market_data_batch([market_data])
+    
+    def update_market_data_batch(self, batch: List[Union[Tick, MarketData]],
+                                 receive_ns: Optional[int] = None):
+        """Publish a batch of market data updates as a single new snapshot.
         
-        while self.is_connected:
-            try:
-                current_time = datetime.now()
-                
-                for symbol in symbols:
-                    if symbol not in base_prices:
-                        continue
-                        
-                    # Generate realistic price movement
-                    base_price = base_prices[symbol]
-                    time_factor = current_time.timestamp() % 3600  # Hour cycle
-                    trend = math.sin(time_factor / 3600 * 2 * math.pi) * 0.001
-                    volatility = random.gauss(0, 0.0005)
-                    
-                    # Update price with trend and volatility
-                    new_price = base_price * (1 + trend + volatility)
-                    base_prices[symbol] = new_price
-                    
-                    # Create market data
-                    spread = new_price * 0.0001  # 1 basis point spread
-                    market_data = MarketData(
-                        symbol=symbol,
-                        price=round(new_price, 2),
-                        bid=round(new_price - spread/2, 2),
-                        ask=round(new_price + spread/2, 2),
-                        volume=random.randint(100, 1000),
-                        timestamp=current_time,
-                        change=round((new_price - base_price) * 100, 2),
-                        change_percent=round((new_price - base_price) / base_price * 100, 4)
-                    )
-                    
-                    with self._lock:
-                        self.market_data[symbol] = market_data
-                    
-                    # Notify callbacks
-                    for callback in self.data_callbacks:
-                        try:
-                            callback(market_data)
-                        except Exception as e:
-                            self.logger.error(f"Callback error: {e}")
-                
-                time.sleep(0.1)  # Update every 100ms
-                
-            except Exception as e:
-                self.logger.error(f"Market data simulation error: {e}")
-                time.sleep(1)
+        receive_ns is the time.monotonic_ns() at which the feed received the
+        batch; it defaults to now for ticks that carry no receive stamp.
+        Sharded feeds call this from several threads; publishes are
+        serialized so staleness, bars, latency and stats see one writer.
+        """
+        if not batch:
+            return
+        received_ns = time.monotonic_ns()
+        receive_ns = receive_ns or received_ns
+        batch = [tick if type(tick) is Tick else Tick.from_market_data(tick) for tick in batch]
+        
+        with self._publish_lock:
+            self._publish(batch, received_ns, receive_ns)
     
-    def get_market_data(self, symbol: str) -> Optional[MarketData]:
-        """Get current market data for symbol"""
+    def _publish(self, batch: List[Tick], received_ns: int, receive_ns: int):
+        """Swap the snapshot and feed every downstream structure (caller holds _publish_lock)"""
+        # Copy-on-write: readers keep using the old snapshot until the swap
+        data = dict(self._snapshot.data)
+        for tick in batch:
+            data[tick.symbol] = tick
+        self._snapshot = MarketSnapshot(
+            self._snapshot.version + 1, MappingProxyType(data)
+        )
+        
+        # Journal writes happen on the journal's own thread
+        if self.journal:
+            self.journal.append_batch(batch)
+        
+        # Mark positions once per batch rather than on every read
         with self._lock:
-            return self.market_data.get(symbol)
+            self.position_book.mark_to_market(
+                {tick.symbol: tick.price for tick in batch}
+            )
+            if self.shared:
+                self._publish_shared(batch)
+        
+        publish_ns = time.monotonic_ns()
+        staleness = self.staleness
+        if staleness:
+            now_ns = self.clock.now_ns()
+        latency = self.latency
+        if latency:
+            # Wall-clock (or replay-clock) time corresponding to monotonic zero
+            wall_offset = self.clock.now_ns() - received_ns
+        
+        for tick in batch:
+            if not tick.receive_ns:
+                tick.receive_ns = receive_ns
+            tick.publish_ns = publish_ns
+            if latency:
+                latency.record('source_to_receive', tick.symbol,
+                               tick.receive_ns + wall_offset - tick.timestamp_ns)
+                latency.record('receive_to_publish', tick.symbol, publish_ns - tick.receive_ns)
+            
+            self.tick_history.append(
+                tick.symbol,
+                tick.timestamp_ns,
+                tick.price,
+                tick.bid,
+                tick.ask,
+                tick.volume
+            )
+            self.bars.update(tick.symbol, tick.timestamp_ns, tick.price, tick.volume)
+            self.symbol_stats.update(tick.symbol, tick.timestamp_ns, tick.price,
+                                     tick.bid, tick.ask, tick.volume)
+            if staleness:
+                staleness.touch(tick.symbol, now_ns)
+            
+            # Queue for callbacks; they run on their own workers
+            self.dispatcher.publish(tick)
     
-    def get_all_market_data(self) -> Dict[str, MarketData]:
-        """Get all current market data"""
-        with self._lock:
-            return self.market_data.copy()
+    def get_history(self, symbol: str, n: Optional[int] = None) -> np.ndarray:
+        """Get a zero-copy view of the last n ticks for symbol (all if n is None)"""
+        return self.tick_history.get_history(symbol, n)
+    
+    def get_history_range(self, symbol: str, start: Optional[TimeLike] = None,
+                          end: Optional[TimeLike] = None) -> np.ndarray:
+        """Get a zero-copy view of ticks for symbol between start and end"""
+        return self.tick_history.get_range(symbol, start, end)
+    
+    def get_bars(self, symbol: str, interval: str = '1m', n: Optional[int] = None,
+                 include_forming: bool = False) -> np.ndarray:
+        """Get the last n OHLCV bars for symbol ('1s', '1m', '5m' or '1h')"""
+        return self.bars.get_bars(symbol, interval, n, include_forming)
+    
+    def subscribe_bars(self, symbols: List[str], callback: Callable[[Bar], None],
+                       name: Optional[str] = None) -> Subscriber:
+        """Subscribe a callback to bar-close events (symbols, groups or '*')"""
+        return self.bars.subscribe(CONFIG.expand_symbols(symbols), callback, name=name)
+    
+    def is_stale(self, symbol: str) -> bool:
+        """True if symbol has no quote newer than stale_quote_seconds (never when disabled)"""
+        return self.staleness.is_stale(symbol) if self.staleness else False
+    
+    def subscribe_staleness(self, callback: Callable[[StalenessEvent], None],
+                            symbols: Optional[List[str]] = None,
+                            name: Optional[str] = None) -> Optional[Subscriber]:
+        """Call ``callback`` when symbols go stale or recover"""
+        return self.staleness.subscribe(callback, symbols, name) if self.staleness else None
+    
+    def _book(self, symbol: str) -> OrderBook:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books.setdefault(symbol, OrderBook(symbol))
+        return book
+    
+    def update_book(self, symbol: str, updates: List[BookUpdate], timestamp_ns: int = 0):
+        """Apply level-2 updates ('bid'/'ask', price, size; size 0 deletes) to a symbol's book.
+        
+        No bundled feed carries depth (Tradier streams top of book only), so
+        books stay empty until a level-2 source calls this or replace_book.
+        """
+        self._book(symbol).apply(updates, timestamp_ns)
+    
+    def replace_book(self, symbol: str, bids: List[Level], asks: List[Level], timestamp_ns: int = 0):
+        """Replace a symbol's book from a depth snapshot"""
+        self._book(symbol).replace(bids, asks, timestamp_ns)
+    
+    def get_book(self, symbol: str) -> Optional[OrderBook]:
+        """Level-2 book for symbol (None until depth has been received)"""
+        return self.books.get(symbol)
+    
+    def get_stats(self, symbol: str) -> Optional[SymbolStatsSnapshot]:
+        """Session VWAP, EWMA volatility, average spread and high/low for symbol"""
+        return self.symbol_stats.get(symbol)
+    
+    def get_all_stats(self) -> Dict[str, SymbolStatsSnapshot]:
+        """Running statistics for every symbol seen this session"""
+        return self.symbol_stats.get_all()
+    
+    def get_market_data(self, symbol: str) -> Optional[Tick]:
+        """Get current market data for symbol"""
+        return self._snapshot.data.get(symbol)
+    
+    def get_all_market_data(self) -> Mapping[str, Tick]:
+        """Get all current market data as a read-only mapping"""
+        return self._snapshot.data
+    
+    @property
+    def positions(self) -> Dict[str, Position]:
+        """Current positions keyed by position id"""
+        return self.get_positions()
     
     def add_position(self, position: Position):
         """Add a trading position"""
         with self._lock:
-            self.positions[position.position_id] = position
+            self.position_book.add(
+                position.position_id,
+                position.symbol,
+                position.quantity,
+                position.entry_price,
+                position.current_price,
+                position.entry_time
+            )
+            if self.shared:
+                self._publish_shared()
             self.logger.info(f"Added position: {position.symbol} {position.quantity}")
     
     def update_position_prices(self):
         """Update position P&L with current market prices"""
+        prices = {symbol: data.price for symbol, data in self._snapshot.data.items()}
         with self._lock:
-            for position in self.positions.values():
-                market_data = self.market_data.get(position.symbol)
-                if market_data:
-                    position.current_price = market_data.price
-                    position.unrealized_pnl = (
-                        (position.current_price - position.entry_price) * 
-                        position.quantity
-                    )
+            self.position_book.mark_to_market(prices)
+    
+    def _to_position(self, position_id: str, row: np.void) -> Position:
+        """Build a Position from a position book row"""
+        return Position(
+            symbol=self.position_book.symbol_of(row),
+            quantity=float(row['quantity']),
+            entry_price=float(row['entry_price']),
+            current_price=float(row['current_price']),
+            unrealized_pnl=float(row['unrealized_pnl']),
+            entry_time=datetime.fromtimestamp(row['entry_time'] / 1_000_000_000),
+            position_id=position_id
+        )
+    
+    def get_position(self, position_id: str) -> Optional[Position]:
+        """Get one position (None if it is not open)"""
+        with self._lock:
+            row = self.position_book.row(position_id)
+            return None if row is None else self._to_position(position_id, row)
     
     def get_positions(self) -> Dict[str, Position]:
-        """Get all current positions"""
-        self.update_position_prices()
+        """Get all current positions (already marked to market on ingest)"""
         with self._lock:
-            return self.positions.copy()
+            return {
+                position_id: self._to_position(position_id, row)
+                for position_id, row in zip(self.position_book.position_ids(),
+                                            self.position_book.view())
+            }
     
-    def close_position(self, position_id: str) -> bool:
-        """Close a trading position"""
+    def get_positions_array(self) -> Tuple[List[str], np.ndarray]:
+        """Get position ids and a marked copy of the position rows"""
+        with self._lock:
+            return self.position_book.position_ids(), self.position_book.view().copy()
+    
+    def apply_fills(self, opened: Sequence[Position], closed: Sequence[Tuple[str, float, float]]):
+        """Open and close many positions under one lock and one shared-memory publish.
+        
+        ``closed`` holds (position_id, exit_price, quantity) for closing fills.
+        """
+        if not opened and not closed:
+            return
         with self._lock:
-            if position_id in self.positions:
-                position = self.positions.pop(position_id)
-                self.logger.info(f"Closed position: {position.symbol} {position.quantity}")
-                return True
-            return False
+            book = self.position_book
+            if opened:
+                book.add_batch([position.position_id for position in opened],
+                               [position.symbol for position in opened],
+                               [position.quantity for position in opened],
+                               [position.entry_price for position in opened],
+                               [position.entry_time for position in opened])
+            removed = sum(book.reduce(position_id, quantity, exit_price) is not None
+                          for position_id, exit_price, quantity in closed)
+            if self.shared:
+                self._publish_shared()
+        self.logger.info(f"Applied fills: {len(opened)} positions opened, {removed} closed")
+    
+    def get_exposure(self) -> Dict[str, float]:
+        """Running portfolio totals: gross/net exposure, unrealized and realized P&L"""
+        with self._lock:
+            book = self.position_book
+            return {
+                'gross_exposure': book.gross_exposure,
+                'net_exposure': book.net_exposure,
+                'unrealized_pnl': book.unrealized_pnl,
+                'realized_pnl': book.realized_pnl,
+                'positions': len(book)
+            }
+    
+    def get_symbol_exposure(self, symbol: str) -> Tuple[float, float, float]:
+        """(net quantity, gross exposure, net exposure) for one symbol"""
+        with self._lock:
+            return self.position_book.symbol_exposure(symbol)
+    
+    def position_count(self) -> int:
+        return len(self.position_book)
+    
+    def close_position(self, position_id: str, exit_price: Optional[float] = None,
+                       quantity: Optional[float] = None) -> bool:
+        """Close a trading position, or ``quantity`` of it, realizing P&L at exit_price (default: current mark)"""
+        with self._lock:
+            book = self.position_book
+            row = book.row(position_id)
+            if row is None:
+                return False
+            closed = book.reduce(position_id, abs(row['quantity']) if quantity is None else quantity, exit_price)
+            if self.shared:
+                self._publish_shared()
+            self.logger.info(f"Closed position: {book.symbol_of(row)} {closed} of {abs(row['quantity'])}")
+            return True
+    
+    def replace_positions(self, book: PositionBook):
+        """Swap in a whole position book (used by shared memory readers)"""
+        with self._lock:
+            self.position_book = book
+    
+    def _publish_shared(self, ticks: Sequence[Tick] = ()):
+        """Mirror ticks and the position table into shared memory (caller holds _lock)"""
+        book = self.position_book
+        self.shared.publish(ticks, book.position_ids(), book.view(), book.symbols(), self.is_connected)
     
     def disconnect(self):
         """Disconnect from data feed"""
         self.is_connected = False
-        if self.ws:
-            self.ws.close()
+        if self.feed:
+            self.feed.stop()
+            self.feed = None
+        if self.shared:
+            self.shared.set_connected(False)
         self.logger.info("Disconnected from data feed")
 
 # Global data manager instance
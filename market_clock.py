@@ -0,0 +1,43 @@
+"""
+Market Clocks
+Wall-clock and simulated time sources shared by the data manager and engine
+"""
+
+import threading
+import time
+from datetime import datetime
+
+
+class WallClock:
+    """Real time"""
+
+    def now_ns(self) -> int:
+        return time.time_ns()
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+
+class SimulatedClock:
+    """Time that only moves when a replay or test advances it"""
+
+    def __init__(self, start_ns: int = 0):
+        self._now_ns = start_ns
+        self._lock = threading.Lock()
+
+    def now_ns(self) -> int:
+        return self._now_ns
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self._now_ns / 1_000_000_000)
+
+    def set(self, timestamp_ns: int):
+        """Move the clock forward to timestamp_ns (never backwards)"""
+        with self._lock:
+            if timestamp_ns > self._now_ns:
+                self._now_ns = timestamp_ns
+
+    def advance(self, nanoseconds: int):
+        """Move the clock forward by a duration"""
+        with self._lock:
+            self._now_ns += max(0, nanoseconds)
@@ -0,0 +1,232 @@
+"""
+Streaming Market Data Feed
+Asyncio websocket client that decodes quotes in batches and publishes them
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from live_data import LiveDataManager, Tick
+from tradier_decoder import TradierDecoder
+from trading_config import CONFIG
+
+TRADIER_SESSION_URL = "https://api.tradier.com/v1/markets/events/session"
+
+logger = logging.getLogger(__name__)
+
+
+def decode_json_line(line: str) -> Optional[Tick]:
+    """Decode one JSON quote (None for messages that carry no price)"""
+    message = json.loads(line)
+    symbol = message.get('symbol')
+    price = message.get('price', message.get('last'))
+    bid = message.get('bid')
+    ask = message.get('ask')
+    if symbol is None or (price is None and (bid is None or ask is None)):
+        return None
+    if price is None:
+        price = (float(bid) + float(ask)) / 2
+    date = message.get('date', message.get('timestamp'))
+    return Tick(
+        symbol=symbol,
+        price=float(price),
+        bid=float(bid if bid is not None else price),
+        ask=float(ask if ask is not None else price),
+        volume=int(message.get('size', message.get('volume', 0))),
+        timestamp_ns=(int(date) * 1_000_000 if date is not None else time.time_ns())
+    )
+
+
+def decode_json_batch(frames: List[str]) -> List[Tick]:
+    """Decode websocket frames of newline-delimited JSON quotes into Ticks.
+    
+    A malformed line is logged and skipped; the rest of the batch is kept.
+    """
+    batch = []
+    for frame in frames:
+        for line in frame.splitlines():
+            if not line.strip():
+                continue
+            try:
+                tick = decode_json_line(line)
+            except (ValueError, TypeError, KeyError) as e:
+                logger.warning(f"Skipping undecodable message {line[:80]!r}: {e}")
+                continue
+            if tick is not None:
+                batch.append(tick)
+    return batch
+
+
+def make_decoder(feed_format: str) -> Callable[[List[str]], List[Tick]]:
+    """Decoder for a feed message format: 'tradier' (stateful, one per feed) or 'json'"""
+    if feed_format == 'tradier':
+        return TradierDecoder()
+    return decode_json_batch
+
+
+class WebSocketFeed:
+    """Websocket market data client running its own asyncio loop on one thread.
+
+    A receive task pushes raw frames into a bounded queue; when the queue is
+    full the receiver stops reading, which pushes back on the socket. A
+    publish task drains up to ``batch_size`` frames at a time, decodes them
+    in one call and publishes the result as a single snapshot.
+    """
+
+    def __init__(self, url: str, symbols: List[str], data_manager: LiveDataManager,
+                 decoder: Optional[Callable[[List[str]], List[Tick]]] = None,
+                 api_key: str = "", queue_size: int = 10000, batch_size: int = 500,
+                 reconnect_delay: float = 1.0):
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for live websocket feeds")
+        self.url = url
+        self.symbols = list(symbols)
+        self.data_manager = data_manager
+        self.decoder = decoder or make_decoder(CONFIG.data_feed_format)
+        self.api_key = api_key
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.reconnect_delay = reconnect_delay
+
+        self.stats: Dict[str, int] = {
+            'frames_received': 0,
+            'ticks_published': 0,
+            'batches_published': 0,
+            'decode_errors': 0,
+            'reconnects': 0,
+            'queue_high_water': 0,
+        }
+
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self.logger = logging.getLogger(__name__)
+
+    def start(self):
+        """Start the feed on a dedicated thread"""
+        self._thread = threading.Thread(target=lambda: asyncio.run(self.run()),
+                                        name=f"feed-{self.url}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the feed and wait for its thread to exit"""
+        if self._loop and self._stopping:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    async def run(self):
+        """Connect, stream and reconnect until stopped"""
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+
+        async with aiohttp.ClientSession() as session:
+            while not self._stopping.is_set():
+                try:
+                    await self._stream(session)
+                except Exception as e:
+                    self.logger.error(f"Data feed error: {e}")
+                finally:
+                    self.data_manager.is_connected = False
+
+                if self._stopping.is_set():
+                    break
+                self.stats['reconnects'] += 1
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.reconnect_delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _stream(self, session: "aiohttp.ClientSession"):
+        """Run one connection until it closes or the feed is stopped"""
+        subscription = await self._build_subscription(session)
+
+        async with session.ws_connect(self.url, heartbeat=30) as ws:
+            await ws.send_json(subscription)
+            self.data_manager.is_connected = True
+            self.logger.info(f"Connected to data feed: {self.url}")
+
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+            tasks = [
+                asyncio.ensure_future(self._receive(ws, queue)),
+                asyncio.ensure_future(self._publish(queue)),
+                asyncio.ensure_future(self._stopping.wait()),
+            ]
+            try:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception():
+                        raise task.exception()
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _build_subscription(self, session: "aiohttp.ClientSession") -> Dict:
+        """Build the subscribe message, creating a streaming session if needed"""
+        subscription = {'symbols': self.symbols, 'linebreak': True}
+        if isinstance(self.decoder, TradierDecoder):
+            subscription['filter'] = ['quote', 'trade', 'summary']
+        if self.api_key:
+            headers = {'Authorization': f"Bearer {self.api_key}", 'Accept': 'application/json'}
+            async with session.post(TRADIER_SESSION_URL, headers=headers) as response:
+                response.raise_for_status()
+                payload = await response.json()
+            subscription['sessionid'] = payload['stream']['sessionid']
+        return subscription
+
+    async def _receive(self, ws, queue: asyncio.Queue):
+        """Read frames off the socket into the bounded queue with receive stamps"""
+        async for message in ws:
+            if message.type == aiohttp.WSMsgType.TEXT:
+                await queue.put((time.monotonic_ns(), message.data))
+            elif message.type == aiohttp.WSMsgType.BINARY:
+                await queue.put((time.monotonic_ns(), message.data.decode('utf-8')))
+            else:
+                break
+            self.stats['frames_received'] += 1
+            depth = queue.qsize()
+            if depth > self.stats['queue_high_water']:
+                self.stats['queue_high_water'] = depth
+
+    async def _publish(self, queue: asyncio.Queue):
+        """Drain the queue in batches, decode and publish"""
+        while True:
+            frames = [await queue.get()]
+            while len(frames) < self.batch_size:
+                try:
+                    frames.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            receive_ns = frames[0][0]
+            try:
+                batch = self.decoder([data for _, data in frames])
+            except Exception:
+                # Decode frame by frame so one bad frame costs only itself
+                batch = self._decode_frames(frames)
+
+            if batch:
+                self.data_manager.update_market_data_batch(batch, receive_ns)
+                self.stats['ticks_published'] += len(batch)
+                self.stats['batches_published'] += 1
+
+    def _decode_frames(self, frames: List[Tuple[int, str]]) -> List[Tick]:
+        """Decode frames one at a time, logging and skipping any that fail"""
+        batch = []
+        for _, data in frames:
+            try:
+                batch.extend(self.decoder([data]))
+            except Exception as e:
+                self.stats['decode_errors'] += 1
+                self.logger.error(f"Skipping undecodable frame {data[:80]!r}: {e}")
+        return batch
@@ -0,0 +1,137 @@
+"""
+Vectorized Market Simulator
+Generates synthetic quotes for every symbol in one NumPy step for load testing
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from live_data import LiveDataManager, Tick
+
+# Per-instrument simulation parameters:
+#   price       starting price
+#   volatility  standard deviation of log returns per second
+#   tick_size   minimum price increment
+#   spread      bid/ask spread in ticks
+INSTRUMENT_PARAMS: Dict[str, Dict[str, float]] = {
+    # Index futures
+    'ES': {'price': 4485.25, 'volatility': 0.00020, 'tick_size': 0.25, 'spread': 1},
+    'NQ': {'price': 15847.50, 'volatility': 0.00025, 'tick_size': 0.25, 'spread': 1},
+    'YM': {'price': 34567.00, 'volatility': 0.00018, 'tick_size': 1.0, 'spread': 1},
+    'RTY': {'price': 2089.40, 'volatility': 0.00028, 'tick_size': 0.10, 'spread': 1},
+    # Commodities
+    'CL': {'price': 82.45, 'volatility': 0.00040, 'tick_size': 0.01, 'spread': 1},
+    'NG': {'price': 2.850, 'volatility': 0.00060, 'tick_size': 0.001, 'spread': 1},
+    'GC': {'price': 2045.20, 'volatility': 0.00020, 'tick_size': 0.10, 'spread': 1},
+    'SI': {'price': 23.500, 'volatility': 0.00035, 'tick_size': 0.005, 'spread': 1},
+    # Treasury futures
+    'ZN': {'price': 110.50, 'volatility': 0.00006, 'tick_size': 1 / 64, 'spread': 1},
+    'ZB': {'price': 118.00, 'volatility': 0.00010, 'tick_size': 1 / 32, 'spread': 1},
+    'ZF': {'price': 106.25, 'volatility': 0.00004, 'tick_size': 1 / 128, 'spread': 1},
+    'ZT': {'price': 101.75, 'volatility': 0.00002, 'tick_size': 1 / 256, 'spread': 1},
+    # FX futures
+    '6E': {'price': 1.0850, 'volatility': 0.00005, 'tick_size': 0.00005, 'spread': 1},
+    '6J': {'price': 0.006750, 'volatility': 0.00006, 'tick_size': 0.0000005, 'spread': 1},
+    '6B': {'price': 1.2650, 'volatility': 0.00006, 'tick_size': 0.0001, 'spread': 1},
+    '6A': {'price': 0.6550, 'volatility': 0.00007, 'tick_size': 0.00005, 'spread': 1},
+}
+
+DEFAULT_PARAMS = {'price': 100.0, 'volatility': 0.00020, 'tick_size': 0.01, 'spread': 1}
+
+
+class VectorizedMarketSimulator:
+    """Geometric random walk over all symbols at once.
+
+    Each step advances every symbol by one tick, so a configured ``tick_rate``
+    (ticks per second across all symbols) runs ``tick_rate / len(symbols)``
+    steps per second. Runs with the same seed produce the same prices and
+    volumes step for step, however the steps are split into batches: shocks
+    and volumes come from separate generators and log prices accumulate
+    sequentially across calls.
+    """
+
+    def __init__(self, symbols: List[str], tick_rate: float = 120.0, seed: Optional[int] = None,
+                 params: Optional[Dict[str, Dict[str, float]]] = None):
+        if tick_rate <= 0:
+            raise ValueError("tick_rate must be positive")
+        self.symbols = list(symbols)
+        self.tick_rate = tick_rate
+        shock_seed, volume_seed = np.random.SeedSequence(seed).spawn(2)
+        self.shock_rng = np.random.default_rng(shock_seed)
+        self.volume_rng = np.random.default_rng(volume_seed)
+        self.logger = logging.getLogger(__name__)
+
+        params = {**INSTRUMENT_PARAMS, **(params or {})}
+        missing = [s for s in self.symbols if s not in params]
+        if missing:
+            self.logger.warning(f"No simulation parameters for {missing}, using defaults")
+        rows = [params.get(s, DEFAULT_PARAMS) for s in self.symbols]
+
+        self.prices = np.array([r['price'] for r in rows], dtype=np.float64)
+        self.open_prices = self.prices.copy()
+        self._log_prices = np.log(self.prices)
+        self.volatility = np.array([r['volatility'] for r in rows], dtype=np.float64)
+        self.tick_size = np.array([r['tick_size'] for r in rows], dtype=np.float64)
+        self.spread = np.array([r['spread'] for r in rows], dtype=np.float64) * self.tick_size
+
+        # Market time covered by one step of every symbol
+        self.step_seconds = len(self.symbols) / tick_rate
+        self._step_sigma = self.volatility * np.sqrt(self.step_seconds)
+
+    def step(self, n_steps: int = 1) -> np.ndarray:
+        """Advance all symbols ``n_steps`` times, returning mid prices of shape (n_steps, symbols)"""
+        shocks = self.shock_rng.standard_normal((n_steps, len(self.symbols))) * self._step_sigma
+        # Accumulate from the carried log price so batch boundaries do not change the sums
+        log_prices = np.cumsum(np.vstack([self._log_prices, shocks]), axis=0)[1:]
+        self._log_prices = log_prices[-1].copy()
+        mids = np.exp(log_prices)
+        self.prices = mids[-1].copy()
+        return mids
+
+    def generate(self, n_steps: int, start: float, end: float) -> List[Tick]:
+        """Generate ``n_steps`` steps of quotes timestamped evenly between start and end (epoch seconds)"""
+        mids = self.step(n_steps)
+        bids = np.floor(mids / self.tick_size) * self.tick_size
+        asks = bids + self.spread
+        prices = np.round(mids / self.tick_size) * self.tick_size
+        volumes = self.volume_rng.integers(1, 50, size=mids.shape)
+        changes = prices - self.open_prices
+        change_percents = changes / self.open_prices * 100
+        times = np.linspace(start, end, n_steps, endpoint=False) if n_steps > 1 else np.array([end])
+        timestamps = (times * 1_000_000_000).astype(np.int64).tolist()
+
+        batch = []
+        for row, timestamp_ns in enumerate(timestamps):
+            batch.extend(
+                Tick(symbol, price, bid, ask, volume, timestamp_ns, change, change_pct)
+                for symbol, price, bid, ask, volume, change, change_pct in zip(
+                    self.symbols, prices[row].tolist(), bids[row].tolist(), asks[row].tolist(),
+                    volumes[row].tolist(), changes[row].tolist(), change_percents[row].tolist()
+                )
+            )
+        return batch
+
+    def run(self, data_manager: LiveDataManager, publish_interval: float = 0.05):
+        """Publish generated quotes into the data manager until it disconnects"""
+        steps_per_second = self.tick_rate / len(self.symbols)
+        pending_steps = 0.0
+        last = batch_start = time.time()
+
+        while data_manager.is_connected:
+            try:
+                time.sleep(publish_interval)
+                now = time.time()
+                pending_steps += (now - last) * steps_per_second
+                last = now
+                n_steps = int(pending_steps)
+                if n_steps:
+                    pending_steps -= n_steps
+                    data_manager.update_market_data_batch(self.generate(n_steps, batch_start, now))
+                    batch_start = now
+
+            except Exception as e:
+                self.logger.error(f"Market data simulation error: {e}")
+                time.sleep(1)
@@ -0,0 +1,221 @@
+"""
+Order Book
+Per-symbol level-2 price ladders with cheap top-of-book, depth and impact queries
+"""
+
+import random
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# (side, price, size); size 0 removes the level
+BookUpdate = Tuple[str, float, float]
+Level = Tuple[float, float]
+
+BID = 'bid'
+ASK = 'ask'
+
+
+class _BookSide:
+    """One side of the book: sorted level keys plus a size per key.
+
+    Keys are kept ascending with the best level last (bids by price, asks by
+    negated price), so the frequent updates near the top of the book insert
+    and delete close to the end of the list and move little memory.
+    """
+
+    __slots__ = ('sign', 'keys', 'sizes')
+
+    def __init__(self, sign: int):
+        self.sign = sign
+        self.keys: List[float] = []
+        self.sizes: Dict[float, float] = {}
+
+    def set(self, price: float, size: float):
+        key = self.sign * price
+        keys = self.keys
+        if size > 0:
+            if key not in self.sizes:
+                if not keys or key > keys[-1]:
+                    keys.append(key)
+                else:
+                    keys.insert(bisect_left(keys, key), key)
+            self.sizes[key] = size
+        elif self.sizes.pop(key, None) is not None:
+            if keys[-1] == key:
+                keys.pop()
+            else:
+                del keys[bisect_left(keys, key)]
+
+    def clear(self):
+        self.keys = []
+        self.sizes = {}
+
+    def best(self) -> Optional[Level]:
+        if not self.keys:
+            return None
+        key = self.keys[-1]
+        return self.sign * key, self.sizes[key]
+
+    def levels(self, n: Optional[int] = None) -> List[Level]:
+        """Levels best first"""
+        keys = self.keys if n is None else self.keys[-n:]
+        sizes, sign = self.sizes, self.sign
+        return [(sign * key, sizes[key]) for key in reversed(keys)]
+
+
+class OrderBook:
+    """Level-2 book for one symbol.
+
+    Updates are O(log n) to find a level (bisect) and usually O(1) to move,
+    since activity clusters at the top of the book. Best bid/ask is O(1),
+    top-N and cumulative depth are O(N). Prices are rounded to 8 decimals so
+    float noise cannot split a level. Thread-safe.
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = _BookSide(1)
+        self.asks = _BookSide(-1)
+        self.sequence = 0
+        self.timestamp_ns = 0
+        self._lock = threading.Lock()
+
+    def _side(self, side: str) -> _BookSide:
+        if side == BID:
+            return self.bids
+        if side == ASK:
+            return self.asks
+        raise ValueError(f"Unknown book side: {side}")
+
+    def apply(self, updates: Iterable[BookUpdate], timestamp_ns: int = 0):
+        """Apply incremental level updates (size 0 deletes a level)"""
+        with self._lock:
+            for side, price, size in updates:
+                self._side(side).set(round(price, 8), size)
+            self.sequence += 1
+            self.timestamp_ns = timestamp_ns or time.time_ns()
+
+    def replace(self, bids: Iterable[Level], asks: Iterable[Level], timestamp_ns: int = 0):
+        """Replace the whole book from a depth snapshot"""
+        with self._lock:
+            self.bids.clear()
+            self.asks.clear()
+            for price, size in bids:
+                self.bids.set(round(price, 8), size)
+            for price, size in asks:
+                self.asks.set(round(price, 8), size)
+            self.sequence += 1
+            self.timestamp_ns = timestamp_ns or time.time_ns()
+
+    def best_bid(self) -> Optional[Level]:
+        with self._lock:
+            return self.bids.best()
+
+    def best_ask(self) -> Optional[Level]:
+        with self._lock:
+            return self.asks.best()
+
+    def top(self, n: int = 5) -> Tuple[List[Level], List[Level]]:
+        """Best ``n`` bid and ask levels, best first"""
+        with self._lock:
+            return self.bids.levels(n), self.asks.levels(n)
+
+    def spread(self) -> Optional[float]:
+        with self._lock:
+            bid, ask = self.bids.best(), self.asks.best()
+        return ask[0] - bid[0] if bid and ask else None
+
+    def mid(self) -> Optional[float]:
+        with self._lock:
+            bid, ask = self.bids.best(), self.asks.best()
+        return (bid[0] + ask[0]) / 2 if bid and ask else None
+
+    def microprice(self) -> Optional[float]:
+        """Size-weighted mid: leans toward the side with less resting size"""
+        with self._lock:
+            bid, ask = self.bids.best(), self.asks.best()
+        if not bid or not ask:
+            return None
+        (bid_price, bid_size), (ask_price, ask_size) = bid, ask
+        return (bid_price * ask_size + ask_price * bid_size) / (bid_size + ask_size)
+
+    def cumulative_depth(self, side: str, n: int = 10) -> List[Level]:
+        """(price, cumulative size) for the best ``n`` levels of a side"""
+        with self._lock:
+            levels = self._side(side).levels(n)
+        depth, total = [], 0.0
+        for price, size in levels:
+            total += size
+            depth.append((price, total))
+        return depth
+
+    def sweep_price(self, side: str, quantity: float) -> Optional[float]:
+        """Average price to take ``quantity`` from a side (None if too thin).
+
+        A buy sweeps the asks and a sell sweeps the bids; the difference to
+        the mid is the expected impact of a marketable order. Raises
+        ValueError unless quantity is positive.
+        """
+        if not quantity > 0:
+            raise ValueError(f"Sweep quantity must be positive: {quantity}")
+        book_side = self._side(side)
+        with self._lock:
+            sizes, sign = book_side.sizes, book_side.sign
+            remaining, cost = quantity, 0.0
+            for key in reversed(book_side.keys):
+                take = min(remaining, sizes[key])
+                cost += take * sign * key
+                remaining -= take
+                if remaining <= 0:
+                    return cost / quantity
+        return None
+
+
+def _simulated_updates(n: int, mid: float, tick_size: float, levels: int,
+                       rng: random.Random) -> List[Tuple[BookUpdate, ...]]:
+    """Depth updates clustered near the top of book, with occasional price moves"""
+    batches = []
+    for _ in range(n):
+        if rng.random() < 0.02:
+            mid += tick_size * rng.choice((-1, 1))
+        side = BID if rng.random() < 0.5 else ASK
+        depth = min(int(rng.expovariate(0.4)), levels - 1)
+        price = mid - tick_size * (depth + 0.5) if side == BID else mid + tick_size * (depth + 0.5)
+        size = 0 if rng.random() < 0.15 else rng.randint(1, 400)
+        batches.append(((side, price, size),))
+    return batches
+
+
+def benchmark(n_updates: int = 500_000, levels: int = 20) -> Dict[str, Dict[str, float]]:
+    """Update and query throughput for ES- and NQ-like books"""
+    rng = random.Random(11)
+    results = {}
+    for symbol, mid, tick_size in (('ES', 4500.125, 0.25), ('NQ', 15500.125, 0.25)):
+        updates = _simulated_updates(n_updates, mid, tick_size, levels, rng)
+        book = OrderBook(symbol)
+        start = time.perf_counter()
+        for update in updates:
+            book.apply(update, 1)
+        update_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(100_000):
+            book.top(5)
+            book.microprice()
+        query_seconds = time.perf_counter() - start
+
+        results[symbol] = {
+            'updates_per_sec': n_updates / update_seconds,
+            'update_us': update_seconds / n_updates * 1e6,
+            'top5_plus_microprice_us': query_seconds / 100_000 * 1e6,
+            'levels': len(book.bids.keys) + len(book.asks.keys),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    for symbol, stats in benchmark().items():
+        print(f"{symbol}: {stats['updates_per_sec']:,.0f} updates/s ({stats['update_us']:.2f} us), "
+              f"top(5)+microprice {stats['top5_plus_microprice_us']:.2f} us, {stats['levels']} levels")
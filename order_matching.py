@@ -0,0 +1,255 @@
+"""
+Order Matching
+Resting limit orders and stop triggers per symbol, driven by incoming ticks
+"""
+
+import heapq
+import itertools
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+# (order_id, quantity, price)
+Fill = Tuple[str, float, float]
+
+
+class TickRange:
+    """Ticks for one symbol folded into the extremes that can cross a working order.
+
+    Trade prices keep their high and low, quotes their highest bid and
+    lowest ask, volumes their sum; ``bid`` and ``ask`` are the latest quote.
+    Matching a range finds every order any of its ticks would have crossed.
+    """
+
+    __slots__ = ('symbol', 'high', 'low', 'bid_high', 'ask_low', 'bid', 'ask', 'volume', 'ticks')
+
+    def __init__(self, symbol: str, price: float, bid: float, ask: float, volume: float):
+        self.symbol = symbol
+        self.high = self.low = price
+        self.bid_high = self.bid = bid
+        self.ask_low = self.ask = ask
+        self.volume = volume
+        self.ticks = 1
+
+    def merge(self, price: float, bid: float, ask: float, volume: float):
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        if bid > self.bid_high:
+            self.bid_high = bid
+        if ask < self.ask_low:
+            self.ask_low = ask
+        self.bid, self.ask = bid, ask
+        self.volume += volume
+        self.ticks += 1
+
+
+class _RestingOrder:
+    """Heap entry; ``key`` orders the heap (negated price for bids)"""
+
+    __slots__ = ('key', 'seq', 'order_id', 'limit', 'remaining')
+
+    def __init__(self, key: float, seq: int, order_id: str, limit: float, remaining: float):
+        self.key = key
+        self.seq = seq
+        self.order_id = order_id
+        self.limit = limit
+        self.remaining = remaining
+
+    def __lt__(self, other: '_RestingOrder') -> bool:
+        return (self.key, self.seq) < (other.key, other.seq)
+
+
+class _RestingSide:
+    """One side's heap with lazy cancellation"""
+
+    __slots__ = ('sign', 'heap', 'dead')
+
+    def __init__(self, sign: int):
+        self.sign = sign  # -1 for bids (highest first), 1 for asks (lowest first)
+        self.heap: List[_RestingOrder] = []
+        self.dead = 0
+
+    def top(self) -> Optional[_RestingOrder]:
+        heap = self.heap
+        while heap and heap[0].remaining <= 0:
+            heapq.heappop(heap)
+            self.dead -= 1
+        return heap[0] if heap else None
+
+    def compact(self):
+        """Drop cancelled entries once they outnumber live ones"""
+        if self.dead > 64 and self.dead > len(self.heap) - self.dead:
+            self.heap = [entry for entry in self.heap if entry.remaining > 0]
+            heapq.heapify(self.heap)
+            self.dead = 0
+
+
+class LimitOrderMatcher:
+    """Working limit orders for every symbol, matched on each tick.
+
+    Each symbol has a bid heap (highest price, then oldest first) and an ask
+    heap (lowest price, then oldest first). A tick only looks at the top of
+    each heap, so ticks that cross nothing cost O(1) and every fill costs
+    O(log n). A buy fills when the ask, or a traded price, reaches its limit,
+    at the better of its limit and the ask; sells mirror this. Fill size per
+    tick is bounded by the tick's volume; quote-only ticks (volume 0) fill
+    the crossed orders in full. Cancels are lazy: the entry is zeroed and
+    skipped when it surfaces.
+    """
+
+    def __init__(self):
+        self._books: Dict[str, Tuple[_RestingSide, _RestingSide]] = {}
+        self._entries: Dict[str, Tuple[str, _RestingSide, _RestingOrder]] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._entries
+
+    def _sides(self, symbol: str) -> Tuple[_RestingSide, _RestingSide]:
+        sides = self._books.get(symbol)
+        if sides is None:
+            sides = self._books[symbol] = (_RestingSide(-1), _RestingSide(1))
+        return sides
+
+    def add(self, order_id: str, symbol: str, is_buy: bool, limit: float, quantity: float):
+        """Rest an order behind earlier orders at the same price"""
+        with self._lock:
+            side = self._sides(symbol)[0 if is_buy else 1]
+            entry = _RestingOrder(side.sign * limit, next(self._seq), order_id, limit, quantity)
+            heapq.heappush(side.heap, entry)
+            self._entries[order_id] = (symbol, side, entry)
+
+    def cancel(self, order_id: str) -> float:
+        """Cancel a working order, returning its unfilled quantity (0 if not working)"""
+        with self._lock:
+            found = self._entries.pop(order_id, None)
+            if found is None:
+                return 0.0
+            _, side, entry = found
+            remaining, entry.remaining = entry.remaining, 0.0
+            side.dead += 1
+            side.compact()
+            return remaining
+
+    def remaining(self, order_id: str) -> float:
+        found = self._entries.get(order_id)
+        return found[2].remaining if found else 0.0
+
+    def match(self, symbol: str, bid: float, ask: float, last: float, volume: float) -> List[Fill]:
+        """Fill the working orders this tick crosses, best price then oldest first"""
+        return self.match_range(TickRange(symbol, last, bid, ask, volume))
+
+    def match_range(self, ticks: TickRange) -> List[Fill]:
+        """Fill the working orders any tick of a range crosses, at the limit or the latest quote"""
+        sides = self._books.get(ticks.symbol)
+        if sides is None:
+            return []
+        fills: List[Fill] = []
+        with self._lock:
+            bids, asks = sides
+            if ticks.volume > 0:
+                # A trade printing through a limit fills it too, up to the traded size
+                self._match_side(bids, min(ticks.ask_low, ticks.low), ticks.ask, ticks.volume, fills)
+                self._match_side(asks, max(ticks.bid_high, ticks.high), ticks.bid, ticks.volume, fills)
+            else:
+                self._match_side(bids, ticks.ask_low, ticks.ask, float('inf'), fills)
+                self._match_side(asks, ticks.bid_high, ticks.bid, float('inf'), fills)
+        return fills
+
+    def _match_side(self, side: _RestingSide, reach: float, quote: float, liquidity: float,
+                    fills: List[Fill]):
+        """Fill entries whose limit reaches ``reach``, at the limit or the better ``quote``"""
+        bound = side.sign * reach
+        while liquidity > 0:
+            entry = side.top()
+            if entry is None or entry.key > bound:
+                break
+            quantity = min(entry.remaining, liquidity)
+            entry.remaining -= quantity
+            liquidity -= quantity
+            price = min(entry.limit, quote) if side.sign < 0 else max(entry.limit, quote)
+            fills.append((entry.order_id, quantity, price))
+            if entry.remaining <= 0:
+                heapq.heappop(side.heap)
+                del self._entries[entry.order_id]
+
+    def working_orders(self, symbol: Optional[str] = None) -> List[str]:
+        """Ids of working orders (for one symbol or all)"""
+        return [order_id for order_id, (order_symbol, _, _) in list(self._entries.items())
+                if symbol is None or order_symbol == symbol]
+
+
+class StopTriggerIndex:
+    """Working STOP and STOP_LIMIT orders per symbol, activated by traded price.
+
+    Each side is a sorted list of (key, seq, order_id) arranged so the stops
+    a move triggers always form a suffix: sell stops by stop price (a fall
+    to ``p`` triggers every stop >= p) and buy stops by negated stop price
+    (a rise to ``p`` triggers every stop <= p). A tick is one bisect per
+    side plus the triggered slice, whatever the number of working stops.
+    """
+
+    def __init__(self):
+        self._books: Dict[str, Tuple[list, list]] = {}
+        self._entries: Dict[str, Tuple[list, Tuple[float, int, str]]] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._entries
+
+    def add(self, order_id: str, symbol: str, is_buy: bool, stop_price: float):
+        with self._lock:
+            sides = self._books.get(symbol)
+            if sides is None:
+                sides = self._books[symbol] = ([], [])
+            stops = sides[0 if is_buy else 1]
+            entry = (-stop_price if is_buy else stop_price, next(self._seq), order_id)
+            insort(stops, entry)
+            self._entries[order_id] = (stops, entry)
+
+    def cancel(self, order_id: str) -> bool:
+        """Remove a working stop (False if it is not working)"""
+        with self._lock:
+            found = self._entries.pop(order_id, None)
+            if found is None:
+                return False
+            stops, entry = found
+            del stops[bisect_left(stops, entry)]
+            return True
+
+    def trigger(self, symbol: str, price: float) -> List[str]:
+        """Remove and return the ids of stops a trade at ``price`` activates, in the order the move crossed them"""
+        sides = self._books.get(symbol)
+        if sides is None:
+            return []
+        buys, sells = sides
+        triggered: List[str] = []
+        with self._lock:
+            for stops, bound in ((buys, -price), (sells, price)):
+                index = bisect_left(stops, (bound,))
+                if index < len(stops):
+                    hit = stops[index:]
+                    del stops[index:]
+                    # The move crosses the largest key first; ties go to the oldest stop
+                    hit.sort(key=lambda entry: (-entry[0], entry[1]))
+                    for _, _, order_id in hit:
+                        del self._entries[order_id]
+                        triggered.append(order_id)
+        return triggered
+
+    def working_orders(self, symbol: Optional[str] = None) -> List[str]:
+        """Ids of working stops (for one symbol or all)"""
+        if symbol is None:
+            return list(self._entries)
+        sides = self._books.get(symbol, ([], []))
+        return [entry[2] for stops in sides for entry in list(stops)]
@@ -0,0 +1,251 @@
+"""
+Position Book
+Positions stored in a NumPy structured array and marked to market in one step
+"""
+
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tick_history import to_epoch_ns
+
+POSITION_DTYPE = np.dtype([
+    ('symbol_id', 'i4'),
+    ('quantity', 'f8'),
+    ('entry_price', 'f8'),
+    ('current_price', 'f8'),
+    ('unrealized_pnl', 'f8'),
+    ('entry_time', 'i8'),  # epoch nanoseconds
+])
+
+
+class PositionBook:
+    """Columnar position store with a position_id -> row index.
+
+    Rows ``[0, len(book))`` are live; removal swaps the last row into the
+    freed slot so the live rows stay contiguous. Marks are kept per symbol
+    and applied to every row with one vectorized gather.
+
+    Exposure is kept per symbol (absolute quantity, net quantity and cost
+    basis) and updated as positions come and go, so gross/net exposure and
+    unrealized P&L are O(1) reads whose upkeep depends on the number of
+    symbols, never on the number of positions.
+
+    Not thread-safe: callers serialize access.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self._rows = np.zeros(capacity, dtype=POSITION_DTYPE)
+        self._size = 0
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._symbol_ids: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._marks = np.full(16, np.nan)
+        self._abs_qty = np.zeros(16)
+        self._net_qty = np.zeros(16)
+        self._cost = np.zeros(16)  # sum of entry_price * quantity
+        self.gross_exposure = 0.0
+        self.net_exposure = 0.0
+        self.unrealized_pnl = 0.0
+        self.realized_pnl = 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, position_id: str) -> bool:
+        return position_id in self._index
+
+    def _symbol_id(self, symbol: str) -> int:
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self._symbols)
+            self._symbol_ids[symbol] = symbol_id
+            self._symbols.append(symbol)
+            if symbol_id >= len(self._marks):
+                grow = len(self._marks)
+                self._marks = np.concatenate([self._marks, np.full(grow, np.nan)])
+                self._abs_qty = np.concatenate([self._abs_qty, np.zeros(grow)])
+                self._net_qty = np.concatenate([self._net_qty, np.zeros(grow)])
+                self._cost = np.concatenate([self._cost, np.zeros(grow)])
+        return symbol_id
+
+    def _refresh_totals(self):
+        """Recompute portfolio totals from the per-symbol accumulators"""
+        n = len(self._symbols)
+        marks = self._marks[:n]  # every registered symbol has a mark
+        self.gross_exposure = float(np.dot(self._abs_qty[:n], marks))
+        self.net_exposure = float(np.dot(self._net_qty[:n], marks))
+        self.unrealized_pnl = self.net_exposure - float(self._cost[:n].sum())
+
+    def _apply_exposure(self, symbol_id: int, quantity: float, entry_price: float, sign: int):
+        """Fold a position into (sign 1) or out of (sign -1) its symbol's accumulators"""
+        self._abs_qty[symbol_id] += sign * abs(quantity)
+        self._net_qty[symbol_id] += sign * quantity
+        self._cost[symbol_id] += sign * entry_price * quantity
+        self._refresh_totals()
+
+    def add(self, position_id: str, symbol: str, quantity: float, entry_price: float,
+            current_price: float, entry_time: datetime):
+        """Add a position, marking it at the latest known price for its symbol"""
+        if position_id in self._index:
+            raise ValueError(f"Duplicate position id: {position_id}")
+        if self._size == len(self._rows):
+            grown = np.zeros(2 * len(self._rows), dtype=POSITION_DTYPE)
+            grown[:self._size] = self._rows[:self._size]
+            self._rows = grown
+
+        symbol_id = self._symbol_id(symbol)
+        mark = self._marks[symbol_id]
+        if not np.isnan(mark):
+            current_price = mark
+        else:
+            # Until the symbol ticks, its positions are valued at this price
+            self._marks[symbol_id] = current_price
+        row = self._size
+        self._rows[row] = (symbol_id, quantity, entry_price, current_price,
+                           (current_price - entry_price) * quantity, to_epoch_ns(entry_time))
+        self._ids.append(position_id)
+        self._index[position_id] = row
+        self._size += 1
+        self._apply_exposure(symbol_id, quantity, entry_price, 1)
+
+    def add_batch(self, position_ids: Sequence[str], symbols: Sequence[str],
+                  quantities: Sequence[float], entry_prices: Sequence[float],
+                  entry_times: Sequence[datetime]):
+        """Add many positions with column writes and one totals refresh (marks as in add)"""
+        n = len(position_ids)
+        if not n:
+            return
+        index = self._index
+        if len(set(position_ids)) != n or any(position_id in index for position_id in position_ids):
+            raise ValueError("Duplicate position id in batch")
+        if self._size + n > len(self._rows):
+            grown = np.zeros(max(2 * len(self._rows), self._size + n), dtype=POSITION_DTYPE)
+            grown[:self._size] = self._rows[:self._size]
+            self._rows = grown
+
+        symbol_ids = np.fromiter((self._symbol_id(symbol) for symbol in symbols), dtype=np.int32, count=n)
+        quantities = np.asarray(quantities, dtype=np.float64)
+        entry_prices = np.asarray(entry_prices, dtype=np.float64)
+        # Symbols that have not ticked yet are valued at their (first) entry price
+        unmarked = np.isnan(self._marks[symbol_ids])
+        if unmarked.any():
+            first_ids, first = np.unique(symbol_ids[unmarked], return_index=True)
+            self._marks[first_ids] = entry_prices[unmarked][first]
+        marks = self._marks[symbol_ids]
+
+        start = self._size
+        block = self._rows[start:start + n]
+        block['symbol_id'] = symbol_ids
+        block['quantity'] = quantities
+        block['entry_price'] = entry_prices
+        block['current_price'] = marks
+        block['unrealized_pnl'] = (marks - entry_prices) * quantities
+        # Fills of one batch share a timestamp, so convert each distinct time once
+        epoch_ns = {entry_time: to_epoch_ns(entry_time) for entry_time in set(entry_times)}
+        block['entry_time'] = [epoch_ns[entry_time] for entry_time in entry_times]
+        index.update(zip(position_ids, range(start, start + n)))
+        self._ids.extend(position_ids)
+        self._size += n
+
+        np.add.at(self._abs_qty, symbol_ids, np.abs(quantities))
+        np.add.at(self._net_qty, symbol_ids, quantities)
+        np.add.at(self._cost, symbol_ids, entry_prices * quantities)
+        self._refresh_totals()
+
+    def remove(self, position_id: str, exit_price: Optional[float] = None) -> Optional[np.void]:
+        """Remove a position, returning a copy of its row (None if unknown).
+
+        P&L between entry and ``exit_price`` (default: the current mark) is
+        added to ``realized_pnl``.
+        """
+        row = self._index.pop(position_id, None)
+        if row is None:
+            return None
+        removed = self._rows[row].copy()
+        if exit_price is None:
+            exit_price = removed['current_price']
+        self.realized_pnl += float((exit_price - removed['entry_price']) * removed['quantity'])
+        last = self._size - 1
+        if row != last:
+            self._rows[row] = self._rows[last]
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._index[moved_id] = row
+        self._ids.pop()
+        self._size -= 1
+        self._apply_exposure(removed['symbol_id'], removed['quantity'], removed['entry_price'], -1)
+        return removed
+
+    def reduce(self, position_id: str, quantity: float,
+               exit_price: Optional[float] = None) -> Optional[float]:
+        """Close ``quantity`` (unsigned) of a position, removing it once nothing is left.
+
+        P&L on the closed part is realized at ``exit_price`` (default: the
+        current mark). Returns the quantity actually closed, which is capped
+        at the position's size (None if the position is unknown).
+        """
+        row = self._index.get(position_id)
+        if row is None:
+            return None
+        record = self._rows[row]
+        size = abs(float(record['quantity']))
+        if quantity >= size - 1e-9:
+            self.remove(position_id, exit_price)
+            return size
+        if exit_price is None:
+            exit_price = record['current_price']
+        closed = np.copysign(quantity, record['quantity'])
+        self.realized_pnl += float((exit_price - record['entry_price']) * closed)
+        record['quantity'] -= closed
+        record['unrealized_pnl'] = (record['current_price'] - record['entry_price']) * record['quantity']
+        self._apply_exposure(record['symbol_id'], closed, record['entry_price'], -1)
+        return float(quantity)
+
+    def mark_to_market(self, prices: Mapping[str, float]):
+        """Update symbol marks and revalue every position in one vectorized pass"""
+        for symbol, price in prices.items():
+            self._marks[self._symbol_id(symbol)] = price
+        if not self._size:
+            return
+        self._refresh_totals()
+
+        rows = self._rows[:self._size]
+        marks = self._marks[rows['symbol_id']]
+        marked = ~np.isnan(marks)
+        rows['current_price'] = np.where(marked, marks, rows['current_price'])
+        rows['unrealized_pnl'] = (rows['current_price'] - rows['entry_price']) * rows['quantity']
+
+    def view(self) -> np.ndarray:
+        """Zero-copy view of the live rows (valid until the book next changes)"""
+        return self._rows[:self._size]
+
+    def symbol_of(self, row: np.void) -> str:
+        """Symbol for a row returned by view() or remove()"""
+        return self._symbols[row['symbol_id']]
+
+    def symbol_exposure(self, symbol: str) -> Tuple[float, float, float]:
+        """(net quantity, gross exposure, net exposure) for one symbol"""
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            return 0.0, 0.0, 0.0
+        mark = self._marks[symbol_id]
+        if np.isnan(mark):
+            return 0.0, 0.0, 0.0
+        net_qty = float(self._net_qty[symbol_id])
+        return net_qty, float(self._abs_qty[symbol_id] * mark), net_qty * float(mark)
+
+    def symbols(self) -> List[str]:
+        """Symbol names indexed by symbol_id"""
+        return list(self._symbols)
+
+    def position_ids(self) -> List[str]:
+        """Position ids in row order, aligned with view()"""
+        return list(self._ids)
+
+    def row(self, position_id: str) -> Optional[np.void]:
+        """Copy of the row for a position (None if unknown)"""
+        row = self._index.get(position_id)
+        return None if row is None else self._rows[row].copy()
@@ -0,0 +1,267 @@
+"""
+Risk Rules
+Pre-trade risk checks compiled from config into an ordered, individually timed rule chain
+"""
+
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from latency_stats import LatencyHistogram
+from symbol_stats import NS_PER_DAY
+
+
+class RiskContext:
+    """One order under check; book-wide state is read at most once per check"""
+
+    __slots__ = ('order', 'price', 'data_manager', '_exposure')
+
+    def __init__(self, order, price: float, data_manager, exposure: Optional[Dict[str, float]] = None):
+        self.order = order
+        self.price = price
+        self.data_manager = data_manager
+        self._exposure = exposure
+
+    @property
+    def exposure(self) -> Dict[str, float]:
+        if self._exposure is None:
+            self._exposure = self.data_manager.get_exposure()
+        return self._exposure
+
+    @property
+    def order_value(self) -> float:
+        return abs(self.order.quantity * self.price)
+
+
+class RiskRule(ABC):
+    """A single pre-trade check.
+
+    ``check`` returns None to pass or a short rejection reason. ``cost``
+    orders the chain (cheapest first) and ``applies_to_closing`` keeps the
+    rule in force for orders that flatten an existing position. Rules that
+    keep session state override ``on_tick``.
+    """
+
+    name = "rule"
+    cost = 0
+    applies_to_closing = False
+
+    def __init__(self):
+        self.checks = 0
+        self.rejects = 0
+        self.latency = LatencyHistogram()
+
+    @abstractmethod
+    def check(self, ctx: RiskContext) -> Optional[str]:
+        """None to pass, else the rejection reason"""
+
+    def on_tick(self, data_manager):
+        """Called on the order sequencer as ticks arrive; no-op by default"""
+
+    def stats(self) -> Dict[str, float]:
+        return {'checks': self.checks, 'rejects': self.rejects, **self.latency.summary()}
+
+
+class SymbolAllowlistRule(RiskRule):
+    name = "symbol_allowlist"
+    cost = 0
+
+    def __init__(self, symbols: Iterable[str]):
+        super().__init__()
+        self.symbols = frozenset(symbols)
+
+    def check(self, ctx: RiskContext) -> Optional[str]:
+        if ctx.order.symbol not in self.symbols:
+            return f"{ctx.order.symbol} not in allowed symbols"
+        return None
+
+
+class StaleQuoteRule(RiskRule):
+    """Never open a position against a dead feed (closing one stays allowed)"""
+
+    name = "stale_quote"
+    cost = 1
+
+    def check(self, ctx: RiskContext) -> Optional[str]:
+        if ctx.data_manager.is_stale(ctx.order.symbol):
+            return f"quotes for {ctx.order.symbol} are stale"
+        return None
+
+
+class MaxPositionsRule(RiskRule):
+    name = "max_positions"
+    cost = 2
+
+    def __init__(self, max_positions: int):
+        super().__init__()
+        self.max_positions = max_positions
+
+    def check(self, ctx: RiskContext) -> Optional[str]:
+        if ctx.exposure['positions'] >= self.max_positions:
+            return "maximum concurrent positions reached"
+        return None
+
+
+class RiskPerTradeRule(RiskRule):
+    """Loss to the emergency stop-loss within a fraction of equity.
+
+    Orders carry no protective stop (``stop_price`` is the entry trigger of
+    STOP and STOP_LIMIT orders), so every entry is assumed to exit at the
+    emergency stop-loss below (or above) its entry price: the limit, else
+    the stop trigger, else the current quote.
+    """
+
+    name = "risk_per_trade"
+    cost = 2
+
+    def __init__(self, max_risk: float, emergency_stop_loss: float):
+        super().__init__()
+        self.max_risk = max_risk
+        self.emergency_stop_loss = emergency_stop_loss
+
+    def check(self, ctx: RiskContext) -> Optional[str]:
+        order = ctx.order
+        entry = order.price or order.stop_price or ctx.price
+        risk = abs(entry * order.quantity) * self.emergency_stop_loss
+        if risk > self.max_risk:
+            return f"trade risk ${risk:,.2f} exceeds ${self.max_risk:,.2f} per trade"
+        return None
+
+
+class GrossExposureRule(RiskRule):
+    name = "gross_exposure"
+    cost = 3
+
+    def __init__(self, max_exposure: float):
+        super().__init__()
+        self.max_exposure = max_exposure
+
+    def check(self, ctx: RiskContext) -> Optional[str]:
+        if ctx.exposure['gross_exposure'] + ctx.order_value > self.max_exposure:
+            return "exceeds position size limit"
+        return None
+
+
+class DailyDrawdownRule(RiskRule):
+    """Stop opening positions once the session's P&L falls below the drawdown limit.
+
+    The session baseline is the total (realized plus unrealized) P&L at the
+    first tick after the daily reset hour, on the data manager's clock, so
+    losses taken before the first order of the session still count. If no
+    tick has arrived since the reset, the first check sets it.
+    """
+
+    name = "daily_drawdown"
+    cost = 3
+
+    def __init__(self, max_loss: float, session_reset_hour: int):
+        super().__init__()
+        self.max_loss = max_loss
+        self.session_offset_ns = session_reset_hour * 3600 * 1_000_000_000
+        self._session = None
+        self._baseline = 0.0
+
+    def on_tick(self, data_manager):
+        self._roll(data_manager)
+
+    def _roll(self, data_manager, exposure: Optional[Dict[str, float]] = None):
+        """Take the P&L baseline when the clock has entered a new session"""
+        session = (data_manager.clock.now_ns() - self.session_offset_ns) // NS_PER_DAY
+        if session != self._session:
+            exposure = exposure or data_manager.get_exposure()
+            self._session = session
+            self._baseline = exposure['realized_pnl'] + exposure['unrealized_pnl']
+
+    def check(self, ctx: RiskContext) -> Optional[str]:
+        exposure = ctx.exposure
+        self._roll(ctx.data_manager, exposure)
+        loss = self._baseline - (exposure['realized_pnl'] + exposure['unrealized_pnl'])
+        if loss > self.max_loss:
+            return f"daily drawdown ${loss:,.2f} exceeds ${self.max_loss:,.2f}"
+        return None
+
+
+class RiskPipeline:
+    """Ordered rule chain that stops at the first rejection.
+
+    Rules run cheapest first, so most rejections never reach the rules that
+    read book-wide state. Every rule times itself into a LatencyHistogram
+    and counts its checks and rejections; ``stats`` shows what each costs.
+    """
+
+    def __init__(self, rules: Iterable[RiskRule] = ()):
+        self.rules: List[RiskRule] = []
+        self._closing: List[RiskRule] = []
+        self._on_tick: List[RiskRule] = []
+        for rule in rules:
+            self.add(rule)
+
+    @classmethod
+    def from_config(cls, config) -> 'RiskPipeline':
+        """Compile the chain for a TradingConfig; limits of 0 leave a rule out"""
+        rules: List[RiskRule] = [SymbolAllowlistRule(config.allowed_symbols)]
+        if config.stale_quote_seconds > 0:
+            rules.append(StaleQuoteRule())
+        if config.max_concurrent_positions > 0:
+            rules.append(MaxPositionsRule(config.max_concurrent_positions))
+        if config.risk_per_trade > 0 and config.account_equity > 0:
+            rules.append(RiskPerTradeRule(config.risk_per_trade * config.account_equity,
+                                          config.emergency_stop_loss))
+        if config.max_position_size > 0:
+            rules.append(GrossExposureRule(config.max_position_size))
+        if config.max_daily_drawdown > 0 and config.account_equity > 0:
+            rules.append(DailyDrawdownRule(config.max_daily_drawdown * config.account_equity,
+                                           config.session_reset_hour_utc))
+        return cls(rules)
+
+    def add(self, rule: RiskRule):
+        """Insert a rule after every rule of equal or lower cost"""
+        index = len(self.rules)
+        while index and self.rules[index - 1].cost > rule.cost:
+            index -= 1
+        self.rules.insert(index, rule)
+        self._closing = [rule for rule in self.rules if rule.applies_to_closing]
+        self._on_tick = [rule for rule in self.rules if type(rule).on_tick is not RiskRule.on_tick]
+
+    def on_tick(self, data_manager):
+        """Give rules with session state a look at the market between orders"""
+        for rule in self._on_tick:
+            rule.on_tick(data_manager)
+
+    def check(self, order, price: float, data_manager) -> Optional[str]:
+        """Run the chain for order at price; None if it passes, else the rejection reason"""
+        return self._run(RiskContext(order, price, data_manager))
+
+    def check_batch(self, orders: Sequence[Tuple[object, float]], data_manager) -> List[Optional[str]]:
+        """Check (order, price) pairs against one exposure read.
+
+        Each order that passes is added to the running totals seen by the
+        orders after it, so the batch as a whole stays within the limits.
+        """
+        exposure = dict(data_manager.get_exposure())
+        reasons = []
+        for order, price in orders:
+            ctx = RiskContext(order, price, data_manager, exposure)
+            reason = self._run(ctx)
+            if reason is None and not getattr(order, 'close_position_id', None):
+                exposure['gross_exposure'] += ctx.order_value
+                exposure['positions'] += 1
+            reasons.append(reason)
+        return reasons
+
+    def _run(self, ctx: RiskContext) -> Optional[str]:
+        rules = self._closing if getattr(ctx.order, 'close_position_id', None) else self.rules
+        clock = time.perf_counter_ns
+        for rule in rules:
+            start = clock()
+            reason = rule.check(ctx)
+            rule.latency.record(clock() - start)
+            rule.checks += 1
+            if reason is not None:
+                rule.rejects += 1
+                return reason
+        return None
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Checks, rejects and latency percentiles per rule, in chain order"""
+        return {rule.name: rule.stats() for rule in self.rules}
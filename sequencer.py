@@ -0,0 +1,180 @@
+"""
+Sequencer
+Single-writer command queue: one thread applies every state change in arrival order
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from latency_stats import LatencyHistogram
+
+
+class Sequencer:
+    """Runs submitted commands one at a time on its own thread.
+
+    Producers append to a deque (append and popleft are atomic, so the
+    queue itself takes no lock) and only signal the consumer when it is
+    idle, so a busy sequencer drains back-to-back commands without any
+    handoff. Commands run in submission order, which makes the resulting
+    state deterministic for a given order of calls. Every command records
+    the queue depth it found, its wait before running and its total time
+    to completion.
+
+    ``call`` from the sequencer thread itself runs inline, so commands can
+    use the public API without deadlocking on their own queue.
+
+    With ``max_queue`` set, producers wait while that many commands are
+    queued. Commands the sequencer queues for itself never wait (it would
+    be waiting on its own progress), so they may briefly exceed the bound.
+    """
+
+    def __init__(self, name: str = "sequencer", max_queue: Optional[int] = None):
+        self.name = name
+        self.max_queue = max_queue
+        self.commands = 0
+        self.failures = 0
+        self.throttled = 0  # enqueues that had to wait for space
+        self.queue_depth = LatencyHistogram()  # records depths, not nanoseconds
+        self.wait = LatencyHistogram()
+        self.latency = LatencyHistogram()
+
+        self._queue: deque = deque()
+        self._space = threading.Semaphore(max_queue) if max_queue else None
+        self._wakeup = threading.Event()
+        self._idle = False
+        self._running = True
+        self.logger = logging.getLogger(__name__)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def on_sequencer_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue fn(*args, **kwargs); the returned Future resolves with its result"""
+        future = Future()
+        self._enqueue(fn, args, kwargs, future)
+        return future
+
+    def post(self, fn: Callable, *args, **kwargs):
+        """Queue a command whose result nobody waits for (failures are logged)"""
+        self._enqueue(fn, args, kwargs, None)
+
+    def call(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run fn on the sequencer and wait for its result"""
+        if self.on_sequencer_thread():
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result(timeout)
+
+    def _enqueue(self, fn: Callable, args: tuple, kwargs: dict, future: Optional[Future]):
+        if not self._running:
+            raise RuntimeError(f"Sequencer {self.name} is stopped")
+        space = self._space
+        if space is not None and not self.on_sequencer_thread():
+            if not space.acquire(blocking=False):
+                self.throttled += 1
+                space.acquire()
+        else:
+            space = None
+        queue = self._queue
+        self.queue_depth.record(len(queue))
+        queue.append((fn, args, kwargs, future, time.perf_counter_ns(), space))
+        if self._idle:
+            self._wakeup.set()
+
+    def _run(self):
+        queue, wakeup, clock = self._queue, self._wakeup, time.perf_counter_ns
+        while self._running or queue:
+            if not queue:
+                wakeup.clear()
+                self._idle = True
+                # Re-check after flagging idle: a producer that missed the flag already appended
+                if not queue:
+                    wakeup.wait(0.5)
+                self._idle = False
+                continue
+            fn, args, kwargs, future, enqueued_ns, space = queue.popleft()
+            if space is not None:
+                space.release()
+            start_ns = clock()
+            self.wait.record(start_ns - enqueued_ns)
+            if future is not None and not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                self.failures += 1
+                if future is None:
+                    self.logger.error(f"Sequencer command {getattr(fn, '__name__', fn)} failed: {e}")
+                else:
+                    future.set_exception(e)
+            else:
+                if future is not None:
+                    future.set_result(result)
+            self.commands += 1
+            self.latency.record(clock() - enqueued_ns)
+
+    def stop(self, timeout: float = 2.0):
+        """Stop accepting commands and finish the ones already queued"""
+        self._running = False
+        self._wakeup.set()
+        if not self.on_sequencer_thread():
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Queue depth percentiles plus wait and end-to-end latency summaries"""
+        p50, p99, p999 = self.queue_depth.percentiles()
+        return {
+            'commands': {'count': self.commands, 'failures': self.failures, 'queued': len(self._queue),
+                         'throttled': self.throttled},
+            'queue_depth': {'p50': p50, 'p99': p99, 'p999': p999, 'max': self.queue_depth.max_ns},
+            'wait': self.wait.summary(),
+            'latency': self.latency.summary(),
+        }
+
+
+def benchmark(producers: int = 8, commands: int = 5_000) -> Dict[str, Dict[str, float]]:
+    """Throughput and latency with several threads calling one sequencer like concurrent agents"""
+    sequencer = Sequencer("benchmark-sequencer")
+    state = {'count': 0}
+
+    def increment():
+        state['count'] += 1
+
+    def produce():
+        for _ in range(commands):
+            sequencer.call(increment)
+
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    sequencer.stop()
+    stats = sequencer.stats()
+    stats['throughput'] = {
+        'commands_per_sec': producers * commands / seconds,
+        'lost_updates': producers * commands - state['count'],
+    }
+    return stats
+
+
+if __name__ == "__main__":
+    stats = benchmark()
+    print(f"{stats['throughput']['commands_per_sec']:,.0f} commands/s, "
+          f"{stats['throughput']['lost_updates']} lost updates")
+    depth = stats['queue_depth']
+    print(f"queue depth p50 {depth['p50']:.0f} p99 {depth['p99']:.0f} max {depth['max']}")
+    for key in ('wait', 'latency'):
+        summary = stats[key]
+        print(f"{key}: p50 {summary['p50_us']:,.1f} us, p99 {summary['p99_us']:,.1f} us, "
+              f"max {summary['max_us']:,.1f} us")
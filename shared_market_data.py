@@ -0,0 +1,358 @@
+"""
+Shared Market Data
+Publishes quotes and positions into shared memory for dashboard processes to read
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from live_data import Tick
+from position_book import PositionBook
+from tick_journal import MAX_SYMBOL_BYTES
+
+SHARED_MAGIC = b'SVSHM002'
+SYMBOL_DTYPE = f'S{MAX_SYMBOL_BYTES}'
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('seq', '<u8'),  # seqlock counter: odd while the owner is writing
+    ('owner_pid', '<i8'),
+    ('connected', '<i8'),
+    ('n_symbols', '<i8'),
+    ('n_positions', '<i8'),
+    ('max_symbols', '<i8'),
+    ('max_positions', '<i8'),
+])
+
+QUOTE_DTYPE = np.dtype([
+    ('symbol', SYMBOL_DTYPE),
+    ('updates', '<u8'),  # bumped on every write so readers can spot changed symbols
+    ('price', '<f8'),
+    ('bid', '<f8'),
+    ('ask', '<f8'),
+    ('volume', '<i8'),
+    ('timestamp', '<i8'),  # epoch nanoseconds
+    ('change', '<f8'),
+    ('change_percent', '<f8'),
+])
+
+SHARED_POSITION_DTYPE = np.dtype([
+    ('position_id', 'S36'),
+    ('symbol', SYMBOL_DTYPE),
+    ('quantity', '<f8'),
+    ('entry_price', '<f8'),
+    ('current_price', '<f8'),
+    ('unrealized_pnl', '<f8'),
+    ('entry_time', '<i8'),  # epoch nanoseconds
+])
+
+
+def _layout(buf, max_symbols: int, max_positions: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Header, quote table and position table views over a shared buffer"""
+    header = np.ndarray((1,), dtype=HEADER_DTYPE, buffer=buf)
+    offset = HEADER_DTYPE.itemsize
+    quotes = np.ndarray((max_symbols,), dtype=QUOTE_DTYPE, buffer=buf, offset=offset)
+    offset += QUOTE_DTYPE.itemsize * max_symbols
+    positions = np.ndarray((max_positions,), dtype=SHARED_POSITION_DTYPE, buffer=buf, offset=offset)
+    return header, quotes, positions
+
+
+def _pid_alive(pid: int) -> bool:
+    """Whether a process with this pid exists (signal 0 checks without signalling)"""
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _segment_size(max_symbols: int, max_positions: int) -> int:
+    return (HEADER_DTYPE.itemsize + QUOTE_DTYPE.itemsize * max_symbols
+            + SHARED_POSITION_DTYPE.itemsize * max_positions)
+
+
+class SharedMarketDataWriter:
+    """Single writer of the shared market data segment (the feed owner).
+
+    Each publish is a seqlock write: the sequence counter goes odd, the
+    quote and position tables are updated in place, and the counter goes
+    even again. Readers never block the writer. Publishes from different
+    threads are serialized so the counter is never left odd. Symbols longer
+    than the journal's limit are not shared (logged once per symbol).
+    """
+
+    def __init__(self, name: str, max_symbols: int = 256, max_positions: int = 4096):
+        self.name = name
+        self.max_symbols = max_symbols
+        self.max_positions = max_positions
+        size = _segment_size(max_symbols, max_positions)
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            self._reclaim(name)
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        self._header, self._quotes, self._positions = _layout(self._shm.buf, max_symbols, max_positions)
+        self._header[0] = (SHARED_MAGIC, 0, os.getpid(), 0, 0, 0, max_symbols, max_positions)
+        self._slots: Dict[str, int] = {}
+        self._updates: List[int] = []
+        self._write_lock = threading.Lock()
+        self._warned_symbols = False
+        self._warned_positions = False
+        self._rejected_symbols = set()
+        self.logger = logging.getLogger(__name__)
+        atexit.register(self.close)
+
+    @staticmethod
+    def _reclaim(name: str):
+        """Unlink a segment left behind by an owner that did not shut down cleanly.
+
+        Raises RuntimeError if the segment's owner is still running or the
+        segment is not one of ours, rather than pulling it out from under it.
+        """
+        stale = shared_memory.SharedMemory(name=name)
+        header = np.ndarray((1,), dtype=HEADER_DTYPE, buffer=stale.buf)
+        ours = header['magic'][0] == SHARED_MAGIC
+        owner_pid = int(header['owner_pid'][0])
+        del header
+        # Our own pid means a previous owner with the same pid (e.g. pid 1 in a container)
+        if not ours or (owner_pid != os.getpid() and _pid_alive(owner_pid)):
+            # Leave it in place: this process must not unlink it at exit either
+            resource_tracker.unregister(stale._name, 'shared_memory')
+            stale.close()
+            if ours:
+                raise RuntimeError(f"Shared market data '{name}' is owned by running process {owner_pid}")
+            raise RuntimeError(f"Shared memory '{name}' exists and is not a market data segment")
+        stale.close()
+        stale.unlink()
+
+    def publish(self, ticks: Sequence = (), position_ids: Optional[List[str]] = None,
+                rows: Optional[np.ndarray] = None, symbols: Optional[List[str]] = None,
+                connected: bool = True):
+        """Write ticks and (when given) the full position table in one seqlock section.
+
+        ``rows`` are PositionBook rows aligned with ``position_ids``, and
+        ``symbols`` maps their symbol_id to a symbol name.
+        """
+        with self._write_lock:
+            if self._shm is None:
+                return
+            header = self._header
+            header['seq'] += 1
+            try:
+                for tick in ticks:
+                    slot = self._slots.get(tick.symbol)
+                    if slot is None:
+                        slot = self._assign_slot(tick.symbol)
+                        if slot is None:
+                            continue
+                    self._updates[slot] += 1
+                    self._quotes[slot] = (
+                        tick.symbol, self._updates[slot], tick.price, tick.bid,
+                        tick.ask, tick.volume, tick.timestamp_ns, tick.change, tick.change_percent
+                    )
+                if rows is not None:
+                    self._write_positions(position_ids, rows, symbols)
+                header['connected'] = int(connected)
+            finally:
+                header['seq'] += 1
+
+    def set_connected(self, connected: bool):
+        self.publish(connected=connected)
+
+    def _fits(self, symbol: str) -> bool:
+        """Whether a symbol fits the fixed-width field; logged once per symbol if not"""
+        if len(symbol) <= MAX_SYMBOL_BYTES and symbol.isascii():
+            return True
+        if symbol not in self._rejected_symbols:
+            self._rejected_symbols.add(symbol)
+            self.logger.warning(f"Not sharing {symbol!r}: symbols are limited to "
+                                f"{MAX_SYMBOL_BYTES} ASCII characters")
+        return False
+
+    def _assign_slot(self, symbol: str) -> Optional[int]:
+        if not self._fits(symbol):
+            return None
+        slot = len(self._slots)
+        if slot >= self.max_symbols:
+            if not self._warned_symbols:
+                self.logger.warning(f"Shared market data is full ({self.max_symbols} symbols); {symbol} not shared")
+                self._warned_symbols = True
+            return None
+        self._slots[symbol] = slot
+        self._updates.append(0)
+        self._header['n_symbols'] = slot + 1
+        return slot
+
+    def _write_positions(self, position_ids: List[str], rows: np.ndarray, symbols: List[str]):
+        fits = np.array([self._fits(symbol) for symbol in symbols], dtype=bool)
+        if len(rows) and not fits.all():
+            keep = fits[rows['symbol_id']]
+            rows = rows[keep]
+            position_ids = [position_id for position_id, kept in zip(position_ids, keep) if kept]
+        n = min(len(rows), self.max_positions)
+        if n < len(rows) and not self._warned_positions:
+            self.logger.warning(f"Shared market data holds {self.max_positions} positions; rest not shared")
+            self._warned_positions = True
+        block = self._positions[:n]
+        if n:
+            names = np.array([symbol if ok else '' for symbol, ok in zip(symbols, fits)], dtype=SYMBOL_DTYPE)
+            block['position_id'] = position_ids[:n]
+            block['symbol'] = names[rows['symbol_id'][:n]]
+            for field in ('quantity', 'entry_price', 'current_price', 'unrealized_pnl', 'entry_time'):
+                block[field] = rows[field][:n]
+        self._header['n_positions'] = n
+
+    def close(self):
+        """Release and remove the shared segment"""
+        with self._write_lock:
+            if self._shm is None:
+                return
+            self._header['connected'] = 0
+            self._header = self._quotes = self._positions = None
+            self._shm.close()
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+            self._shm = None
+
+
+class SharedMarketDataReader:
+    """Read-only view of the feed owner's segment, polled into a local data manager.
+
+    Every poll takes a consistent copy of the tables (retrying while the
+    owner is mid-write), publishes the symbols whose update counter moved
+    as one batch, and replaces the local position book when positions
+    changed. If the owner goes away the reader re-attaches when it returns.
+    """
+
+    def __init__(self, data_manager, name: str, poll_interval: float = 0.1):
+        self.data_manager = data_manager
+        self.name = name
+        self.poll_interval = poll_interval
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._views: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._updates: Dict[str, int] = {}
+        self._last_seq = None
+        self._last_positions: Optional[bytes] = None
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self.run, name="shared-market-data", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(5.0)
+        self._detach()
+
+    def run(self):
+        while self._running:
+            try:
+                self.poll()
+            except Exception as e:
+                self.logger.error(f"Shared market data poll failed: {e}")
+                self._detach()
+            time.sleep(self.poll_interval)
+
+    def attach(self) -> bool:
+        """Attach to the owner's segment, returning False if it does not exist yet"""
+        try:
+            shm = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return False
+        # Readers must not unlink the owner's segment when they exit
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        header = np.ndarray((1,), dtype=HEADER_DTYPE, buffer=shm.buf)
+        if header['magic'][0] != SHARED_MAGIC:
+            del header
+            shm.close()
+            return False
+        max_symbols, max_positions = int(header['max_symbols'][0]), int(header['max_positions'][0])
+        del header
+        self._shm = shm
+        self._views = _layout(shm.buf, max_symbols, max_positions)
+        self._last_seq = None
+        self._last_positions = None
+        self._updates = {}
+        self.logger.info(f"Attached to shared market data '{self.name}'")
+        return True
+
+    def _detach(self):
+        if self._shm is not None:
+            self._views = None
+            self._shm.close()
+            self._shm = None
+            self.data_manager.is_connected = False
+
+    def read(self) -> Optional[Tuple[int, np.ndarray, np.ndarray, bool, int]]:
+        """Consistent copy of (seq, quotes, positions, connected, owner_pid)"""
+        header, quotes, positions = self._views
+        for _ in range(1000):
+            seq = int(header['seq'][0])
+            if seq & 1:
+                continue
+            n_symbols, n_positions = int(header['n_symbols'][0]), int(header['n_positions'][0])
+            quote_copy = quotes[:n_symbols].copy()
+            position_copy = positions[:n_positions].copy()
+            connected, owner_pid = bool(header['connected'][0]), int(header['owner_pid'][0])
+            if int(header['seq'][0]) == seq:
+                return seq, quote_copy, position_copy, connected, owner_pid
+        return None
+
+    def poll(self):
+        """Apply any changes published since the last poll"""
+        if self._shm is None and not self.attach():
+            return
+        result = self.read()
+        if result is None:
+            return
+        seq, quotes, positions, connected, owner_pid = result
+        if not _pid_alive(owner_pid):
+            self.logger.warning("Shared market data owner has exited")
+            self._detach()
+            return
+        self.data_manager.is_connected = connected
+        if seq == self._last_seq:
+            return
+        self._last_seq = seq
+
+        raw_positions = positions.tobytes()
+        if raw_positions != self._last_positions:
+            self._last_positions = raw_positions
+            self.data_manager.replace_positions(self._to_book(positions))
+
+        batch = []
+        for record in quotes.tolist():
+            symbol, updates = record[0].decode('ascii'), record[1]
+            if self._updates.get(symbol) != updates:
+                self._updates[symbol] = updates
+                batch.append(Tick(symbol, *record[2:]))
+        if batch:
+            self.data_manager.update_market_data_batch(batch)
+
+    @staticmethod
+    def _to_book(positions: np.ndarray) -> PositionBook:
+        book = PositionBook(max(64, len(positions)))
+        for record in positions.tolist():
+            position_id, symbol, quantity, entry_price, current_price, _, entry_time = record
+            book.add(position_id.decode('ascii'), symbol.decode('ascii'), quantity, entry_price,
+                     current_price, datetime.fromtimestamp(entry_time / 1_000_000_000))
+        return book
@@ -0,0 +1,135 @@
+"""
+Staleness Monitor
+Tracks quote age per symbol and raises events when symbols go stale or recover
+"""
+
+import heapq
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from callback_dispatch import CallbackDispatcher, OverflowPolicy, Subscriber
+
+
+class StalenessEvent:
+    """A symbol going stale (``stale=True``) or recovering"""
+
+    __slots__ = ('symbol', 'stale', 'last_update_ns', 'at_ns')
+
+    def __init__(self, symbol: str, stale: bool, last_update_ns: int, at_ns: int):
+        self.symbol = symbol
+        self.stale = stale
+        self.last_update_ns = last_update_ns
+        self.at_ns = at_ns
+
+    def __repr__(self) -> str:
+        state = "stale" if self.stale else "recovered"
+        return f"StalenessEvent({self.symbol} {state} at={self.at_ns} last={self.last_update_ns})"
+
+
+class StalenessMonitor:
+    """Per-symbol quote age with a deadline heap driving stale events.
+
+    ``touch`` records the update time in a dict; ``is_stale`` compares it
+    with the clock, so both are O(1) and never scan. The heap holds one
+    deadline per symbol (last update + threshold). When a deadline pops and
+    the symbol has updated since, it is re-armed at the new deadline;
+    otherwise the symbol is marked stale and an event is published. The
+    next ``touch`` of a stale symbol publishes the recovery.
+
+    Symbols that have never updated count as stale.
+    """
+
+    def __init__(self, threshold: float, now_ns: Callable[[], int], max_wait: float = 0.25):
+        self.threshold_ns = int(threshold * 1_000_000_000)
+        self.now_ns = now_ns
+        self.max_wait = max_wait
+        self.dispatcher = CallbackDispatcher(OverflowPolicy.CONFLATE)
+
+        self._last: Dict[str, int] = {}
+        self._stale: Set[str] = set()
+        self._armed: Set[str] = set()
+        self._deadlines: List[Tuple[int, str]] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.logger = logging.getLogger(__name__)
+
+    def touch(self, symbol: str, now_ns: int):
+        """Record an update for symbol at clock time now_ns"""
+        self._last[symbol] = now_ns
+        if symbol in self._armed:
+            return
+        with self._lock:
+            if symbol not in self._armed:
+                self._armed.add(symbol)
+                heapq.heappush(self._deadlines, (now_ns + self.threshold_ns, symbol))
+                if self._thread is None:
+                    self._start()
+        if symbol in self._stale:
+            self._stale.discard(symbol)
+            self.logger.info(f"Quotes for {symbol} recovered")
+            self.dispatcher.publish(StalenessEvent(symbol, False, now_ns, now_ns))
+
+    def is_stale(self, symbol: str) -> bool:
+        """True if symbol has not updated within the threshold"""
+        last = self._last.get(symbol)
+        return last is None or self.now_ns() - last > self.threshold_ns
+
+    def age(self, symbol: str) -> Optional[float]:
+        """Seconds since symbol last updated (None if never)"""
+        last = self._last.get(symbol)
+        return None if last is None else (self.now_ns() - last) / 1e9
+
+    def stale_symbols(self) -> List[str]:
+        """Symbols the monitor has flagged stale"""
+        return sorted(self._stale)
+
+    def subscribe(self, callback: Callable[[StalenessEvent], None],
+                  symbols: Optional[Iterable[str]] = None, name: Optional[str] = None) -> Subscriber:
+        """Call ``callback`` with StalenessEvents for the given symbols (all if None)"""
+        return self.dispatcher.add_subscriber(callback, name=name, symbols=symbols)
+
+    def _start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="staleness-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(2.0)
+        self.dispatcher.stop()
+
+    def _run(self):
+        while self._running:
+            self._expire(self.now_ns())
+            with self._lock:
+                next_deadline = self._deadlines[0][0] if self._deadlines else None
+            wait = self.max_wait
+            if next_deadline is not None:
+                wait = min(wait, max(0.0, (next_deadline - self.now_ns()) / 1e9))
+            self._wakeup.wait(wait)
+
+    def _expire(self, now_ns: int):
+        """Pop due deadlines, re-arming symbols that updated and flagging the rest"""
+        events = []
+        with self._lock:
+            deadlines = self._deadlines
+            while deadlines and deadlines[0][0] <= now_ns:
+                _, symbol = heapq.heappop(deadlines)
+                last = self._last[symbol]
+                deadline = last + self.threshold_ns
+                if deadline > now_ns:
+                    heapq.heappush(deadlines, (deadline, symbol))
+                    continue
+                self._armed.discard(symbol)
+                if symbol not in self._stale:
+                    self._stale.add(symbol)
+                    events.append(StalenessEvent(symbol, True, last, now_ns))
+        for event in events:
+            self.logger.warning(f"Quotes for {event.symbol} are stale "
+                                f"({(event.at_ns - event.last_update_ns) / 1e9:.1f}s old)")
+            self.dispatcher.publish(event)
@@ -0,0 +1,110 @@
+"""
+Symbol Statistics
+Running per-symbol microstructure statistics updated in O(1) per tick
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+NS_PER_DAY = 86_400 * 1_000_000_000
+
+
+@dataclass(frozen=True)
+class SymbolStatsSnapshot:
+    """Point-in-time copy of one symbol's running statistics"""
+    symbol: str
+    last_price: float
+    vwap: float
+    volatility: float  # EWMA standard deviation of tick log returns
+    avg_spread: float
+    high: float
+    low: float
+    volume: int
+    ticks: int
+    session_start_ns: int
+
+
+class _RunningStats:
+    """Mutable accumulator for one symbol and session"""
+
+    __slots__ = ('last_price', 'pv', 'volume', 'variance', 'spread_sum', 'ticks',
+                 'high', 'low', 'session_start', 'session_end')
+
+    def __init__(self, price: float, session_start: int):
+        self.last_price = price
+        self.pv = 0.0
+        self.volume = 0
+        self.variance = 0.0
+        self.spread_sum = 0.0
+        self.ticks = 0
+        self.high = self.low = price
+        self.session_start = session_start
+        self.session_end = session_start + NS_PER_DAY
+
+
+class SymbolStatsTracker:
+    """Session VWAP, EWMA volatility, average spread and high/low per symbol.
+
+    ``update`` does a handful of float operations per tick; ``get`` returns
+    the current values without touching history. Statistics reset at the
+    daily session boundary, ``session_reset_hour`` (UTC) by tick time.
+    Called from the single ingest path; readers get immutable snapshots.
+    """
+
+    def __init__(self, ewma_lambda: float = 0.94, session_reset_hour: int = 22):
+        self.ewma_lambda = ewma_lambda
+        self.session_offset_ns = session_reset_hour * 3600 * 1_000_000_000
+        self._stats: Dict[str, _RunningStats] = {}
+
+    def _session_start(self, timestamp_ns: int) -> int:
+        offset = self.session_offset_ns
+        return timestamp_ns - (timestamp_ns - offset) % NS_PER_DAY
+
+    def update(self, symbol: str, timestamp_ns: int, price: float, bid: float, ask: float, volume: int):
+        """Fold one tick into the symbol's running statistics"""
+        stats = self._stats.get(symbol)
+        if stats is None or timestamp_ns >= stats.session_end:
+            stats = self._stats[symbol] = _RunningStats(price, self._session_start(timestamp_ns))
+
+        if price > 0 and stats.last_price > 0:
+            ret = math.log(price / stats.last_price)
+            stats.variance = self.ewma_lambda * stats.variance + (1 - self.ewma_lambda) * ret * ret
+        stats.last_price = price
+        if volume > 0:
+            stats.pv += price * volume
+            stats.volume += volume
+        stats.spread_sum += ask - bid
+        stats.ticks += 1
+        if price > stats.high:
+            stats.high = price
+        elif price < stats.low:
+            stats.low = price
+
+    def get(self, symbol: str) -> Optional[SymbolStatsSnapshot]:
+        """Current statistics for symbol (None before its first tick)"""
+        stats = self._stats.get(symbol)
+        if stats is None:
+            return None
+        return SymbolStatsSnapshot(
+            symbol=symbol,
+            last_price=stats.last_price,
+            vwap=stats.pv / stats.volume if stats.volume else stats.last_price,
+            volatility=math.sqrt(stats.variance),
+            avg_spread=stats.spread_sum / stats.ticks if stats.ticks else 0.0,
+            high=stats.high,
+            low=stats.low,
+            volume=stats.volume,
+            ticks=stats.ticks,
+            session_start_ns=stats.session_start
+        )
+
+    def get_all(self) -> Dict[str, SymbolStatsSnapshot]:
+        return {symbol: self.get(symbol) for symbol in list(self._stats)}
+
+    def reset(self, symbol: Optional[str] = None):
+        """Start a new session for one symbol (or all)"""
+        if symbol is None:
+            self._stats = {}
+        else:
+            self._stats.pop(symbol, None)
@@ -0,0 +1,77 @@
+"""Bars close on a timer when their symbol goes quiet, and late ticks are dropped"""
+
+import time
+
+from bar_aggregator import BarAggregator
+
+SECOND = 1_000_000_000
+
+
+class ManualClock:
+    def __init__(self, now_ns):
+        self.now = now_ns
+
+    def __call__(self):
+        return self.now
+
+
+def test_quiet_symbol_bar_closes_on_timer():
+    clock = ManualClock(10 * SECOND)
+    bars = BarAggregator(intervals={'1s': 1}, now_ns=clock, close_delay=0.5, close_interval=0.01)
+    bars.update('ES', 10 * SECOND + 100, 100.0, 1)
+    bars.update('ES', 10 * SECOND + 200, 101.0, 2)
+    assert len(bars.get_bars('ES', '1s')) == 0
+
+    clock.now = 11 * SECOND + SECOND // 2
+    deadline = time.monotonic() + 2
+    while not len(bars.get_bars('ES', '1s')) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    closed = bars.get_bars('ES', '1s')
+    bars.stop()
+
+    assert closed.tolist() == [(10 * SECOND, 100.0, 101.0, 100.0, 101.0, 3, 2)]
+
+
+def test_late_tick_for_closed_period_is_not_a_new_bar():
+    bars = BarAggregator(intervals={'1s': 1})
+    bars.update('ES', 10 * SECOND, 100.0, 1)
+    bars.close_due(11 * SECOND)
+    bars.update('ES', 10 * SECOND + 5, 99.0, 1)
+    bars.update('ES', 11 * SECOND + 5, 102.0, 1)
+    assert len(bars.get_bars('ES', '1s')) == 1
+    assert bars.get_bars('ES', '1s', include_forming=True)['open'].tolist() == [100.0, 102.0]
+    assert bars.late_ticks == 1
+
+
+def test_late_tick_for_older_period_is_not_folded_into_forming_bar():
+    bars = BarAggregator(intervals={'1s': 1})
+    bars.update('ES', 11 * SECOND, 100.0, 1)
+    bars.update('ES', 10 * SECOND + 5, 90.0, 7)
+    forming = bars.get_bars('ES', '1s', include_forming=True)
+    assert forming.tolist() == [(11 * SECOND, 100.0, 100.0, 100.0, 100.0, 1, 1)]
+    assert bars.late_ticks == 1
+
+
+def _wait_for_bars(bars, count, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while len(bars.get_bars('ES', '1s')) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return bars.get_bars('ES', '1s')
+
+
+def test_delayed_feed_closes_bars_on_source_time():
+    # Ticks arrive 5s behind the local clock; the open bar must not close early.
+    clock = ManualClock(15 * SECOND)
+    bars = BarAggregator(intervals={'1s': 1}, now_ns=clock, close_delay=0.5, close_interval=0.01)
+    bars.update('ES', 10 * SECOND + 100, 100.0, 1)
+
+    clock.now = 16 * SECOND
+    time.sleep(0.1)
+    assert len(bars.get_bars('ES', '1s')) == 0
+
+    clock.now = 16 * SECOND + SECOND // 2 + 100
+    closed = _wait_for_bars(bars, 1)
+    bars.stop()
+
+    assert closed.tolist() == [(10 * SECOND, 100.0, 100.0, 100.0, 100.0, 1, 1)]
+    assert bars.late_ticks == 0
@@ -0,0 +1,32 @@
+"""Idle pull consumers expire and are pruned when another consumer registers"""
+
+import time
+
+from callback_dispatch import CallbackDispatcher
+
+
+def test_expired_consumer_is_pruned_and_replaceable():
+    dispatcher = CallbackDispatcher()
+    stale = dispatcher.add_conflated_consumer('ui_session', interval=0, expire_after=0.01)
+    time.sleep(0.02)
+    assert stale.expired
+
+    fresh = dispatcher.add_conflated_consumer('ui_session', interval=0, expire_after=60)
+    assert not dispatcher.is_registered(stale)
+    assert dispatcher.is_registered(fresh)
+    assert not fresh.expired
+    dispatcher.stop()
+
+
+def test_names_are_not_reused_after_removal():
+    dispatcher = CallbackDispatcher()
+    first = dispatcher.add_subscriber(lambda tick: None, name='cb')
+    second = dispatcher.add_subscriber(lambda tick: None, name='cb')
+    third = dispatcher.add_subscriber(lambda tick: None, name='cb')
+    dispatcher.remove_subscriber(first)
+    fourth = dispatcher.add_subscriber(lambda tick: None, name='cb')
+
+    names = [s.name for s in (second, third, fourth)]
+    assert first.name == 'cb' and names == ['cb#1', 'cb#2', 'cb#3']
+    assert set(dispatcher.get_stats()) == set(names)
+    dispatcher.stop()
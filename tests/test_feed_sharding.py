@@ -0,0 +1,47 @@
+"""Rendezvous shard assignment is stable as symbols and shards change"""
+
+import pytest
+
+from feed_sharding import ShardAssigner
+
+SYMBOLS = [f"SYM{i}" for i in range(200)]
+
+
+def _shards(assigner, symbols):
+    return {symbol: assigner.shard_for(symbol) for symbol in symbols}
+
+
+def test_assignment_is_deterministic_and_covers_every_symbol():
+    assignment = ShardAssigner(4).assign(SYMBOLS)
+    assert sorted(assignment) == [0, 1, 2, 3]
+    assert sorted(s for symbols in assignment.values() for s in symbols) == sorted(SYMBOLS)
+    assert ShardAssigner(4).assign(SYMBOLS) == assignment
+    assert all(symbols for symbols in assignment.values())
+
+
+def test_adding_symbols_never_moves_existing_ones():
+    before = _shards(ShardAssigner(4), SYMBOLS[:100])
+    after = _shards(ShardAssigner(4), SYMBOLS)
+    assert {symbol: after[symbol] for symbol in before} == before
+
+
+def test_adding_a_shard_only_moves_symbols_onto_it():
+    before = _shards(ShardAssigner(4), SYMBOLS)
+    after = _shards(ShardAssigner(5), SYMBOLS)
+    moved = [symbol for symbol in SYMBOLS if before[symbol] != after[symbol]]
+    assert moved and all(after[symbol] == 4 for symbol in moved)
+    # Roughly a fifth of the symbols move, not a reshuffle
+    assert len(moved) < len(SYMBOLS) / 2
+
+
+def test_overrides_pin_symbols_and_wrap_to_shard_count():
+    overrides = ShardAssigner.parse_overrides(" ES:0, NQ:3 ,")
+    assert overrides == {'ES': 0, 'NQ': 3}
+    assigner = ShardAssigner(2, overrides)
+    assert assigner.shard_for('ES') == 0
+    assert assigner.shard_for('NQ') == 1
+
+
+def test_rejects_zero_shards():
+    with pytest.raises(ValueError):
+        ShardAssigner(0)
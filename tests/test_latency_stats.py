@@ -0,0 +1,52 @@
+"""Latency histograms report percentiles within bucket resolution"""
+
+import numpy as np
+
+from latency_stats import LatencyHistogram, LatencyMonitor
+
+
+def test_percentiles_of_uniform_samples_are_within_bucket_resolution():
+    histogram = LatencyHistogram()
+    for value in range(1, 100_001):
+        histogram.record(value)
+
+    p50, p99, p999 = histogram.percentiles()
+    assert abs(p50 - 50_000) / 50_000 < 0.07
+    assert abs(p99 - 99_000) / 99_000 < 0.07
+    assert abs(p999 - 99_900) / 99_900 < 0.07
+    assert histogram.total == 100_000 and histogram.max_ns == 100_000
+
+
+def test_small_values_get_one_nanosecond_buckets():
+    histogram = LatencyHistogram()
+    for value in (3, 3, 3, 7):
+        histogram.record(value)
+    assert histogram.percentiles((0.5, 1.0)) == [3.5, 7.0]
+
+
+
+def test_percentiles_never_exceed_the_max_sample():
+    histogram = LatencyHistogram()
+    histogram.record(1_015_808)  # lowest value of its bucket, so the midpoint is above it
+    assert histogram.percentiles() == [1_015_808] * 3
+
+
+def test_empty_and_negative_samples():
+    histogram = LatencyHistogram()
+    assert histogram.percentiles() == [0.0, 0.0, 0.0]
+    histogram.record(-5)
+    assert histogram.total == 1 and histogram.counts[0] == 1
+
+
+def test_monitor_merges_symbols_unless_one_is_given():
+    monitor = LatencyMonitor()
+    for _ in range(100):
+        monitor.record('source_to_receive', 'ES', 1_000)
+        monitor.record('source_to_receive', 'NQ', 1_000_000)
+
+    merged = monitor.summary('source_to_receive')['source_to_receive']
+    es = monitor.summary('source_to_receive', symbol='ES')['source_to_receive']
+    assert merged['count'] == 200 and es['count'] == 100
+    assert merged['max_us'] == 1_000.0 and es['max_us'] == 1.0
+    assert np.isclose(es['p99_us'], 1.0, rtol=0.07)
+    assert monitor.symbols() == ['ES', 'NQ']
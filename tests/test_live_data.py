@@ -0,0 +1,22 @@
+"""Published snapshots are immutable: readers keep the version they took"""
+
+import pytest
+
+from live_data import LiveDataManager, Tick
+
+
+def test_snapshot_is_isolated_from_later_publishes():
+    manager = LiveDataManager(history_size=16)
+    manager.update_market_data_batch([Tick('ES', 4500.0, 4499.75, 4500.25, 1, 1_700_000_000_000_000_000)])
+    before = manager.get_snapshot()
+
+    manager.update_market_data_batch([Tick('ES', 4501.0, 4500.75, 4501.25, 1, 1_700_000_001_000_000_000),
+                                      Tick('NQ', 15000.0, 14999.75, 15000.25, 1, 1_700_000_001_000_000_000)])
+    after = manager.get_snapshot()
+
+    assert after.version == before.version + 1
+    assert before.data['ES'].price == 4500.0 and 'NQ' not in before.data
+    assert after.data['ES'].price == 4501.0
+    with pytest.raises(TypeError):
+        after.data['ES'] = None
+    manager.bars.stop()
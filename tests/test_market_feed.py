@@ -0,0 +1,89 @@
+"""WebSocketFeed against a local websocket server standing in for the vendor feed"""
+
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+
+from market_feed import WebSocketFeed, decode_json_batch, decode_json_line
+
+
+class RecordingSink:
+    """Collects what the feed publishes in place of a LiveDataManager"""
+
+    def __init__(self):
+        self.is_connected = False
+        self.ticks = []
+
+    def update_market_data_batch(self, batch, receive_ns=None):
+        self.ticks.extend(batch)
+
+
+def strict_decoder(frames):
+    """A decoder that raises on the first bad frame, like a vendor decoder without per-line guards"""
+    return [decode_json_line(frame) for frame in frames]
+
+
+def quote(symbol, price):
+    return json.dumps({'symbol': symbol, 'price': price, 'bid': price - 0.01,
+                       'ask': price + 0.01, 'size': 1})
+
+
+FRAMES = ([quote('ES', round(100 + i * 0.01, 2)) for i in range(2000)]
+          + ['this is not json']
+          + [quote('NQ', 200.0 + i) for i in range(10)])
+
+
+async def run_feed(decoder):
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.receive()  # subscription
+        for frame in FRAMES:
+            await ws.send_str(frame)
+        async for _ in ws:  # hold the connection until the feed closes it
+            pass
+        return ws
+
+    app = web.Application()
+    app.router.add_get('/stream', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    sink = RecordingSink()
+    feed = WebSocketFeed(f"http://127.0.0.1:{port}/stream", ['ES', 'NQ'], sink, decoder=decoder)
+    task = asyncio.ensure_future(feed.run())
+    try:
+        for _ in range(500):
+            if sum(tick.symbol == 'NQ' for tick in sink.ticks) == 10:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        feed._stopping.set()
+        await asyncio.wait_for(task, 5)
+        await runner.cleanup()
+    return feed, sink
+
+
+@pytest.mark.parametrize('decoder', [decode_json_batch, strict_decoder])
+def test_bad_frame_costs_only_itself(decoder):
+    feed, sink = asyncio.run(run_feed(decoder))
+
+    es = [tick for tick in sink.ticks if tick.symbol == 'ES']
+    nq = [tick for tick in sink.ticks if tick.symbol == 'NQ']
+    assert len(es) == 2000
+    assert es[-1].price == pytest.approx(119.99)
+    assert [tick.price for tick in nq] == [200.0 + i for i in range(10)]
+    if decoder is strict_decoder:
+        assert feed.stats['decode_errors'] == 1
+
+
+def test_decode_json_batch_skips_bad_lines():
+    frame = "\n".join([quote('ES', 1.0), '{"symbol": "ES", "price": null, "bid": null}',
+                       '{broken', quote('NQ', 2.0)])
+    ticks = decode_json_batch([frame])
+    assert [(tick.symbol, tick.price) for tick in ticks] == [('ES', 1.0), ('NQ', 2.0)]
@@ -0,0 +1,23 @@
+"""Seeded simulator output must not depend on how steps are batched"""
+
+from market_simulator import VectorizedMarketSimulator
+
+SYMBOLS = ['ES', 'NQ', 'ZN', '6E']
+
+
+def quotes(simulator, batches):
+    ticks = []
+    for n_steps in batches:
+        ticks.extend(simulator.generate(n_steps, 0.0, 1.0))
+    return [(tick.symbol, tick.price, tick.bid, tick.ask, tick.volume) for tick in ticks]
+
+
+def test_batch_boundaries_do_not_change_seeded_output():
+    whole = quotes(VectorizedMarketSimulator(SYMBOLS, seed=1), [400])
+    for batches in ([2] * 200, [1, 3, 7, 389], [399, 1]):
+        assert quotes(VectorizedMarketSimulator(SYMBOLS, seed=1), batches) == whole
+
+
+def test_seeds_differ():
+    assert (quotes(VectorizedMarketSimulator(SYMBOLS, seed=1), [50])
+            != quotes(VectorizedMarketSimulator(SYMBOLS, seed=2), [50]))
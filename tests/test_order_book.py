@@ -0,0 +1,22 @@
+"""Sweep prices walk the book and reject non-positive sizes"""
+
+import math
+
+import pytest
+
+from order_book import ASK, BID, OrderBook
+
+
+def test_sweep_price_walks_levels():
+    book = OrderBook('ES')
+    book.apply([(ASK, 4500.25, 10), (ASK, 4500.50, 10), (BID, 4500.0, 5)])
+    assert book.sweep_price(ASK, 15) == pytest.approx((10 * 4500.25 + 5 * 4500.50) / 15)
+    assert book.sweep_price(BID, 6) is None
+
+
+@pytest.mark.parametrize('quantity', [0, -1, math.nan])
+def test_sweep_price_rejects_non_positive_quantity(quantity):
+    book = OrderBook('ES')
+    book.apply([(ASK, 4500.25, 10)])
+    with pytest.raises(ValueError):
+        book.sweep_price(ASK, quantity)
@@ -0,0 +1,51 @@
+"""Tick ranges fill every limit they crossed; stops trigger in crossing order"""
+
+from order_matching import LimitOrderMatcher, StopTriggerIndex, TickRange
+
+
+def test_range_keeps_crossings_of_intermediate_ticks():
+    matcher = LimitOrderMatcher()
+    matcher.add('buy', 'ES', True, 4490.0, 1)
+    matcher.add('sell', 'ES', False, 4510.0, 1)
+
+    ticks = TickRange('ES', 4500.0, 4499.75, 4500.25, 0)
+    for price in (4489.5, 4505.0, 4510.5, 4500.0):
+        ticks.merge(price, price - 0.25, price + 0.25, 0)
+
+    fills = matcher.match_range(ticks)
+    # Filled at the limit: the latest quote is worse than either limit
+    assert sorted(fills) == [('buy', 1, 4490.0), ('sell', 1, 4510.0)]
+    assert ticks.ticks == 5
+
+
+def test_single_tick_match_is_unchanged():
+    matcher = LimitOrderMatcher()
+    matcher.add('buy', 'ES', True, 4500.0, 3)
+    assert matcher.match('ES', 4499.5, 4499.75, 4499.75, 2) == [('buy', 2, 4499.75)]
+
+
+def test_stops_trigger_on_their_side_in_the_order_the_move_crossed_them():
+    stops = StopTriggerIndex()
+    stops.add('sell-4490', 'ES', False, 4490.0)
+    stops.add('sell-4495', 'ES', False, 4495.0)
+    stops.add('sell-4495-late', 'ES', False, 4495.0)
+    stops.add('buy-4510', 'ES', True, 4510.0)
+    stops.add('buy-4505', 'ES', True, 4505.0)
+    stops.add('nq-sell', 'NQ', False, 15_000.0)
+
+    assert stops.trigger('ES', 4500.0) == []
+    # A fall to 4492 crosses the 4495 stops (oldest first) but not 4490
+    assert stops.trigger('ES', 4492.0) == ['sell-4495', 'sell-4495-late']
+    # A rise to 4510 crosses 4505 before 4510
+    assert stops.trigger('ES', 4510.0) == ['buy-4505', 'buy-4510']
+    assert stops.working_orders('ES') == ['sell-4490']
+    assert len(stops) == 2 and 'nq-sell' in stops
+
+
+def test_cancelled_stop_never_triggers():
+    stops = StopTriggerIndex()
+    stops.add('a', 'ES', False, 4495.0)
+    stops.add('b', 'ES', False, 4495.0)
+    assert stops.cancel('a') and not stops.cancel('a')
+    assert stops.trigger('ES', 4400.0) == ['b']
+    assert stops.trigger('CL', 70.0) == [] and len(stops) == 0
@@ -0,0 +1,48 @@
+"""Partial closes reduce a position and realize P&L on the closed part only"""
+
+from datetime import datetime
+
+import pytest
+
+from position_book import PositionBook
+
+
+def test_reduce_realizes_closed_part_and_keeps_rest():
+    book = PositionBook()
+    book.add('p1', 'ES', 4.0, 100.0, 100.0, datetime(2024, 1, 2))
+    book.mark_to_market({'ES': 110.0})
+
+    assert book.reduce('p1', 1.0, exit_price=105.0) == 1.0
+    assert book.realized_pnl == pytest.approx(5.0)
+    assert book.row('p1')['quantity'] == pytest.approx(3.0)
+    assert book.gross_exposure == pytest.approx(3.0 * 110.0)
+    assert book.unrealized_pnl == pytest.approx(3.0 * 10.0)
+
+
+def test_reduce_short_and_overfill_removes_position():
+    book = PositionBook()
+    book.add('p1', 'NQ', -2.0, 200.0, 200.0, datetime(2024, 1, 2))
+
+    assert book.reduce('p1', 1.0, exit_price=190.0) == 1.0
+    assert book.row('p1')['quantity'] == pytest.approx(-1.0)
+    assert book.reduce('p1', 5.0, exit_price=195.0) == pytest.approx(1.0)
+    assert 'p1' not in book
+    assert book.realized_pnl == pytest.approx(10.0 + 5.0)
+    assert book.gross_exposure == pytest.approx(0.0)
+    assert book.reduce('p1', 1.0) is None
+
+
+def test_add_batch_matches_sequential_adds():
+    opened = datetime(2024, 1, 2)
+    rows = [('a', 'ES', 2.0, 100.0), ('b', 'NQ', -1.0, 200.0), ('c', 'ES', 1.0, 104.0)]
+    one_by_one, batched = PositionBook(capacity=2), PositionBook(capacity=2)
+    for position_id, symbol, quantity, entry in rows:
+        one_by_one.add(position_id, symbol, quantity, entry, entry, opened)
+    batched.add_batch(*map(list, zip(*rows)), [opened] * len(rows))
+
+    assert batched.position_ids() == one_by_one.position_ids()
+    assert (batched.view() == one_by_one.view()).all()
+    for total in ('gross_exposure', 'net_exposure', 'unrealized_pnl'):
+        assert getattr(batched, total) == pytest.approx(getattr(one_by_one, total))
+    with pytest.raises(ValueError):
+        batched.add_batch(['a'], ['ES'], [1.0], [100.0], [opened])
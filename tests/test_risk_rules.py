@@ -0,0 +1,77 @@
+"""Risk rules: closes pass a stale feed, per-trade risk, drawdown sessions, the rule contract"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from market_clock import SimulatedClock
+from risk_rules import DailyDrawdownRule, RiskPerTradeRule, RiskPipeline, RiskRule, StaleQuoteRule
+from symbol_stats import NS_PER_DAY
+
+HOUR = 3600 * 1_000_000_000
+
+
+class StaleFeed:
+    def is_stale(self, symbol):
+        return True
+
+
+def order(**fields):
+    defaults = dict(symbol='ES', quantity=1.0, price=None, stop_price=None, close_position_id=None)
+    return SimpleNamespace(**{**defaults, **fields})
+
+
+def test_stale_quotes_block_entries_but_not_closes():
+    pipeline = RiskPipeline([StaleQuoteRule()])
+    assert pipeline.check(order(), 4500.0, StaleFeed()) == "quotes for ES are stale"
+    assert pipeline.check(order(close_position_id='p1'), 4500.0, StaleFeed()) is None
+
+
+def test_stop_limit_risk_uses_emergency_stop_not_trigger_distance():
+    rule = RiskPerTradeRule(max_risk=1000.0, emergency_stop_loss=0.10)
+    # The 0.25 gap between trigger and limit is not the risk; 10% of 4500.25 x 5 is
+    stop_limit = order(quantity=5.0, price=4500.25, stop_price=4500.0)
+    pipeline = RiskPipeline([rule])
+    reason = pipeline.check(stop_limit, 4400.0, StaleFeed())
+    assert reason == "trade risk $2,250.12 exceeds $1,000.00 per trade"
+    assert pipeline.check(order(quantity=2.0, price=4500.0), 4400.0, StaleFeed()) is None
+
+
+class Book:
+    """Data manager stand-in with a settable P&L"""
+
+    def __init__(self, now_ns):
+        self.clock = SimulatedClock(now_ns)
+        self.pnl = 0.0
+
+    def get_exposure(self):
+        return {'realized_pnl': self.pnl, 'unrealized_pnl': 0.0, 'gross_exposure': 0.0, 'positions': 0}
+
+
+def test_drawdown_baseline_is_taken_at_the_session_reset_tick():
+    book = Book(10 * NS_PER_DAY + 21 * HOUR)
+    pipeline = RiskPipeline([DailyDrawdownRule(max_loss=500.0, session_reset_hour=22)])
+    book.pnl = -2000.0
+    pipeline.on_tick(book)
+
+    # First tick of the new session anchors the baseline at -2000
+    book.clock.set(10 * NS_PER_DAY + 22 * HOUR)
+    pipeline.on_tick(book)
+    # Losses taken before the session's first order still count
+    book.pnl = -2600.0
+    pipeline.on_tick(book)
+    assert pipeline.check(order(), 4500.0, book) == "daily drawdown $600.00 exceeds $500.00"
+
+    book.clock.set(11 * NS_PER_DAY + 22 * HOUR)
+    pipeline.on_tick(book)
+    assert pipeline.check(order(), 4500.0, book) is None
+
+
+def test_rules_must_implement_check():
+    class NoCheck(RiskRule):
+        name = "no_check"
+
+    with pytest.raises(TypeError):
+        RiskRule()
+    with pytest.raises(TypeError):
+        NoCheck()
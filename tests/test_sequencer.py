@@ -0,0 +1,23 @@
+"""A bounded sequencer makes producers wait instead of growing its queue"""
+
+import threading
+
+from sequencer import Sequencer
+
+
+def test_bounded_queue_throttles_producers():
+    sequencer = Sequencer("test-sequencer", max_queue=4)
+    gate = threading.Event()
+    sequencer.post(gate.wait)
+    results = []
+
+    producer = threading.Thread(target=lambda: [sequencer.post(results.append, i) for i in range(20)])
+    producer.start()
+    producer.join(0.2)
+    assert producer.is_alive() and len(sequencer) <= 4
+
+    gate.set()
+    producer.join(2)
+    sequencer.stop()
+    assert results == list(range(20))
+    assert sequencer.stats()['commands']['throttled'] > 0
@@ -0,0 +1,104 @@
+"""The shared segment: reclaiming stale owners, symbol limits and seqlock writes"""
+
+import os
+import subprocess
+import sys
+import threading
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pytest
+from multiprocessing import resource_tracker, shared_memory
+
+from live_data import Tick
+from position_book import PositionBook
+from shared_market_data import HEADER_DTYPE, SharedMarketDataWriter
+from tick_journal import MAX_SYMBOL_BYTES
+
+
+def _dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def _set_owner(name: str, pid: int):
+    shm = shared_memory.SharedMemory(name=name)
+    header = np.ndarray((1,), dtype=HEADER_DTYPE, buffer=shm.buf)
+    header['owner_pid'] = pid
+    del header
+    shm.close()
+
+
+def test_live_owner_is_not_displaced():
+    name = f"svtest_{uuid.uuid4().hex[:8]}"
+    owner = SharedMarketDataWriter(name, max_symbols=4, max_positions=4)
+    try:
+        _set_owner(name, os.getppid())
+        with pytest.raises(RuntimeError, match="owned by running process"):
+            SharedMarketDataWriter(name, max_symbols=4, max_positions=4)
+        # Both writers share this process's tracker entry, which the refused one dropped
+        resource_tracker.register(owner._shm._name, 'shared_memory')
+    finally:
+        owner.close()
+
+
+def test_segment_of_dead_owner_is_reclaimed():
+    name = f"svtest_{uuid.uuid4().hex[:8]}"
+    stale = SharedMarketDataWriter(name, max_symbols=4, max_positions=4)
+    _set_owner(name, _dead_pid())
+    stale._shm.close()  # crashed: never unlinked
+    stale._shm = None
+
+    owner = SharedMarketDataWriter(name, max_symbols=4, max_positions=4)
+    try:
+        assert int(owner._header['owner_pid'][0]) == os.getpid()
+    finally:
+        owner.close()
+
+
+def _tick(symbol: str) -> Tick:
+    return Tick(symbol, 100.0, 99.5, 100.5, 10, 1_000, 0.0, 0.0)
+
+
+def test_long_symbols_are_kept_whole_and_oversize_ones_skipped():
+    name = f"svtest_{uuid.uuid4().hex[:8]}"
+    writer = SharedMarketDataWriter(name, max_symbols=4, max_positions=4)
+    long_symbol = 'X' * MAX_SYMBOL_BYTES
+    oversize = 'Y' * (MAX_SYMBOL_BYTES + 1)
+    book = PositionBook(8)
+    book.add('p-long', long_symbol, 1, 100.0, 100.0, datetime.now())
+    book.add('p-over', oversize, 1, 100.0, 100.0, datetime.now())
+    try:
+        writer.publish([_tick(long_symbol), _tick(oversize)], book.position_ids(), book.view(), book.symbols())
+        assert writer._quotes[:int(writer._header['n_symbols'][0])]['symbol'].tolist() == [long_symbol.encode()]
+        positions = writer._positions[:int(writer._header['n_positions'][0])]
+        assert positions['position_id'].tolist() == [b'p-long']
+        assert positions['symbol'].tolist() == [long_symbol.encode()]
+        assert writer._rejected_symbols == {oversize}
+    finally:
+        writer.close()
+
+
+def test_concurrent_publishes_leave_the_sequence_even():
+    name = f"svtest_{uuid.uuid4().hex[:8]}"
+    writer = SharedMarketDataWriter(name, max_symbols=4, max_positions=4)
+
+    def publish():
+        for _ in range(2000):
+            writer.publish([_tick('ES')])
+
+    def disconnect():
+        for _ in range(2000):
+            writer.set_connected(False)
+
+    try:
+        threads = [threading.Thread(target=publish), threading.Thread(target=disconnect)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert int(writer._header['seq'][0]) == 2 * 4000
+    finally:
+        writer.close()
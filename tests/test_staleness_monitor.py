@@ -0,0 +1,66 @@
+"""Symbols go stale when their deadline passes and recover on the next update"""
+
+import time
+
+from staleness_monitor import StalenessMonitor
+
+SECOND = 1_000_000_000
+
+
+class ManualClock:
+    def __init__(self, now_ns):
+        self.now = now_ns
+
+    def __call__(self):
+        return self.now
+
+
+def _wait_for(events, count, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while len(events) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return [(event.symbol, event.stale) for event in events]
+
+
+def test_quiet_symbol_expires_and_recovers():
+    clock = ManualClock(100 * SECOND)
+    monitor = StalenessMonitor(threshold=2.0, now_ns=clock, max_wait=0.01)
+    events = []
+    monitor.subscribe(events.append)
+    try:
+        monitor.touch('ES', clock.now)
+        monitor.touch('NQ', clock.now)
+        assert not monitor.is_stale('ES') and monitor.is_stale('CL')
+
+        # NQ keeps updating; ES goes quiet past its deadline
+        clock.now = 101 * SECOND
+        monitor.touch('NQ', clock.now)
+        clock.now = 102 * SECOND + 1
+        monitor._expire(clock.now)
+        assert monitor.stale_symbols() == ['ES']
+        assert monitor.is_stale('ES') and not monitor.is_stale('NQ')
+        assert monitor.age('ES') == 2.000000001
+        assert _wait_for(events, 1) == [('ES', True)]
+
+        monitor.touch('ES', clock.now)
+        assert monitor.stale_symbols() == []
+        assert _wait_for(events, 2) == [('ES', True), ('ES', False)]
+    finally:
+        monitor.stop()
+
+
+def test_rearmed_symbol_expires_at_its_new_deadline():
+    clock = ManualClock(100 * SECOND)
+    monitor = StalenessMonitor(threshold=2.0, now_ns=clock, max_wait=60)
+    try:
+        monitor.touch('ES', clock.now)
+        clock.now = 101 * SECOND
+        monitor.touch('ES', clock.now)
+
+        # The original deadline (102s) pops but ES updated since: re-armed at 103s
+        monitor._expire(102 * SECOND)
+        assert monitor.stale_symbols() == []
+        monitor._expire(103 * SECOND)
+        assert monitor.stale_symbols() == ['ES']
+    finally:
+        monitor.stop()
@@ -0,0 +1,49 @@
+"""Session statistics: VWAP, spread, high/low and the daily reset"""
+
+import math
+
+from symbol_stats import NS_PER_DAY, SymbolStatsTracker
+
+HOUR = 3600 * 1_000_000_000
+DAY0 = 20_000 * NS_PER_DAY  # a UTC midnight
+
+
+def test_vwap_spread_and_range_within_a_session():
+    stats = SymbolStatsTracker(session_reset_hour=22)
+    stats.update('ES', DAY0 + HOUR, 100.0, 99.75, 100.25, 10)
+    stats.update('ES', DAY0 + 2 * HOUR, 102.0, 101.5, 102.5, 30)
+    stats.update('ES', DAY0 + 3 * HOUR, 99.0, 98.75, 99.25, 0)  # no volume: price only
+
+    snapshot = stats.get('ES')
+    assert math.isclose(snapshot.vwap, (100.0 * 10 + 102.0 * 30) / 40)
+    assert math.isclose(snapshot.avg_spread, (0.5 + 1.0 + 0.5) / 3)
+    assert (snapshot.high, snapshot.low, snapshot.last_price) == (102.0, 99.0, 99.0)
+    assert (snapshot.volume, snapshot.ticks) == (40, 3)
+    assert snapshot.volatility > 0
+    assert snapshot.session_start_ns == DAY0 - 2 * HOUR
+
+
+def test_statistics_reset_at_the_session_boundary():
+    stats = SymbolStatsTracker(session_reset_hour=22)
+    stats.update('ES', DAY0 + 21 * HOUR, 100.0, 99.75, 100.25, 10)
+    stats.update('ES', DAY0 + 22 * HOUR - 1, 101.0, 100.75, 101.25, 10)
+    assert stats.get('ES').ticks == 2
+
+    stats.update('ES', DAY0 + 22 * HOUR, 105.0, 104.75, 105.25, 5)
+    snapshot = stats.get('ES')
+    assert snapshot.session_start_ns == DAY0 + 22 * HOUR
+    assert (snapshot.ticks, snapshot.volume, snapshot.vwap) == (1, 5, 105.0)
+    assert (snapshot.high, snapshot.low, snapshot.volatility) == (105.0, 105.0, 0.0)
+
+
+def test_vwap_falls_back_to_last_price_and_reset_clears():
+    stats = SymbolStatsTracker()
+    assert stats.get('NQ') is None
+    stats.update('NQ', DAY0, 15_000.0, 14_999.0, 15_001.0, 0)
+    assert stats.get('NQ').vwap == 15_000.0
+
+    stats.update('ES', DAY0, 100.0, 99.75, 100.25, 1)
+    stats.reset('NQ')
+    assert list(stats.get_all()) == ['ES']
+    stats.reset()
+    assert stats.get_all() == {}
@@ -0,0 +1,26 @@
+"""Ring buffers keep the newest ticks contiguous across wraparound"""
+
+import numpy as np
+
+from tick_history import RingBuffer, TICK_DTYPE, TickHistory
+
+
+def test_ring_buffer_wraps_and_returns_newest_in_order():
+    buffer = RingBuffer(TICK_DTYPE, capacity=4)
+    for i in range(10):
+        buffer.append((i, float(i), 0.0, 0.0, 1))
+
+    assert len(buffer) == 4 and buffer.total_written == 10
+    assert buffer.latest()['timestamp'].tolist() == [6, 7, 8, 9]
+    assert buffer.latest(2)['timestamp'].tolist() == [8, 9]
+    # Views, not copies: the window is one slice of the backing array
+    assert np.shares_memory(buffer.latest(), buffer._data)
+
+
+def test_range_query_after_wraparound():
+    history = TickHistory(capacity=3)
+    for ts in (10, 20, 30, 40, 50):
+        history.append('ES', ts, 100.0, 99.75, 100.25, 1)
+
+    assert history.get_range('ES', 30, 50)['timestamp'].tolist() == [30, 40]
+    assert len(history.get_history('NQ')) == 0
@@ -0,0 +1,38 @@
+"""Tick journal symbol width and backlog bound"""
+
+import numpy as np
+import pytest
+
+from live_data import Tick
+from tick_journal import JOURNAL_DTYPE, HEADER_DTYPE, TickJournal, open_segment, segment_paths
+
+
+def tick(symbol, price=1.0):
+    return Tick(symbol, price, price, price, 1, 1_000_000_000)
+
+
+def test_long_symbols_round_trip_or_are_rejected(tmp_path):
+    journal = TickJournal(str(tmp_path))
+    journal.append_batch([tick('ESZ4'), tick('SPXW  241220C05900000'), tick('X' * 40)])
+    journal.close()
+
+    records = open_segment(segment_paths(str(tmp_path))[0])
+    assert [symbol.decode() for symbol in records['symbol']] == ['ESZ4', 'SPXW  241220C05900000']
+    assert journal.rejected == 1
+
+
+def test_backlog_is_bounded(tmp_path):
+    journal = TickJournal(str(tmp_path), max_pending=10, flush_interval=60)
+    journal.append_batch([tick('ES')] * 25)
+    assert len(journal._pending) == 10
+    assert journal.dropped == 15
+    journal.close()
+    assert journal.records_written == 10
+
+
+def test_rejects_unknown_magic(tmp_path):
+    path = tmp_path / "ticks-20240102-0000.bin"
+    header = np.array([(b'SVTICK01', JOURNAL_DTYPE.itemsize, 0)], dtype=HEADER_DTYPE)
+    path.write_bytes(header.tobytes() + np.zeros(1, dtype=JOURNAL_DTYPE).tobytes())
+    with pytest.raises(ValueError, match="Not a tick journal segment"):
+        open_segment(str(path))
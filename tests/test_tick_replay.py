@@ -0,0 +1,48 @@
+"""Replays follow market time at the requested speed and batch by window"""
+
+import time
+
+import numpy as np
+
+from market_clock import WallClock
+from tick_journal import JOURNAL_DTYPE
+from tick_replay import TickReplayer
+
+START_NS = 1_700_000_000_000_000_000
+
+
+class Recorder:
+    def __init__(self):
+        self.clock = WallClock()
+        self.is_connected = False
+        self.batches = []
+
+    def update_market_data_batch(self, batch):
+        self.batches.append((time.monotonic(), self.clock.now_ns(), [t.timestamp_ns for t in batch]))
+
+
+def records(offsets_ms):
+    return np.array([(START_NS + ms * 1_000_000, b'ES', 1.0, 1.0, 1.0, 1) for ms in offsets_ms],
+                    dtype=JOURNAL_DTYPE)
+
+
+def test_speed_scales_wall_time_and_clock_follows_market_time():
+    recorder = Recorder()
+    replayer = TickReplayer(recorder, [records([0, 0, 200, 400])], speed=2.0, batch_window=0.001)
+    replayer.run()
+
+    # The two ticks at 0 ms share a batch; 400 ms of market time takes ~200 ms at 2x
+    assert [len(stamps) for _, _, stamps in recorder.batches] == [2, 1, 1]
+    elapsed = recorder.batches[-1][0] - recorder.batches[0][0]
+    assert 0.18 <= elapsed < 0.35
+    assert [clock for _, clock, _ in recorder.batches] == [START_NS, START_NS + 200_000_000,
+                                                           START_NS + 400_000_000]
+    assert isinstance(recorder.clock, WallClock) and not recorder.is_connected
+
+
+def test_unpaced_replay_does_not_sleep():
+    recorder = Recorder()
+    started = time.monotonic()
+    TickReplayer(recorder, [records([0, 5_000, 10_000])], speed=None).run()
+    assert time.monotonic() - started < 0.5
+    assert len(recorder.batches) == 3
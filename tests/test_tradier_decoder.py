@@ -0,0 +1,21 @@
+"""A malformed Tradier event costs only itself, not its frame"""
+
+from tradier_decoder import TradierDecoder
+
+QUOTE = ('{"type":"quote","symbol":"%s","bid":%s,"bidsz":5,"bidexch":"Q","biddate":"1700000000000",'
+         '"ask":%s,"asksz":3,"askexch":"Q","askdate":"1700000000001"}')
+
+
+def test_bad_event_skips_only_that_line():
+    frame = '\n'.join([
+        QUOTE % ('ES', '4500.25', '4500.5'),
+        QUOTE % ('NQ', 'null', '15000.25'),
+        '{"type":"trade","symbol":"CL","price":"82.45","size":"2","date":"not-a-date"}',
+        '["not", "an", "object"]',
+        '{"type":"trade","symbol":"GC","exch":"Q","price":"2045.2","size":"1","cvol":"9",'
+        '"date":"1700000000002","last":"2045.2"}',
+    ])
+    decoder = TradierDecoder()
+    ticks = decoder([frame])
+    assert [tick.symbol for tick in ticks] == ['ES', 'GC']
+    assert decoder.stats['skipped'] == 3
@@ -0,0 +1,130 @@
+"""Engine fills keep running exposure; closes and batches report only what really filled"""
+
+import time
+
+import pytest
+
+import trading_engine as engine_module
+from live_data import LiveDataManager, Position, Tick
+from trading_engine import OrderSide, OrderStatus, trading_engine
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    # The global engine's demo feed is not wanted here: each test gets a fresh data manager
+    engine_module.data_manager.disconnect()
+    manager = LiveDataManager(history_size=16)
+    monkeypatch.setattr(engine_module, 'data_manager', manager)
+    monkeypatch.setattr(trading_engine, 'orders', {})
+    monkeypatch.setattr(trading_engine, 'trading_locked', False)
+    trading_engine.execution_log.clear()
+    yield trading_engine, manager
+    manager.bars.stop()
+
+
+def _quote(manager, symbol, price, half_spread=0.25):
+    manager.update_market_data_batch([Tick(symbol, price, price - half_spread, price + half_spread,
+                                           1, time.time_ns())])
+
+
+def _position_id(manager, symbol):
+    return next(pid for pid, position in manager.get_positions().items() if position.symbol == symbol)
+
+
+def test_fills_update_running_exposure(engine):
+    engine, manager = engine
+    _quote(manager, 'ES', 4500.0)
+    _quote(manager, 'NQ', 15000.0)
+    assert engine.submit_order('ES', OrderSide.BUY, 2)[0]
+    assert engine.submit_order('NQ', OrderSide.SELL, 1)[0]
+
+    exposure = manager.get_exposure()
+    assert exposure['positions'] == 2
+    assert exposure['gross_exposure'] == pytest.approx(2 * 4500.0 + 15000.0)
+    assert exposure['net_exposure'] == pytest.approx(2 * 4500.0 - 15000.0)
+    assert manager.get_symbol_exposure('ES') == pytest.approx((2.0, 9000.0, 9000.0))
+
+
+def test_partial_close_reduces_position_and_realizes_pnl(engine):
+    engine, manager = engine
+    _quote(manager, 'ES', 4500.0)
+    engine.submit_order('ES', OrderSide.BUY, 3)  # filled at the 4500.25 ask
+    position_id = _position_id(manager, 'ES')
+
+    _quote(manager, 'ES', 4510.0)
+    ok, _ = engine.submit_order('ES', OrderSide.SELL, 1, close_position_id=position_id)
+    assert ok
+    assert manager.get_position(position_id).quantity == pytest.approx(2.0)
+    exposure = manager.get_exposure()
+    assert exposure['realized_pnl'] == pytest.approx(4509.75 - 4500.25)
+    assert exposure['gross_exposure'] == pytest.approx(2 * 4510.0)
+
+
+def test_batch_legs_cannot_over_close_one_position(engine):
+    engine, manager = engine
+    _quote(manager, 'ES', 4500.0)
+    engine.submit_order('ES', OrderSide.BUY, 2)
+    position_id = _position_id(manager, 'ES')
+
+    leg = {'symbol': 'ES', 'side': OrderSide.SELL, 'quantity': 1, 'close_position_id': position_id}
+    results = engine.submit_orders([leg, leg, leg])
+    assert [ok for ok, _ in results] == [True, True, False]
+    assert "left after earlier legs" in results[2][1]
+    assert manager.get_positions() == {}
+    assert manager.get_exposure()['gross_exposure'] == 0.0
+
+
+def test_close_without_a_quote_is_reported_as_failed(engine):
+    engine, manager = engine
+    manager.add_position(Position('CL', 10, 70.0, 70.0, 0.0, manager.clock.now(), position_id='cl-1'))
+
+    ok, reason = engine.close_position('cl-1')
+    assert not ok and reason == "no market data for CL"
+    assert manager.get_position('cl-1').quantity == 10
+    assert [order.status for order in engine.orders.values()] == [OrderStatus.REJECTED]
+
+
+def test_batch_results_follow_batch_order_with_partial_risk_rejection(engine):
+    engine, manager = engine
+    _quote(manager, 'ES', 4500.0)
+    _quote(manager, 'NQ', 15000.0)
+    es = {'symbol': 'ES', 'side': OrderSide.BUY, 'quantity': 4}
+    batch = [es, {'symbol': 'XYZ', 'side': OrderSide.BUY, 'quantity': 1},
+             {'symbol': 'NQ', 'side': OrderSide.SELL, 'quantity': 1}, es, es, es, es]
+
+    results = engine.submit_orders(batch)
+    assert [ok for ok, _ in results] == [True, False, True, True, True, True, False]
+    assert "XYZ not in allowed symbols" in results[1][1]
+    # Earlier legs count against the gross limit of later ones
+    assert results[6][1] == "Order rejected by risk management: exceeds position size limit"
+    assert manager.get_exposure()['positions'] == 5
+
+    order_ids = [result for ok, result in results if ok]
+    assert len(set(order_ids)) == 5 and all(len(order_id) == 36 for order_id in order_ids)
+    assert len({order_id[:32] for order_id in order_ids}) == 1
+
+
+def test_unpriced_batch_leg_is_reported_as_failed(engine):
+    engine, manager = engine
+    _quote(manager, 'ES', 4500.0)
+    manager.add_position(Position('CL', 10, 70.0, 70.0, 0.0, manager.clock.now(), position_id='cl-1'))
+    # Closes skip the stale-quote rule, so only the missing price stops this leg
+    results = engine.submit_orders([
+        {'symbol': 'CL', 'side': OrderSide.SELL, 'quantity': 10, 'close_position_id': 'cl-1'},
+        {'symbol': 'ES', 'side': OrderSide.BUY, 'quantity': 1},
+    ])
+    assert results[0] == (False, "no market data for CL")
+    assert results[1][0] and engine.orders[results[1][1]].status == OrderStatus.FILLED
+    assert manager.get_position('cl-1').quantity == 10
+    assert sorted(position.symbol for position in manager.get_positions().values()) == ['CL', 'ES']
+
+
+def test_emergency_close_without_a_quote_keeps_the_position(engine):
+    engine, manager = engine
+    _quote(manager, 'ES', 4500.0)
+    engine.submit_order('ES', OrderSide.BUY, 1)
+    es_id = _position_id(manager, 'ES')
+    manager.add_position(Position('CL', 10, 70.0, 70.0, 0.0, manager.clock.now(), position_id='cl-1'))
+
+    assert engine.emergency_close_all() == {es_id: True, 'cl-1': False}
+    assert list(manager.get_positions()) == ['cl-1']
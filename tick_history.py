@@ -0,0 +1,116 @@
+"""
+Tick History Storage
+Bounded NumPy ring buffers holding recent per-symbol tick history
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+# Columnar layout of one stored tick (timestamp is epoch nanoseconds)
+TICK_DTYPE = np.dtype([
+    ('timestamp', 'i8'),
+    ('price', 'f8'),
+    ('bid', 'f8'),
+    ('ask', 'f8'),
+    ('volume', 'i8'),
+])
+
+TimeLike = Union[datetime, int]
+
+
+def to_epoch_ns(value: TimeLike) -> int:
+    """Convert a datetime or epoch-nanosecond integer to epoch nanoseconds"""
+    if isinstance(value, datetime):
+        return int(value.replace(microsecond=0).timestamp()) * 1_000_000_000 + value.microsecond * 1000
+    return int(value)
+
+
+class RingBuffer:
+    """Fixed-capacity ring buffer over a NumPy structured dtype.
+
+    Every record is written twice, at ``i`` and ``i + capacity``, so the most
+    recent ``n`` records are always one contiguous slice of the backing array
+    and can be returned as a view without copying.
+    """
+
+    def __init__(self, dtype: np.dtype, capacity: int):
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+        self.dtype = np.dtype(dtype)
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=self.dtype)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def total_written(self) -> int:
+        """Number of records appended since creation"""
+        return self._count
+
+    def append(self, record: tuple):
+        """Append one record (a tuple matching the dtype fields)"""
+        index = self._count % self.capacity
+        self._data[index] = record
+        self._data[index + self.capacity] = record
+        self._count += 1
+
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        """Return a zero-copy view of the newest ``n`` records, oldest first"""
+        size = len(self)
+        if n is None or n > size:
+            n = size
+        if n <= 0:
+            return self._data[:0]
+        end = (self._count - 1) % self.capacity + 1 + self.capacity
+        return self._data[end - n:end]
+
+
+class TickHistory:
+    """Per-symbol tick ring buffers with zero-copy window queries"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buffers: Dict[str, RingBuffer] = {}
+        self._lock = threading.Lock()
+
+    def _buffer_for(self, symbol: str) -> RingBuffer:
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            with self._lock:
+                buffer = self._buffers.get(symbol)
+                if buffer is None:
+                    buffer = RingBuffer(TICK_DTYPE, self.capacity)
+                    self._buffers[symbol] = buffer
+        return buffer
+
+    def append(self, symbol: str, timestamp_ns: int, price: float,
+               bid: float, ask: float, volume: int):
+        """Record one tick for a symbol"""
+        self._buffer_for(symbol).append((timestamp_ns, price, bid, ask, volume))
+
+    def symbols(self):
+        """Symbols that have recorded history"""
+        return list(self._buffers.keys())
+
+    def get_history(self, symbol: str, n: Optional[int] = None) -> np.ndarray:
+        """Newest ``n`` ticks for a symbol as a structured array view"""
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            return np.zeros(0, dtype=TICK_DTYPE)
+        return buffer.latest(n)
+
+    def get_range(self, symbol: str, start: Optional[TimeLike] = None,
+                  end: Optional[TimeLike] = None) -> np.ndarray:
+        """Ticks with ``start <= timestamp < end`` as a structured array view"""
+        window = self.get_history(symbol)
+        if len(window) == 0:
+            return window
+        timestamps = window['timestamp']
+        lo = 0 if start is None else np.searchsorted(timestamps, to_epoch_ns(start), side='left')
+        hi = len(window) if end is None else np.searchsorted(timestamps, to_epoch_ns(end), side='left')
+        return window[lo:hi]
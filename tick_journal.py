@@ -0,0 +1,225 @@
+"""
+Tick Journal
+Append-only binary record of every tick with memory-mapped NumPy reads
+"""
+
+import atexit
+import glob
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from typing import Deque, List, Optional, Sequence
+
+import numpy as np
+
+# Longest symbol a record can hold (ASCII bytes); longer symbols are rejected, never truncated
+MAX_SYMBOL_BYTES = 24
+
+# Fixed-width little-endian record; timestamp is epoch nanoseconds
+JOURNAL_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('symbol', f'S{MAX_SYMBOL_BYTES}'),
+    ('price', '<f8'),
+    ('bid', '<f8'),
+    ('ask', '<f8'),
+    ('volume', '<i8'),
+])
+
+# Segment header: magic, record size, reserved
+JOURNAL_MAGIC = b'SVTICK02'
+
+HEADER_DTYPE = np.dtype([('magic', 'S8'), ('record_size', '<u4'), ('reserved', '<u4')])
+HEADER_SIZE = HEADER_DTYPE.itemsize
+
+FSYNC_POLICIES = ('never', 'segment', 'interval', 'always')
+
+
+class TickJournal:
+    """Append-only tick journal written by a background thread.
+
+    The ingest thread only appends ticks to an in-memory deque; a writer
+    thread packs them into fixed-width records and writes them to the
+    current segment. Segments rotate when they reach ``segment_records``
+    records or the date changes. At most ``max_pending`` ticks wait in
+    memory; beyond that a slow disk costs dropped ticks (counted in
+    ``dropped``) rather than unbounded memory. Ticks whose symbol does not
+    fit a record are counted in ``rejected`` and not written.
+    ``fsync`` controls durability:
+
+    * ``never``    - leave flushing to the OS
+    * ``segment``  - fsync when a segment is closed
+    * ``interval`` - fsync at most every ``fsync_interval`` seconds
+    * ``always``   - fsync after every write
+    """
+
+    def __init__(self, directory: str, segment_records: int = 5_000_000,
+                 fsync: str = 'interval', fsync_interval: float = 1.0,
+                 flush_interval: float = 0.05, max_pending: int = 1_000_000):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
+        self.directory = directory
+        self.segment_records = segment_records
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        os.makedirs(directory, exist_ok=True)
+
+        self.records_written = 0
+        self.dropped = 0
+        self.rejected = 0
+        self._rejected_symbols = set()
+        self._last_drop_warning = 0.0
+        self._pending: Deque = deque()
+        self._file = None
+        self._segment_day: Optional[date] = None
+        self._segment_count = 0
+        self._last_fsync = time.monotonic()
+        self._wake = threading.Event()
+        self._running = True
+        self.logger = logging.getLogger(__name__)
+
+        self._thread = threading.Thread(target=self._run, name="tick-journal", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def append(self, tick):
+        """Queue one tick for writing"""
+        self.append_batch((tick,))
+
+    def append_batch(self, ticks: Sequence):
+        """Queue a batch of ticks for writing, dropping what does not fit under max_pending"""
+        room = self.max_pending - len(self._pending)
+        if room >= len(ticks):
+            self._pending.extend(ticks)
+            return
+        if room > 0:
+            self._pending.extend(ticks[:room])
+        self._dropped(len(ticks) - max(room, 0))
+
+    def _dropped(self, n: int):
+        self.dropped += n
+        now = time.monotonic()
+        if now - self._last_drop_warning >= 5.0:
+            self._last_drop_warning = now
+            self.logger.warning(f"Tick journal backlog full ({self.max_pending} ticks): "
+                                f"{self.dropped} ticks dropped so far")
+
+    def flush(self, timeout: float = 5.0):
+        """Wait until everything queued so far has been written"""
+        deadline = time.monotonic() + timeout
+        self._wake.set()
+        while self._pending and time.monotonic() < deadline:
+            time.sleep(self.flush_interval / 5)
+
+    def close(self):
+        """Write out pending ticks and close the current segment"""
+        if not self._running:
+            return
+        self._running = False
+        self._wake.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join(5.0)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self._write_pending()
+            except Exception as e:
+                self.logger.error(f"Tick journal write error: {e}")
+            if not self._running and not self._pending:
+                break
+        self._close_segment()
+
+    def _write_pending(self):
+        """Drain the queue into the current segment"""
+        while self._pending:
+            day = datetime.now().date()
+            if self._file is None or day != self._segment_day or self._segment_count >= self.segment_records:
+                self._open_segment(day)
+
+            n = min(len(self._pending), self.segment_records - self._segment_count)
+            ticks = self._checked([self._pending.popleft() for _ in range(n)])
+            n = len(ticks)
+            if not n:
+                continue
+            records = np.array(
+                [(t.timestamp_ns, t.symbol, t.price, t.bid, t.ask, t.volume) for t in ticks],
+                dtype=JOURNAL_DTYPE
+            )
+            self._file.write(records.tobytes())
+            self._file.flush()
+            self._segment_count += n
+            self.records_written += n
+
+            now = time.monotonic()
+            if self.fsync == 'always' or (
+                    self.fsync == 'interval' and now - self._last_fsync >= self.fsync_interval):
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+
+    def _checked(self, ticks: List) -> List:
+        """Ticks whose symbol fits a record; the rest are counted and logged once per symbol"""
+        fits = [t for t in ticks if len(t.symbol) <= MAX_SYMBOL_BYTES and t.symbol.isascii()]
+        if len(fits) != len(ticks):
+            for t in ticks:
+                if len(t.symbol) > MAX_SYMBOL_BYTES or not t.symbol.isascii():
+                    self.rejected += 1
+                    if t.symbol not in self._rejected_symbols:
+                        self._rejected_symbols.add(t.symbol)
+                        self.logger.error(f"Not journaling {t.symbol!r}: symbols are limited to "
+                                          f"{MAX_SYMBOL_BYTES} ASCII characters")
+        return fits
+
+    def _open_segment(self, day: date):
+        """Close the current segment and start the next one"""
+        self._close_segment()
+        index = len(segment_paths(self.directory, day))
+        path = os.path.join(self.directory, f"ticks-{day:%Y%m%d}-{index:04d}.bin")
+        self._file = open(path, 'ab')
+        header = np.array([(JOURNAL_MAGIC, JOURNAL_DTYPE.itemsize, 0)], dtype=HEADER_DTYPE)
+        self._file.write(header.tobytes())
+        self._segment_day = day
+        self._segment_count = 0
+        self.logger.info(f"Opened tick journal segment {path}")
+
+    def _close_segment(self):
+        if self._file is None:
+            return
+        self._file.flush()
+        if self.fsync != 'never':
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+
+def segment_paths(directory: str, day: Optional[date] = None) -> List[str]:
+    """Journal segment files in write order, optionally for a single day"""
+    pattern = f"ticks-{day:%Y%m%d}-*.bin" if day else "ticks-*.bin"
+    return sorted(glob.glob(os.path.join(directory, pattern)))
+
+
+def open_segment(path: str) -> np.ndarray:
+    """Memory-map a journal segment as a read-only structured array (zero-copy)"""
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) != 1 or header[0]['magic'] != JOURNAL_MAGIC:
+        raise ValueError(f"Not a tick journal segment: {path}")
+    dtype = JOURNAL_DTYPE
+    if header[0]['record_size'] != dtype.itemsize:
+        raise ValueError(f"Unsupported record size in {path}: {header[0]['record_size']}")
+
+    # Ignore a trailing partial record left by an interrupted write
+    count = (os.path.getsize(path) - HEADER_SIZE) // dtype.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=HEADER_SIZE, shape=(count,))
+
+
+def read_day(directory: str, day: date) -> List[np.ndarray]:
+    """Memory-mapped views of every segment written on a day, in order"""
+    return [open_segment(path) for path in segment_paths(directory, day)]
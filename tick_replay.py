@@ -0,0 +1,141 @@
+"""
+Tick Replay
+Drives recorded or generated ticks back through LiveDataManager at a chosen speed
+"""
+
+import logging
+import sys
+import threading
+import time
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from live_data import LiveDataManager, Tick
+from market_clock import SimulatedClock
+from market_simulator import VectorizedMarketSimulator
+from tick_journal import JOURNAL_DTYPE, open_segment, segment_paths
+
+
+class TickReplayer:
+    """Replays tick records through a data manager on a simulated clock.
+
+    ``speed`` is a multiple of real time: 1.0 replays in real time, 10.0 ten
+    times faster, and ``None`` (or 0) as fast as possible. Ticks whose
+    timestamps fall within ``batch_window`` seconds of market time are
+    published together as one snapshot, as a live feed would batch them.
+    While replaying, the data manager's clock is a SimulatedClock that
+    follows the replayed timestamps, so fills and positions are stamped with
+    market time rather than the wall clock.
+    """
+
+    def __init__(self, data_manager: LiveDataManager, chunks: Iterable[np.ndarray],
+                 speed: Optional[float] = 1.0, batch_window: float = 0.001):
+        self.data_manager = data_manager
+        self.chunks = chunks
+        self.speed = speed or None
+        self.batch_window_ns = int(batch_window * 1_000_000_000)
+        self.clock = SimulatedClock()
+
+        self.ticks_replayed = 0
+        self.batches_published = 0
+        self.max_lag = 0.0  # seconds behind schedule at worst
+        self._symbols: Dict[bytes, str] = {}
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_journal(cls, data_manager: LiveDataManager, directory: str,
+                     day: Optional[date] = None, **kwargs) -> 'TickReplayer':
+        """Replay journal segments from a directory (one day or all)"""
+        chunks = (open_segment(path) for path in segment_paths(directory, day))
+        return cls(data_manager, chunks, **kwargs)
+
+    @classmethod
+    def from_simulator(cls, data_manager: LiveDataManager, simulator: VectorizedMarketSimulator,
+                       n_steps: int, start: float, **kwargs) -> 'TickReplayer':
+        """Replay ``n_steps`` generated steps starting at epoch seconds ``start``"""
+        end = start + n_steps * simulator.step_seconds
+        ticks = simulator.generate(n_steps, start, end)
+        records = np.array(
+            [(t.timestamp_ns, t.symbol, t.price, t.bid, t.ask, t.volume) for t in ticks],
+            dtype=JOURNAL_DTYPE
+        )
+        return cls(data_manager, [records], **kwargs)
+
+    def start(self):
+        """Replay on a background thread"""
+        self._thread = threading.Thread(target=self.run, name="tick-replay", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop replaying after the current batch"""
+        self._running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(5.0)
+
+    def wait(self, timeout: Optional[float] = None):
+        """Wait for a background replay to finish"""
+        if self._thread:
+            self._thread.join(timeout)
+
+    def run(self):
+        """Replay every chunk, blocking until done or stopped"""
+        previous_clock = self.data_manager.clock
+        self.data_manager.clock = self.clock
+        self.data_manager.is_connected = True
+        self._running = True
+        wall_start = None
+        market_start = None
+
+        try:
+            for records in self.chunks:
+                timestamps = records['timestamp']
+                i = 0
+                while i < len(records) and self._running:
+                    first_ns = int(timestamps[i])
+                    end = int(np.searchsorted(timestamps, first_ns + self.batch_window_ns, side='left'))
+                    end = max(end, i + 1)
+
+                    if self.speed:
+                        if wall_start is None:
+                            wall_start, market_start = time.monotonic(), first_ns
+                        due = wall_start + (first_ns - market_start) / 1e9 / self.speed
+                        delay = due - time.monotonic()
+                        if delay > 0:
+                            time.sleep(delay)
+                        elif -delay > self.max_lag:
+                            self.max_lag = -delay
+
+                    batch = self._to_ticks(records[i:end])
+                    self.clock.set(batch[-1].timestamp_ns)
+                    self.data_manager.update_market_data_batch(batch)
+                    self.ticks_replayed += len(batch)
+                    self.batches_published += 1
+                    i = end
+
+                if not self._running:
+                    break
+        finally:
+            self._running = False
+            self.data_manager.is_connected = False
+            self.data_manager.clock = previous_clock
+            self.logger.info(f"Replay finished: {self.ticks_replayed} ticks in {self.batches_published} batches")
+
+    def _to_ticks(self, records: np.ndarray) -> List[Tick]:
+        """Convert journal records to Ticks"""
+        symbols = []
+        for raw in records['symbol'].tolist():
+            symbol = self._symbols.get(raw)
+            if symbol is None:
+                symbol = self._symbols[raw] = sys.intern(raw.decode('ascii'))
+            symbols.append(symbol)
+        return [
+            Tick(symbol, price, bid, ask, volume, timestamp_ns)
+            for symbol, timestamp_ns, price, bid, ask, volume in zip(
+                symbols, records['timestamp'].tolist(), records['price'].tolist(),
+                records['bid'].tolist(), records['ask'].tolist(), records['volume'].tolist()
+            )
+        ]
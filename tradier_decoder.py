@@ -0,0 +1,219 @@
+"""
+Tradier Stream Decoder
+Decodes Tradier quote, trade and summary events straight into Ticks
+"""
+
+import json
+import logging
+import random
+import re
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from live_data import MarketData, Tick
+
+_STR = r'"[^"]*"'
+
+logger = logging.getLogger(__name__)
+
+
+def _num(name: str) -> str:
+    """Numeric field capture; numbers arrive bare (quote bid/ask) or quoted (trades, summaries)"""
+    return r'"?(?P<' + name + r'>-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)"?'
+
+
+# Tradier emits fields in a fixed order, so one anchored regex per event type
+# extracts everything in a single pass; anything else takes the json path.
+_EVENT_RE = re.compile(
+    r'\{"type":"(?:'
+    r'quote","symbol":"(?P<q_symbol>[^"]+)","bid":' + _num('q_bid') + r',"bidsz":' + _num('q_bidsz') +
+    r',"bidexch":' + _STR + r',"biddate":"(?P<q_biddate>\d+)","ask":' + _num('q_ask') +
+    r',"asksz":' + _num('q_asksz') + r',"askexch":' + _STR + r',"askdate":"(?P<q_askdate>\d+)"'
+    r'|'
+    r'trade","symbol":"(?P<t_symbol>[^"]+)","exch":' + _STR + r',"price":' + _num('t_price') +
+    r',"size":"?(?P<t_size>\d+)"?,"cvol":' + _num('t_cvol') + r',"date":"(?P<t_date>\d+)","last":' +
+    _num('t_last') +
+    r'|'
+    r'summary","symbol":"(?P<s_symbol>[^"]+)".*?"prevClose":' + _num('s_prev_close') +
+    r')'
+)
+
+
+class _SymbolState:
+    """Latest quote, trade and previous close seen for one symbol"""
+
+    __slots__ = ('bid', 'ask', 'last', 'prev_close')
+
+    def __init__(self):
+        self.bid = self.ask = self.last = self.prev_close = None
+
+
+class TradierDecoder:
+    """Stateful decoder for newline-delimited Tradier streaming events.
+
+    Quotes update bid/ask and emit a tick priced at the last trade (or the
+    mid before any trade); trades emit a tick at the trade price with the
+    latest bid/ask; summaries only record the previous close, which drives
+    ``change`` and ``change_percent``. Call it with a list of frames, as
+    WebSocketFeed does.
+    """
+
+    def __init__(self):
+        self._state: Dict[str, _SymbolState] = {}
+        self.stats: Dict[str, int] = {'decoded': 0, 'fallbacks': 0, 'skipped': 0}
+
+    def __call__(self, frames: List[str]) -> List[Tick]:
+        batch: List[Tick] = []
+        match_event = _EVENT_RE.match
+        for frame in frames:
+            for line in frame.split('\n'):
+                if not line:
+                    continue
+                match = match_event(line)
+                if match is None:
+                    self._decode_json(line, batch)
+                    continue
+                kind = match.lastgroup
+                if kind == 'q_askdate':
+                    symbol, bid, ask, biddate, askdate = match.group(
+                        'q_symbol', 'q_bid', 'q_ask', 'q_biddate', 'q_askdate')
+                    self._on_quote(batch, symbol, float(bid), float(ask), max(int(biddate), int(askdate)))
+                elif kind == 't_last':
+                    symbol, last, size, date = match.group('t_symbol', 't_last', 't_size', 't_date')
+                    self._on_trade(batch, symbol, float(last), int(size), int(date))
+                else:
+                    self._on_summary(match.group('s_symbol'), float(match.group('s_prev_close')))
+        self.stats['decoded'] += len(batch)
+        return batch
+
+    def _decode_json(self, line: str, batch: List[Tick]):
+        """Slow path for reordered fields and other event types"""
+        line = line.strip()
+        if not line:
+            return
+        self.stats['fallbacks'] += 1
+        try:
+            message = json.loads(line)
+            event = message.get('type')
+            symbol = message.get('symbol')
+            if event == 'quote':
+                date = max(int(message.get('biddate') or 0), int(message.get('askdate') or 0))
+                self._on_quote(batch, symbol, float(message['bid']), float(message['ask']), date)
+            elif event == 'trade':
+                self._on_trade(batch, symbol, float(message.get('last') or message['price']),
+                               int(float(message.get('size') or 0)), int(message['date']))
+            elif event == 'summary' and message.get('prevClose') is not None:
+                self._on_summary(symbol, float(message['prevClose']))
+            else:
+                self.stats['skipped'] += 1
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            # e.g. "bid":null on a one-sided quote: drop this event, keep the rest of the frame
+            self.stats['skipped'] += 1
+            logger.warning(f"Skipping undecodable Tradier event {line[:80]!r}: {e}")
+
+    def _symbol_state(self, symbol: str) -> _SymbolState:
+        state = self._state.get(symbol)
+        if state is None:
+            state = self._state[symbol] = _SymbolState()
+        return state
+
+    def _on_quote(self, batch: List[Tick], symbol: str, bid: float, ask: float, date_ms: int):
+        state = self._symbol_state(symbol)
+        state.bid, state.ask = bid, ask
+        price = state.last if state.last is not None else (bid + ask) / 2
+        batch.append(self._tick(symbol, state, price, 0, date_ms))
+
+    def _on_trade(self, batch: List[Tick], symbol: str, price: float, size: int, date_ms: int):
+        state = self._symbol_state(symbol)
+        state.last = price
+        batch.append(self._tick(symbol, state, price, size, date_ms))
+
+    def _on_summary(self, symbol: str, prev_close: float):
+        self._symbol_state(symbol).prev_close = prev_close
+
+    @staticmethod
+    def _tick(symbol: str, state: _SymbolState, price: float, volume: int, date_ms: int) -> Tick:
+        change = change_percent = 0.0
+        if state.prev_close:
+            change = price - state.prev_close
+            change_percent = change / state.prev_close * 100
+        return Tick(
+            symbol, price,
+            state.bid if state.bid is not None else price,
+            state.ask if state.ask is not None else price,
+            volume, date_ms * 1_000_000 if date_ms else time.time_ns(),
+            change, change_percent
+        )
+
+
+def naive_decode(frames: List[str]) -> List[MarketData]:
+    """Baseline for benchmarking: json.loads into dicts, then MarketData"""
+    decoded = []
+    for frame in frames:
+        for line in frame.splitlines():
+            message = json.loads(line)
+            if message.get('type') == 'quote':
+                bid, ask = float(message['bid']), float(message['ask'])
+                price, volume, date = (bid + ask) / 2, 0, int(message['askdate'])
+            elif message.get('type') == 'trade':
+                price = float(message['last'])
+                bid = ask = price
+                volume, date = int(message['size']), int(message['date'])
+            else:
+                continue
+            decoded.append(MarketData(message['symbol'], price, bid, ask, volume,
+                                      datetime.fromtimestamp(date / 1000)))
+    return decoded
+
+
+def sample_frames(n_messages: int = 100_000, lines_per_frame: int = 50,
+                  symbols: Optional[List[str]] = None, seed: int = 7) -> List[str]:
+    """Synthetic Tradier stream: mostly quotes, some trades, occasional summaries"""
+    rng = random.Random(seed)
+    symbols = symbols or ['ES', 'NQ', 'YM', 'RTY', 'CL', 'GC', 'SI', 'NG', 'ZB', 'ZN', 'ZF', 'ZT']
+    date = 1_700_000_000_000
+    lines = []
+    for i in range(n_messages):
+        symbol = rng.choice(symbols)
+        price = round(rng.uniform(50, 5000), 2)
+        date += rng.randint(0, 3)
+        kind = rng.random()
+        if kind < 0.70:
+            lines.append(
+                f'{{"type":"quote","symbol":"{symbol}","bid":{price},"bidsz":{rng.randint(1, 99)},'
+                f'"bidexch":"Q","biddate":"{date}","ask":{round(price + 0.25, 2)},'
+                f'"asksz":{rng.randint(1, 99)},"askexch":"Q","askdate":"{date}"}}'
+            )
+        elif kind < 0.98:
+            lines.append(
+                f'{{"type":"trade","symbol":"{symbol}","exch":"Q","price":"{price}",'
+                f'"size":"{rng.randint(1, 50)}","cvol":"{i}","date":"{date}","last":"{price}"}}'
+            )
+        else:
+            lines.append(
+                f'{{"type":"summary","symbol":"{symbol}","open":"{price}","high":"{price}",'
+                f'"low":"{price}","prevClose":"{price}"}}'
+            )
+    return ['\n'.join(lines[i:i + lines_per_frame]) for i in range(0, len(lines), lines_per_frame)]
+
+
+def benchmark(n_messages: int = 100_000, repeat: int = 3) -> Dict[str, float]:
+    """Messages per second for the naive json path and TradierDecoder"""
+    frames = sample_frames(n_messages)
+    results = {}
+    for name, decode in (('json', naive_decode), ('tradier', None)):
+        best = float('inf')
+        for _ in range(repeat):
+            decoder = decode or TradierDecoder()
+            start = time.perf_counter()
+            decoder(frames)
+            best = min(best, time.perf_counter() - start)
+        results[name] = n_messages / best
+    results['speedup'] = results['tradier'] / results['json']
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in benchmark().items():
+        print(f"{name:>8}: {value:,.1f}" + ("x" if name == 'speedup' else " msgs/s"))
@@ -16,8 +16,14 @@ class TradingConfig:
     broker_api_key: str = ""
     broker_secret: str = ""
     data_feed_url: str = "wss://stream.tradier.com/v1/markets/events"
+    data_feed_mode: str = "simulated"  # "simulated", "live" or "replay"
+    data_feed_format: str = "tradier"  # live message format: "tradier" or "json"
+    replay_dir: str = ""  # tick journal directory to replay
+    replay_date: str = ""  # YYYYMMDD, empty replays every segment
+    replay_speed: float = 1.0  # multiple of real time, 0 for as fast as possible
     
     # Trading Parameters
+    account_equity: float = 100000.0  # base for risk_per_trade and max_daily_drawdown
     max_position_size: float = 100000.0
     risk_per_trade: float = 0.02  # 2% risk per trade
     max_daily_drawdown: float = 0.05  # 5% max daily drawdown
@@ -26,22 +32,74 @@ class TradingConfig:
     enable_ai_trading: bool = True
     agent_update_interval: float = 1.0  # seconds
     max_concurrent_positions: int = 10
+    sequencer_max_queue: int = 10000  # queued engine commands before submitters wait
     
     # Risk Management
     emergency_stop_loss: float = 0.10  # 10% emergency stop
     position_timeout: int = 86400  # 24 hours in seconds
+    stale_quote_seconds: float = 5.0  # reject orders on symbols without a newer quote (0 disables)
+    
+    # Market Data Storage
+    tick_history_size: int = 20000  # ticks kept per symbol
+    bar_history_size: int = 1000  # closed bars kept per symbol and interval
+    callback_queue_size: int = 1000  # queued ticks per data subscriber
+    callback_overflow_policy: str = "drop_oldest"  # drop_oldest, conflate or block
+    callback_latency_budget: float = 0.05  # seconds per callback before flagged slow
+    latency_tracking: bool = True  # record feed latency histograms
+    stats_ewma_lambda: float = 0.94  # per-tick decay for EWMA volatility
+    session_reset_hour_utc: int = 22  # hour (UTC) running symbol stats reset
+    journal_dir: str = ""  # tick journal directory (empty disables journaling)
+    journal_segment_records: int = 5_000_000  # ticks per journal segment file
+    journal_fsync: str = "interval"  # never, segment, interval or always
+    journal_fsync_interval: float = 1.0  # seconds between fsyncs for "interval"
+    journal_max_pending: int = 1_000_000  # ticks buffered for the writer before dropping
+    
+    # Feed Sharding (DATA_FEED_MODE=live)
+    feed_shards: int = 1  # websocket connections to split symbols across
+    feed_shard_mode: str = "thread"  # thread or process
+    feed_shard_map: str = ""  # explicit assignments, e.g. "ES:0,NQ:1"
+    
+    # Shared Market Data (one feed owner, many dashboard readers)
+    data_plane_role: str = "standalone"  # standalone, owner or reader
+    data_plane_name: str = "shiventure_market"  # shared memory segment name
+    data_plane_poll_interval: float = 0.1  # seconds between reader polls
+    data_plane_max_symbols: int = 256
+    data_plane_max_positions: int = 4096
+    
+    # Market Simulator
+    simulator_tick_rate: float = 120.0  # ticks per second across all symbols
+    simulator_seed: Optional[int] = None  # fixed seed for deterministic runs
     
     # Supported Instruments
     allowed_symbols: List[str] = None
+    symbol_groups: Dict[str, List[str]] = None
     
     def __post_init__(self):
+        if self.symbol_groups is None:
+            self.symbol_groups = {
+                'index_futures': ['ES', 'NQ', 'YM', 'RTY'],
+                'commodities': ['CL', 'NG', 'GC', 'SI'],
+                'treasury_futures': ['ZN', 'ZB', 'ZF', 'ZT'],
+                # Subscription group only: not tradable or fed until added to allowed_symbols
+                'fx_futures': ['6E', '6J', '6B', '6A'],
+            }
         if self.allowed_symbols is None:
+            # The tradable universe is explicit, never derived from subscription groups
             self.allowed_symbols = [
                 'ES', 'NQ', 'YM', 'RTY',  # Index futures
                 'CL', 'NG', 'GC', 'SI',   # Commodities
                 'ZN', 'ZB', 'ZF', 'ZT'    # Treasury futures
             ]
     
+    def expand_symbols(self, selectors: List[str]) -> Optional[List[str]]:
+        """Expand symbols and group names into symbols; None means all symbols ('*')"""
+        symbols = []
+        for selector in selectors:
+            if selector == '*':
+                return None
+            symbols.extend(self.symbol_groups.get(selector, [selector]))
+        return symbols
+    
     @classmethod
     def load_from_env(cls) -> 'TradingConfig':
         """Load configuration from environment variables"""
@@ -49,12 +107,43 @@ class TradingConfig:
             broker_api_key=os.getenv('BROKER_API_KEY', ''),
             broker_secret=os.getenv('BROKER_SECRET', ''),
             data_feed_url=os.getenv('DATA_FEED_URL', 'wss://stream.tradier.com/v1/markets/events'),
+            data_feed_mode=os.getenv('DATA_FEED_MODE', 'simulated').lower(),
+            data_feed_format=os.getenv('DATA_FEED_FORMAT', 'tradier').lower(),
+            replay_dir=os.getenv('REPLAY_DIR', ''),
+            replay_date=os.getenv('REPLAY_DATE', ''),
+            replay_speed=float(os.getenv('REPLAY_SPEED', '1.0')),
+            account_equity=float(os.getenv('ACCOUNT_EQUITY', '100000.0')),
             max_position_size=float(os.getenv('MAX_POSITION_SIZE', '100000.0')),
             risk_per_trade=float(os.getenv('RISK_PER_TRADE', '0.02')),
             max_daily_drawdown=float(os.getenv('MAX_DAILY_DRAWDOWN', '0.05')),
             enable_ai_trading=os.getenv('ENABLE_AI_TRADING', 'True').lower() == 'true',
             agent_update_interval=float(os.getenv('AGENT_UPDATE_INTERVAL', '1.0')),
-            max_concurrent_positions=int(os.getenv('MAX_CONCURRENT_POSITIONS', '10'))
+            max_concurrent_positions=int(os.getenv('MAX_CONCURRENT_POSITIONS', '10')),
+            sequencer_max_queue=int(os.getenv('SEQUENCER_MAX_QUEUE', '10000')),
+            stale_quote_seconds=float(os.getenv('STALE_QUOTE_SECONDS', '5.0')),
+            tick_history_size=int(os.getenv('TICK_HISTORY_SIZE', '20000')),
+            bar_history_size=int(os.getenv('BAR_HISTORY_SIZE', '1000')),
+            callback_queue_size=int(os.getenv('CALLBACK_QUEUE_SIZE', '1000')),
+            callback_overflow_policy=os.getenv('CALLBACK_OVERFLOW_POLICY', 'drop_oldest').lower(),
+            callback_latency_budget=float(os.getenv('CALLBACK_LATENCY_BUDGET', '0.05')),
+            latency_tracking=os.getenv('LATENCY_TRACKING', 'True').lower() == 'true',
+            stats_ewma_lambda=float(os.getenv('STATS_EWMA_LAMBDA', '0.94')),
+            session_reset_hour_utc=int(os.getenv('SESSION_RESET_HOUR_UTC', '22')),
+            journal_dir=os.getenv('JOURNAL_DIR', ''),
+            journal_segment_records=int(os.getenv('JOURNAL_SEGMENT_RECORDS', '5000000')),
+            journal_fsync=os.getenv('JOURNAL_FSYNC', 'interval').lower(),
+            journal_fsync_interval=float(os.getenv('JOURNAL_FSYNC_INTERVAL', '1.0')),
+            journal_max_pending=int(os.getenv('JOURNAL_MAX_PENDING', '1000000')),
+            feed_shards=int(os.getenv('FEED_SHARDS', '1')),
+            feed_shard_mode=os.getenv('FEED_SHARD_MODE', 'thread').lower(),
+            feed_shard_map=os.getenv('FEED_SHARD_MAP', ''),
+            data_plane_role=os.getenv('DATA_PLANE_ROLE', 'standalone').lower(),
+            data_plane_name=os.getenv('DATA_PLANE_NAME', 'shiventure_market'),
+            data_plane_poll_interval=float(os.getenv('DATA_PLANE_POLL_INTERVAL', '0.1')),
+            data_plane_max_symbols=int(os.getenv('DATA_PLANE_MAX_SYMBOLS', '256')),
+            data_plane_max_positions=int(os.getenv('DATA_PLANE_MAX_POSITIONS', '4096')),
+            simulator_tick_rate=float(os.getenv('SIMULATOR_TICK_RATE', '120.0')),
+            simulator_seed=int(os.getenv('SIMULATOR_SEED')) if os.getenv('SIMULATOR_SEED') else None
         )
     
     def to_dict(self) -> Dict:
@@ -63,15 +152,47 @@ class TradingConfig:
             'broker_api_key': '***' if self.broker_api_key else '',
             'broker_secret': '***' if self.broker_secret else '',
             'data_feed_url': self.data_feed_url,
+            'data_feed_mode': self.data_feed_mode,
+            'data_feed_format': self.data_feed_format,
+            'replay_dir': self.replay_dir,
+            'replay_date': self.replay_date,
+            'replay_speed': self.replay_speed,
+            'account_equity': self.account_equity,
             'max_position_size': self.max_position_size,
             'risk_per_trade': self.risk_per_trade,
             'max_daily_drawdown': self.max_daily_drawdown,
             'enable_ai_trading': self.enable_ai_trading,
             'agent_update_interval': self.agent_update_interval,
             'max_concurrent_positions': self.max_concurrent_positions,
+            'sequencer_max_queue': self.sequencer_max_queue,
             'emergency_stop_loss': self.emergency_stop_loss,
             'position_timeout': self.position_timeout,
-            'allowed_symbols': self.allowed_symbols
+            'stale_quote_seconds': self.stale_quote_seconds,
+            'tick_history_size': self.tick_history_size,
+            'bar_history_size': self.bar_history_size,
+            'callback_queue_size': self.callback_queue_size,
+            'callback_overflow_policy': self.callback_overflow_policy,
+            'callback_latency_budget': self.callback_latency_budget,
+            'latency_tracking': self.latency_tracking,
+            'stats_ewma_lambda': self.stats_ewma_lambda,
+            'session_reset_hour_utc': self.session_reset_hour_utc,
+            'journal_dir': self.journal_dir,
+            'journal_segment_records': self.journal_segment_records,
+            'journal_fsync': self.journal_fsync,
+            'journal_fsync_interval': self.journal_fsync_interval,
+            'journal_max_pending': self.journal_max_pending,
+            'feed_shards': self.feed_shards,
+            'feed_shard_mode': self.feed_shard_mode,
+            'feed_shard_map': self.feed_shard_map,
+            'data_plane_role': self.data_plane_role,
+            'data_plane_name': self.data_plane_name,
+            'data_plane_poll_interval': self.data_plane_poll_interval,
+            'data_plane_max_symbols': self.data_plane_max_symbols,
+            'data_plane_max_positions': self.data_plane_max_positions,
+            'simulator_tick_rate': self.simulator_tick_rate,
+            'simulator_seed': self.simulator_seed,
+            'allowed_symbols': self.allowed_symbols,
+            'symbol_groups': self.symbol_groups
         }
 
 # Global configuration instance
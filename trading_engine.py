@@ -3,16 +3,26 @@ AI Trading Engine
 Handles order execution, position management, and AI agent coordination
 """
 
+import itertools
 import uuid
+from concurrent.futures import Future
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import logging
 import asyncio
-from live_data import data_manager, Position, MarketData
+import threading
+from callback_dispatch import OverflowPolicy
+from live_data import data_manager, Position, MarketData, Tick
+from order_matching import LimitOrderMatcher, StopTriggerIndex, TickRange
+from risk_rules import RiskPipeline
+from sequencer import Sequencer
 from trading_config import CONFIG
 
+READ_ONLY_REASON = "Read-only dashboard process: orders and controls belong to the feed owner"
+TRADING_LOCKED_REASON = "Trading lock is active: only closing orders are accepted"
+
 class OrderType(Enum):
     MARKET = "market"
     LIMIT = "limit"
@@ -25,6 +35,7 @@ class OrderSide(Enum):
 
 class OrderStatus(Enum):
     PENDING = "pending"
+    PARTIALLY_FILLED = "partially_filled"
     FILLED = "filled"
     CANCELLED = "cancelled"
     REJECTED = "rejected"
@@ -42,8 +53,10 @@ class Order:
     status: OrderStatus = OrderStatus.PENDING
     created_time: datetime = None
     filled_time: Optional[datetime] = None
-    filled_price: Optional[float] = None
+    filled_price: Optional[float] = None  # average over all fills
+    filled_quantity: float = 0.0
     agent_id: Optional[str] = None  # Which AI agent created this order
+    close_position_id: Optional[str] = None  # Position each fill of this order reduces, if any
     
     def __post_init__(self):
         if self.created_time is None:
@@ -51,19 +64,55 @@ class Order:
         if self.order_id is None:
             self.order_id = str(uuid.uuid4())
 
+_BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+# 32 hex batch id + "-" + 3 base-36 digits fits the 36-char id of a uuid4
+_BATCH_LEGS = 36 ** 3
+
+def _batch_order_ids():
+    """Order ids for one batch: a uuid4 hex per 46,656 legs plus the leg in base 36"""
+    for leg in itertools.count():
+        index = leg % _BATCH_LEGS
+        if index == 0:
+            batch_id = uuid.uuid4().hex
+        yield (f"{batch_id}-{_BASE36[index // 1296]}{_BASE36[index // 36 % 36]}"
+               f"{_BASE36[index % 36]}")
+
 class TradingEngine:
     """Core trading engine with AI agent integration"""
     
+    # Symbols each agent listens to; portfolio-wide agents take every symbol explicitly
+    AGENT_SYMBOL_GROUPS = {
+        'master_risk_controller': ['*'],
+        'strategic_allocator': ['*'],
+        'performance_monitor': ['*'],
+        'equity_agent': ['index_futures'],
+        'fixed_income_agent': ['treasury_futures'],
+        'fx_agent': ['fx_futures'],
+    }
+    
     def __init__(self):
         self.orders: Dict[str, Order] = {}
         self.execution_log: List[Dict] = []
         self.risk_checks_enabled = True
+        self.trading_locked = False
         self.ai_agents_active = CONFIG.enable_ai_trading
+        self.matcher = LimitOrderMatcher()
+        self.stops = StopTriggerIndex()
+        self.risk = RiskPipeline.from_config(CONFIG)
+        # Every change to orders, fills and agent state runs on this one thread
+        self.sequencer = Sequencer("order-sequencer", CONFIG.sequencer_max_queue)
+        # Ticks waiting for the sequencer, folded into one range per symbol
+        self._pending_ticks: Dict[str, TickRange] = {}
+        self._pending_lock = threading.Lock()
         
         # Setup logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         
+        # Stops are triggered and resting limit orders matched on every tick; a dropped
+        # tick could be the one that crossed a stop or limit, so the feed waits instead
+        data_manager.add_data_callback(self._on_tick, name="order_matching", policy=OverflowPolicy.BLOCK)
+        
         # Connect to data feed
         data_manager.connect_to_feed(
             CONFIG.data_feed_url, 
@@ -80,11 +129,96 @@ class TradingEngine:
             'fx_agent': {'active': True, 'last_update': datetime.now()},
         }
     
+    # Commands: each runs on the sequencer thread. The *_async variants
+    # return a Future; the plain methods wait for it (inline when already
+    # on the sequencer thread).
+    
     def submit_order(self, symbol: str, side: OrderSide, quantity: float, 
                     order_type: OrderType = OrderType.MARKET, 
                     price: Optional[float] = None,
-                    agent_id: Optional[str] = None) -> Tuple[bool, str]:
-        """Submit a trading order"""
+                    agent_id: Optional[str] = None,
+                    stop_price: Optional[float] = None,
+                    close_position_id: Optional[str] = None) -> Tuple[bool, str]:
+        """Submit a trading order (each fill reduces ``close_position_id``, if given)"""
+        return self.sequencer.call(self._submit_order, symbol, side, quantity, order_type,
+                                   price, agent_id, stop_price, close_position_id)
+    
+    def submit_order_async(self, *args, **kwargs) -> Future:
+        """Queue submit_order; the Future resolves to (success, order id or reason)"""
+        return self.sequencer.submit(self._submit_order, *args, **kwargs)
+    
+    def submit_orders(self, batch: List[Dict]) -> List[Tuple[bool, str]]:
+        """Submit many orders in one pass (see _submit_orders)"""
+        return self.sequencer.call(self._submit_orders, batch)
+    
+    def submit_orders_async(self, batch: List[Dict]) -> Future:
+        return self.sequencer.submit(self._submit_orders, batch)
+    
+    def cancel_order(self, order_id: str) -> Tuple[bool, str]:
+        """Cancel a working order (its unfilled remainder if partially filled)"""
+        return self.sequencer.call(self._cancel_order, order_id)
+    
+    def cancel_order_async(self, order_id: str) -> Future:
+        return self.sequencer.submit(self._cancel_order, order_id)
+    
+    def close_position(self, position_id: str, agent_id: Optional[str] = None) -> Tuple[bool, str]:
+        """Close an existing position"""
+        return self.sequencer.call(self._close_position, position_id, agent_id)
+    
+    def close_position_async(self, position_id: str, agent_id: Optional[str] = None) -> Future:
+        return self.sequencer.submit(self._close_position, position_id, agent_id)
+    
+    @property
+    def read_only(self) -> bool:
+        """True in dashboard reader processes, which cannot trade or change controls"""
+        return CONFIG.data_plane_role == "reader"
+    
+    def emergency_close_all(self) -> Dict[str, bool]:
+        """Emergency close all positions (RuntimeError in a read-only process)"""
+        return self.sequencer.call(self._emergency_close_all)
+    
+    def emergency_close_all_async(self) -> Future:
+        return self.sequencer.submit(self._emergency_close_all)
+    
+    def enable_trading_lock(self):
+        """Enable trading lock - reject new positions, still accept closing orders"""
+        self.sequencer.call(self._set_trading_lock, True)
+    
+    def disable_trading_lock(self):
+        """Disable trading lock - allow new positions"""
+        self.sequencer.call(self._set_trading_lock, False)
+    
+    def update_agent_status(self, agent_id: str, active: bool):
+        """Update AI agent status"""
+        self.sequencer.call(self._update_agent_status, agent_id, active)
+    
+    def update_agent_status_async(self, agent_id: str, active: bool) -> Future:
+        return self.sequencer.submit(self._update_agent_status, agent_id, active)
+    
+    def get_sequencer_stats(self) -> Dict[str, Dict[str, float]]:
+        """Command count, queue depth and queue wait/latency percentiles"""
+        return self.sequencer.stats()
+    
+    def _submit_order(self, symbol: str, side: OrderSide, quantity: float,
+                      order_type: OrderType = OrderType.MARKET,
+                      price: Optional[float] = None,
+                      agent_id: Optional[str] = None,
+                      stop_price: Optional[float] = None,
+                      close_position_id: Optional[str] = None) -> Tuple[bool, str]:
+        
+        if self.read_only:
+            # Dashboard readers mirror the feed owner's book and cannot change it
+            return False, READ_ONLY_REASON
+        
+        error = self._validate_prices(order_type, price, stop_price)
+        if error:
+            return False, error
+        if close_position_id:
+            error = self._validate_close(symbol, side, quantity, close_position_id)
+            if error:
+                return False, error
+        elif self.trading_locked:
+            return False, TRADING_LOCKED_REASON
         
         try:
             # Create order
@@ -95,12 +229,16 @@ class TradingEngine:
                 quantity=quantity,
                 order_type=order_type,
                 price=price,
-                agent_id=agent_id
+                stop_price=stop_price,
+                created_time=data_manager.clock.now(),
+                agent_id=agent_id,
+                close_position_id=close_position_id
             )
             
             # Risk checks
-            if not self._risk_check(order):
-                return False, "Order rejected by risk management"
+            reason = self._risk_check(order)
+            if reason:
+                return False, f"Order rejected by risk management: {reason}"
             
             # Store order
             self.orders[order.order_id] = order
@@ -108,6 +246,12 @@ class TradingEngine:
             # Execute order (simulate immediate fill for demo)
             if order_type == OrderType.MARKET:
                 self._fill_market_order(order)
+                if order.status == OrderStatus.REJECTED:
+                    return False, f"no market data for {symbol}"
+            elif order_type == OrderType.LIMIT:
+                self._work_limit_order(order)
+            else:
+                self._arm_stop(order)
             
             self.logger.info(f"Order submitted: {order.symbol} {order.side.value} {order.quantity}")
             return True, order.order_id
@@ -116,33 +260,143 @@ class TradingEngine:
             self.logger.error(f"Order submission failed: {e}")
             return False, str(e)
     
-    def _risk_check(self, order: Order) -> bool:
-        """Perform risk checks on order"""
-        if not self.risk_checks_enabled:
-            return True
-            
-        # Check position size limits
-        current_positions = data_manager.get_positions()
-        total_exposure = sum(abs(pos.quantity * pos.current_price) 
-                           for pos in current_positions.values())
+    def _submit_orders(self, batch: List[Dict]) -> List[Tuple[bool, str]]:
+        """Submit many orders with one market read, one risk pass and one fill pass.
         
-        order_value = order.quantity * self._get_current_price(order.symbol, order.side)
+        Each entry holds submit_order's keyword arguments. Risk limits apply
+        to the batch as a whole: every accepted order counts against the
+        exposure and position limits of the orders after it. Returns
+        (success, order id or reason) per entry, in batch order.
+        """
+        if self.read_only:
+            return [(False, READ_ONLY_REASON)] * len(batch)
         
-        if total_exposure + abs(order_value) > CONFIG.max_position_size:
-            self.logger.warning(f"Order rejected: exceeds position size limit")
-            return False
+        market = data_manager.get_snapshot().data
+        created_time = data_manager.clock.now()
+        order_ids = _batch_order_ids()
+        results: List[Optional[Tuple[bool, str]]] = [None] * len(batch)
+        candidates: List[Tuple[int, Order, float]] = []
+        # Quantity earlier legs already close, so legs for one position cannot over-close it
+        closing: Dict[str, float] = {}
         
-        # Check symbol allowlist
-        if order.symbol not in CONFIG.allowed_symbols:
-            self.logger.warning(f"Order rejected: {order.symbol} not in allowed symbols")
-            return False
+        for index, request in enumerate(batch):
+            order_type = request.get('order_type', OrderType.MARKET)
+            if order_type is not OrderType.MARKET:
+                error = self._validate_prices(order_type, request.get('price'), request.get('stop_price'))
+                if error:
+                    results[index] = (False, error)
+                    continue
+            position_id = request.get('close_position_id')
+            if position_id:
+                error = self._validate_close(request['symbol'], request['side'], request['quantity'],
+                                             position_id, closing.get(position_id, 0.0))
+                if error:
+                    results[index] = (False, error)
+                    continue
+                closing[position_id] = closing.get(position_id, 0.0) + request['quantity']
+            elif self.trading_locked:
+                results[index] = (False, TRADING_LOCKED_REASON)
+                continue
+            order = Order(
+                order_id=next(order_ids),
+                symbol=request['symbol'],
+                side=request['side'],
+                quantity=request['quantity'],
+                order_type=order_type,
+                price=request.get('price'),
+                stop_price=request.get('stop_price'),
+                created_time=created_time,
+                agent_id=request.get('agent_id'),
+                close_position_id=request.get('close_position_id')
+            )
+            quote = market.get(order.symbol)
+            price = (quote.ask if order.side == OrderSide.BUY else quote.bid) if quote else 0.0
+            candidates.append((index, order, price))
         
-        # Check maximum concurrent positions
-        if len(current_positions) >= CONFIG.max_concurrent_positions:
-            self.logger.warning(f"Order rejected: maximum concurrent positions reached")
-            return False
-            
-        return True
+        if self.risk_checks_enabled:
+            reasons = self.risk.check_batch([(order, price) for _, order, price in candidates], data_manager)
+        else:
+            reasons = [None] * len(candidates)
+        
+        opened: List[Position] = []
+        closed: List[Tuple[str, float, float]] = []
+        rejected = unpriced = 0
+        for (index, order, price), reason in zip(candidates, reasons):
+            if reason:
+                rejected += 1
+                results[index] = (False, f"Order rejected by risk management: {reason}")
+                continue
+            self.orders[order.order_id] = order
+            if order.order_type != OrderType.MARKET:
+                if order.order_type == OrderType.LIMIT:
+                    self._work_limit_order(order)
+                else:
+                    self._arm_stop(order)
+            elif price > 0:
+                position = self._apply_fill(order, order.quantity, price, order.order_id, created_time)
+                if position is None:
+                    closed.append((order.close_position_id, price, order.quantity))
+                else:
+                    opened.append(position)
+            else:
+                order.status = OrderStatus.REJECTED
+                unpriced += 1
+                results[index] = (False, f"no market data for {order.symbol}")
+                continue
+            results[index] = (True, order.order_id)
+        
+        data_manager.apply_fills(opened, closed)
+        accepted = len(candidates) - rejected - unpriced
+        self.logger.info(f"Batch submitted: {accepted}/{len(batch)} orders accepted, "
+                         f"{len(opened)} opened, {len(closed)} closed, {unpriced} without market data")
+        if rejected:
+            self.logger.warning(f"Batch: {rejected} orders rejected by risk management")
+        return results
+    
+    @staticmethod
+    def _validate_prices(order_type: OrderType, price: Optional[float],
+                         stop_price: Optional[float]) -> Optional[str]:
+        if order_type in (OrderType.LIMIT, OrderType.STOP_LIMIT) and not (price and price > 0):
+            return "Limit orders require a positive price"
+        if order_type in (OrderType.STOP, OrderType.STOP_LIMIT) and not (stop_price and stop_price > 0):
+            return "Stop orders require a positive stop price"
+        return None
+    
+    @staticmethod
+    def _validate_close(symbol: str, side: OrderSide, quantity: float,
+                        position_id: str, already_closing: float = 0.0) -> Optional[str]:
+        """A closing order must offset its position: same symbol, opposite side, no more than its size.
+        
+        ``already_closing`` is the quantity earlier legs of the same batch close.
+        """
+        position = data_manager.get_position(position_id)
+        if position is None:
+            return f"Position not found: {position_id}"
+        if position.symbol != symbol:
+            return f"Position {position_id} is in {position.symbol}, not {symbol}"
+        closing_side = OrderSide.SELL if position.quantity > 0 else OrderSide.BUY
+        if side != closing_side:
+            return f"Closing this position requires a {closing_side.value} order"
+        if not 0 < quantity <= abs(position.quantity) - already_closing + 1e-9:
+            if already_closing:
+                return (f"Closing quantity must be positive and at most the "
+                        f"{abs(position.quantity) - already_closing} left after earlier legs of this batch")
+            return f"Closing quantity must be positive and at most the position size {abs(position.quantity)}"
+        return None
+    
+    def _risk_check(self, order: Order) -> Optional[str]:
+        """Run the risk rule chain; None if the order passes, else the rejection reason"""
+        if not self.risk_checks_enabled:
+            return None
+        
+        reason = self.risk.check(order, self._get_current_price(order.symbol, order.side), data_manager)
+        if reason:
+            self.logger.warning(f"Order rejected: {reason}")
+        return reason
+    
+    def get_risk_stats(self) -> Dict[str, Dict[str, float]]:
+        """Checks, rejects and latency per risk rule, in the order they run"""
+        return self.risk.stats()
     
     def _get_current_price(self, symbol: str, side: OrderSide) -> float:
         """Get current market price for order"""
@@ -156,46 +410,142 @@ class TradingEngine:
         fill_price = self._get_current_price(order.symbol, order.side)
         
         if fill_price > 0:
-            order.status = OrderStatus.FILLED
-            order.filled_time = datetime.now()
-            order.filled_price = fill_price
-            
-            # Create position
-            position_id = str(uuid.uuid4())
-            position = Position(
-                symbol=order.symbol,
-                quantity=order.quantity if order.side == OrderSide.BUY else -order.quantity,
-                entry_price=fill_price,
-                current_price=fill_price,
-                unrealized_pnl=0.0,
-                entry_time=datetime.now(),
-                position_id=position_id
-            )
-            
-            data_manager.add_position(position)
-            
-            # Log execution
-            self._log_execution(order, position)
+            self._record_fill(order, order.quantity, fill_price)
         else:
             order.status = OrderStatus.REJECTED
             self.logger.error(f"Order rejected: no market data for {order.symbol}")
     
-    def _log_execution(self, order: Order, position: Position):
+    def _work_limit_order(self, order: Order):
+        """Rest a limit order, filling at once whatever the current quote crosses"""
+        self.matcher.add(order.order_id, order.symbol, order.side == OrderSide.BUY,
+                         order.price, order.quantity)
+        market_data = data_manager.get_market_data(order.symbol)
+        if market_data:
+            # Treat the standing quote as a quote-only tick: it has no fresh volume
+            for order_id, quantity, price in self.matcher.match(
+                    order.symbol, market_data.bid, market_data.ask, market_data.price, 0):
+                self._record_fill(self.orders[order_id], quantity, price)
+    
+    def _arm_stop(self, order: Order):
+        """Add a stop to the trigger index, activating it at once if the market is already through it"""
+        self.stops.add(order.order_id, order.symbol, order.side == OrderSide.BUY, order.stop_price)
+        market_data = data_manager.get_market_data(order.symbol)
+        if market_data:
+            self._trigger_stops(order.symbol, market_data.price)
+    
+    def _trigger_stops(self, symbol: str, price: float):
+        """Send every stop crossed by a trade at price to market or limit handling"""
+        for order_id in self.stops.trigger(symbol, price):
+            order = self.orders[order_id]
+            self.logger.info(f"Stop triggered: {order.symbol} {order.side.value} "
+                             f"{order.quantity} @ {order.stop_price} (last {price})")
+            if order.order_type == OrderType.STOP:
+                self._fill_market_order(order)
+            else:
+                self._work_limit_order(order)
+    
+    def _on_tick(self, tick: Tick):
+        """Hand ticks to the sequencer so fills are ordered with other commands.
+        
+        Ticks that arrive while their symbol already waits for the sequencer
+        are folded into its pending range, so each symbol has at most one
+        matching command queued and a burst cannot starve other commands.
+        """
+        with self._pending_lock:
+            pending = self._pending_ticks.get(tick.symbol)
+            if pending is not None:
+                pending.merge(tick.price, tick.bid, tick.ask, tick.volume)
+                return
+            self._pending_ticks[tick.symbol] = TickRange(tick.symbol, tick.price, tick.bid,
+                                                         tick.ask, tick.volume)
+        self.sequencer.post(self._process_ticks, tick.symbol)
+    
+    def _process_ticks(self, symbol: str):
+        """Roll risk sessions, trigger stops across the pending range, then match resting limit orders against it"""
+        with self._pending_lock:
+            ticks = self._pending_ticks.pop(symbol)
+        self.risk.on_tick(data_manager)
+        self._trigger_stops(symbol, ticks.high)
+        if ticks.low != ticks.high:
+            self._trigger_stops(symbol, ticks.low)
+        for order_id, quantity, price in self.matcher.match_range(ticks):
+            self._record_fill(self.orders[order_id], quantity, price)
+    
+    def _record_fill(self, order: Order, quantity: float, fill_price: float):
+        """Apply a (possibly partial) fill: update the order and open (or close) a position"""
+        position = self._apply_fill(order, quantity, fill_price)
+        if position is None:
+            data_manager.close_position(order.close_position_id, fill_price, quantity)
+        else:
+            data_manager.add_position(position)
+    
+    def _apply_fill(self, order: Order, quantity: float, fill_price: float,
+                    position_id: Optional[str] = None,
+                    filled_time: Optional[datetime] = None) -> Optional[Position]:
+        """Update the order and execution log for a fill; returns the position to open (None when closing)"""
+        filled = order.filled_quantity + quantity
+        order.filled_price = ((order.filled_price or 0.0) * order.filled_quantity
+                              + fill_price * quantity) / filled
+        order.filled_quantity = filled
+        if order.status != OrderStatus.CANCELLED:
+            order.status = (OrderStatus.FILLED if filled >= order.quantity - 1e-9
+                            else OrderStatus.PARTIALLY_FILLED)
+        order.filled_time = filled_time or data_manager.clock.now()
+        
+        if order.close_position_id:
+            self._log_execution(order, order.close_position_id, quantity, fill_price)
+            return None
+        
+        # Create position
+        position_id = position_id or str(uuid.uuid4())
+        position = Position(
+            symbol=order.symbol,
+            quantity=quantity if order.side == OrderSide.BUY else -quantity,
+            entry_price=fill_price,
+            current_price=fill_price,
+            unrealized_pnl=0.0,
+            entry_time=order.filled_time,
+            position_id=position_id
+        )
+        
+        # Log execution
+        self._log_execution(order, position_id, quantity, fill_price)
+        return position
+    
+    def _cancel_order(self, order_id: str) -> Tuple[bool, str]:
+        order = self.orders.get(order_id)
+        if order is None:
+            return False, "Order not found"
+        if order.status not in (OrderStatus.PENDING, OrderStatus.PARTIALLY_FILLED):
+            return False, f"Order is {order.status.value}"
+        
+        self.stops.cancel(order_id)
+        self.matcher.cancel(order_id)
+        order.status = OrderStatus.CANCELLED
+        remaining = order.quantity - order.filled_quantity
+        self.logger.info(f"Order cancelled: {order.symbol} {order.side.value} {remaining} unfilled")
+        return True, "Order cancelled"
+    
+    def get_working_orders(self, symbol: Optional[str] = None) -> List[Order]:
+        """Orders still working: resting limits and untriggered stops"""
+        order_ids = self.matcher.working_orders(symbol) + self.stops.working_orders(symbol)
+        return [self.orders[order_id] for order_id in order_ids]
+    
+    def _log_execution(self, order: Order, position_id: str, quantity: float, fill_price: float):
         """Log order execution"""
         execution_record = {
-            'timestamp': datetime.now(),
+            'timestamp': order.filled_time,
             'order_id': order.order_id,
             'symbol': order.symbol,
             'side': order.side.value,
-            'quantity': order.quantity,
-            'fill_price': order.filled_price,
-            'position_id': position.position_id,
+            'quantity': quantity,
+            'fill_price': fill_price,
+            'position_id': position_id,
             'agent_id': order.agent_id
         }
         self.execution_log.append(execution_record)
     
-    def close_position(self, position_id: str, agent_id: Optional[str] = None) -> Tuple[bool, str]:
-        """Close an existing position"""
+    def _close_position(self, position_id: str, agent_id: Optional[str] = None) -> Tuple[bool, str]:
         positions = data_manager.get_positions()
         
         if position_id not in positions:
@@ -203,56 +553,62 @@ class TradingEngine:
         
         position = positions[position_id]
         
-        # Create closing order
+        # Create closing order; its fill removes the position and realizes P&L
         side = OrderSide.SELL if position.quantity > 0 else OrderSide.BUY
-        success, result = self.submit_order(
+        success, result = self._submit_order(
             symbol=position.symbol,
             side=side,
             quantity=abs(position.quantity),
-            agent_id=agent_id
+            agent_id=agent_id,
+            close_position_id=position_id
         )
         
         if success:
-            data_manager.close_position(position_id)
             self.logger.info(f"Position closed: {position.symbol}")
             return True, "Position closed successfully"
         
         return False, result
     
-    def emergency_close_all(self) -> Dict[str, bool]:
-        """Emergency close all positions"""
+    def _emergency_close_all(self) -> Dict[str, bool]:
+        if self.read_only:
+            # A reader only mirrors the owner's book; claiming success here would be a lie
+            raise RuntimeError(READ_ONLY_REASON)
         self.logger.warning("EMERGENCY: Closing all positions")
         
         positions = data_manager.get_positions()
-        results = {}
+        results = self._submit_orders([
+            {
+                'symbol': position.symbol,
+                'side': OrderSide.SELL if position.quantity > 0 else OrderSide.BUY,
+                'quantity': abs(position.quantity),
+                'agent_id': "emergency_system",
+                'close_position_id': position_id
+            }
+            for position_id, position in positions.items()
+        ])
         
-        for position_id, position in positions.items():
-            success, msg = self.close_position(position_id, agent_id="emergency_system")
-            results[position_id] = success
-            
-        return results
-    
-    def enable_trading_lock(self):
-        """Enable trading lock - prevent new positions"""
-        self.risk_checks_enabled = False
-        self.logger.warning("TRADING LOCK ENABLED: No new positions allowed")
+        return {position_id: success for position_id, (success, _) in zip(positions, results)}
     
-    def disable_trading_lock(self):
-        """Disable trading lock - allow new positions"""
-        self.risk_checks_enabled = True
-        self.logger.info("Trading lock disabled")
+    def _set_trading_lock(self, locked: bool):
+        if self.read_only:
+            raise RuntimeError(READ_ONLY_REASON)
+        self.trading_locked = locked
+        if locked:
+            self.logger.warning("TRADING LOCK ENABLED: No new positions allowed")
+        else:
+            self.logger.info("Trading lock disabled")
     
     def get_portfolio_summary(self) -> Dict:
         """Get current portfolio summary"""
         positions = data_manager.get_positions()
-        
-        total_value = sum(pos.quantity * pos.current_price for pos in positions.values())
-        total_pnl = sum(pos.unrealized_pnl for pos in positions.values())
+        exposure = data_manager.get_exposure()
         
         return {
             'total_positions': len(positions),
-            'total_value': total_value,
-            'unrealized_pnl': total_pnl,
+            'total_value': exposure['net_exposure'],
+            'gross_exposure': exposure['gross_exposure'],
+            'unrealized_pnl': exposure['unrealized_pnl'],
+            'realized_pnl': exposure['realized_pnl'],
             'positions': {pid: {
                 'symbol': pos.symbol,
                 'quantity': pos.quantity,
@@ -265,8 +621,15 @@ class TradingEngine:
             'agent_status': self.agent_status
         }
     
-    def update_agent_status(self, agent_id: str, active: bool):
-        """Update AI agent status"""
+    def subscribe_agent(self, agent_id: str, callback: Callable):
+        """Subscribe an AI agent to market data for its asset class"""
+        symbols = self.AGENT_SYMBOL_GROUPS.get(agent_id)
+        if symbols is None:
+            # Fail closed: an unmapped agent must not silently receive every symbol
+            raise ValueError(f"No symbol subscription configured for agent: {agent_id}")
+        return data_manager.subscribe(symbols, callback, name=agent_id)
+    
+    def _update_agent_status(self, agent_id: str, active: bool):
         if agent_id in self.agent_status:
             self.agent_status[agent_id]['active'] = active
             self.agent_status[agent_id]['last_update'] = datetime.now()